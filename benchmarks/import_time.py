@@ -0,0 +1,88 @@
+"""
+Measures how long the simulation modules take to import in a fresh interpreter and
+enforces a startup budget.
+
+    python -m benchmarks.import_time --budget 0.5
+    python -m benchmarks.import_time --modules src.simulation.sweep --repeats 10
+
+Every module is imported `--repeats` times, each in a new process, and reported with
+its median import time. The exit status is 1 if a median exceeds the budget or a
+module pulls in one of the analysis-only packages (pandas, matplotlib, scipy, ...).
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+#modules a short-lived sweep worker imports
+CORE_MODULES = (
+    'src.simulation.simulation',
+    'src.simulation.sweep',
+    'src.simulation.multi_symbol',
+    'src.market.replay',
+)
+
+#packages of requirements.txt that the core must not import
+ANALYSIS_PACKAGES = ('pandas', 'matplotlib', 'mplfinance', 'scipy', 'statsmodels')
+
+DEFAULT_BUDGET = 0.5
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+seconds = time.perf_counter() - start
+print(json.dumps({{'seconds': seconds, 'modules': sorted(name for name in sys.modules if '.' not in name)}}))
+"""
+
+def import_once(module: str) -> dict:
+    output = subprocess.run([sys.executable, '-c', _PROBE.format(module=module)],
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def measure_import(module: str, repeats: int = 5) -> dict:
+    """Median, minimum and maximum import time of `module` and the analysis packages it loaded."""
+    runs = [import_once(module) for _ in range(repeats)]
+    times = [run['seconds'] for run in runs]
+    loaded = set().union(*(run['modules'] for run in runs))
+    return {
+        'median': statistics.median(times),
+        'min': min(times),
+        'max': max(times),
+        'heavy_imports': sorted(package for package in ANALYSIS_PACKAGES if package in loaded),
+    }
+
+def check_budget(results: dict, budget: float) -> list:
+    """Messages for every module over `budget` seconds or importing analysis packages."""
+    problems = []
+    for module, result in results.items():
+        if result['median'] > budget:
+            problems.append(f"{module}: median import time {result['median']:.3f}s exceeds {budget:.3f}s")
+        if result['heavy_imports']:
+            problems.append(f"{module}: imports {', '.join(result['heavy_imports'])}")
+    return problems
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import-time benchmark of the core simulation modules.")
+    parser.add_argument('--modules', nargs='+', default=list(CORE_MODULES))
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--budget', type=float, default=DEFAULT_BUDGET, help="Seconds allowed per module (median)")
+    parser.add_argument('--output', help="Write the results as JSON to this file")
+    args = parser.parse_args(argv)
+
+    results = {module: measure_import(module, args.repeats) for module in args.modules}
+    problems = check_budget(results, args.budget)
+    report = {'budget': args.budget, 'results': results, 'problems': problems}
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+    print(json.dumps(report, indent=2))
+
+    if problems:
+        for problem in problems:
+            print(problem, file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,142 @@
+"""
+Runs the benchmark suite and optionally compares it with a stored baseline.
+
+    python -m benchmarks.run --output results.json
+    python -m benchmarks.run --quick --only book_add deep_sweep
+    python -m benchmarks.run --compare baseline.json --threshold 0.10
+
+Each case is timed `--repeats` times on fresh state and reported with its median and
+minimum time and ops/second. With --compare, cases whose median time grew by more
+than the threshold are reported as regressions and the exit status is 1.
+"""
+import argparse
+import gc
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+from benchmarks.workloads import SUITE, QUICK_PARAMS
+
+QUICK_MAX_AGENTS = 1000
+
+def case_name(name, params):
+    return name + '[' + ','.join(f'{key}={value}' for key, value in sorted(params.items())) + ']'
+
+def measure(workload, params, repeats):
+    setup, run, ops = workload(**params)
+    times = []
+    for _ in range(repeats):
+        state = setup()
+        gc.collect()
+        start = time.perf_counter()
+        run(state)
+        times.append(time.perf_counter() - start)
+    median = statistics.median(times)
+    return {
+        'params': params,
+        'ops': ops,
+        'repeats': repeats,
+        'median': median,
+        'min': min(times),
+        'ops_per_second': ops / median if median > 0 else None,
+    }
+
+def iter_cases(only=None, quick=False):
+    for name, (workload, param_sets) in SUITE.items():
+        if only and name not in only:
+            continue
+        for params in param_sets:
+            if quick:
+                if params.get('agents', 0) > QUICK_MAX_AGENTS:
+                    continue
+                params = {**params, **QUICK_PARAMS.get(name, {})}
+            yield case_name(name, params), workload, params
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_suite(only=None, quick=False, repeats=5, log=None):
+    results = {}
+    for name, workload, params in iter_cases(only, quick):
+        results[name] = measure(workload, params, repeats)
+        if log is not None:
+            log(f"{name}: median {results[name]['median'] * 1000:.2f} ms, {results[name]['ops_per_second'] or 0:,.0f} ops/s")
+    return {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'commit': _git_commit(),
+            'python': sys.version.split()[0],
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'quick': quick,
+            'repeats': repeats,
+        },
+        'results': results,
+    }
+
+def compare(current: dict, baseline: dict, threshold: float = 0.10) -> dict:
+    """
+    Compares median times of cases present in both result sets.
+
+    Returns:
+        dict: {'regressions': [...], 'improvements': [...], 'unchanged': [...], 'missing': [...]},
+            each entry (except missing) is {'name', 'baseline', 'current', 'ratio'}.
+    """
+    report = {'regressions': [], 'improvements': [], 'unchanged': [], 'missing': []}
+    for name, base in baseline['results'].items():
+        result = current['results'].get(name)
+        if result is None:
+            report['missing'].append(name)
+            continue
+        ratio = result['median'] / base['median'] if base['median'] > 0 else float('inf')
+        entry = {'name': name, 'baseline': base['median'], 'current': result['median'], 'ratio': ratio}
+        if ratio > 1 + threshold:
+            report['regressions'].append(entry)
+        elif ratio < 1 / (1 + threshold):
+            report['improvements'].append(entry)
+        else:
+            report['unchanged'].append(entry)
+    return report
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the benchmark suite.")
+    parser.add_argument('--output', help="Write results as JSON to this file")
+    parser.add_argument('--compare', help="Baseline results JSON to compare against")
+    parser.add_argument('--threshold', type=float, default=0.10, help="Relative slowdown reported as a regression")
+    parser.add_argument('--only', nargs='+', choices=sorted(SUITE), help="Run only these workloads")
+    parser.add_argument('--quick', action='store_true', help="Smaller inputs, for a fast smoke run")
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    log = lambda message: print(message, file=sys.stderr)
+    results = run_suite(args.only, args.quick, args.repeats, log=log)
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=2)
+
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        report = compare(results, baseline, args.threshold)
+        for entry in report['regressions']:
+            log(f"REGRESSION {entry['name']}: {entry['baseline'] * 1000:.2f} ms -> {entry['current'] * 1000:.2f} ms ({entry['ratio']:.2f}x)")
+        for entry in report['improvements']:
+            log(f"improved {entry['name']}: {entry['baseline'] * 1000:.2f} ms -> {entry['current'] * 1000:.2f} ms ({entry['ratio']:.2f}x)")
+        print(json.dumps(report, indent=2))
+        return 1 if report['regressions'] else 0
+
+    if not args.output:
+        print(json.dumps(results, indent=2))
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,240 @@
+"""
+Standard benchmark workloads.
+
+Every workload is a function taking its parameters and returning `(setup, run, ops)`:
+`setup()` builds fresh state (not timed), `run(state)` is the timed part and `ops`
+is the number of operations `run` performs, used for the ops/second figure. All
+random inputs come from fixed seeds so every run times the same work.
+"""
+import numpy as np
+
+from src.market.event_bus import EventBus, CompiledEventBus
+from src.market.events import OrderCancelledEvent
+from src.market.matching_engine import MatchingEngine
+from src.market.order import Order
+from src.market.order_book import LimitOrderBook
+from src.market.tick_order_book import TickOrderBook
+from src.managers.market_data_manager import MarketDataManager
+from src.managers.scheduler import create_scheduler
+from src.simulation.simulation import Simulation
+
+TICK_SIZE = 0.01
+MID_PRICE = 100.0
+
+def _make_book(kind, pooled=False):
+    return TickOrderBook(TICK_SIZE, pooled=pooled) if kind == 'tick' else LimitOrderBook(pooled=pooled)
+
+def _resting_orders(count, depth, seed, first_id=1):
+    """Limit orders spread over `depth` price levels on each side of MID_PRICE."""
+    rng = np.random.default_rng(seed)
+    offsets = rng.integers(1, depth + 1, count).tolist()
+    sides = rng.integers(0, 2, count).tolist()
+    quantities = rng.integers(1, 10, count).tolist()
+    orders = []
+    for i in range(count):
+        side = 'buy' if sides[i] == 0 else 'sell'
+        price = MID_PRICE - offsets[i] * TICK_SIZE if side == 'buy' else MID_PRICE + offsets[i] * TICK_SIZE
+        orders.append(Order(first_id + i, 1, 0, side, 'limit', quantities[i], price))
+    return orders
+
+def book_add(book='sorted', depth=100, orders=20000):
+    def setup():
+        return _make_book(book), _resting_orders(orders, depth, seed=1)
+
+    def run(state):
+        order_book, resting = state
+        for order in resting:
+            order_book.add_order(order)
+    return setup, run, orders
+
+def book_cancel(book='sorted', depth=100, orders=20000):
+    def setup():
+        order_book = _make_book(book)
+        resting = _resting_orders(orders, depth, seed=2)
+        for order in resting:
+            order_book.add_order(order)
+        order_ids = np.random.default_rng(3).permutation([order.order_id for order in resting]).tolist()
+        return order_book, order_ids
+
+    def run(state):
+        order_book, order_ids = state
+        for order_id in order_ids:
+            order_book.remove_order(order_id)
+    return setup, run, orders
+
+def book_modify(book='sorted', depth=100, orders=20000):
+    def setup():
+        order_book = _make_book(book)
+        resting = _resting_orders(orders, depth, seed=4)
+        for order in resting:
+            order_book.add_order(order)
+        new_quantities = np.random.default_rng(5).integers(1, 10, orders).tolist()
+        return order_book, [(order.order_id, quantity) for order, quantity in zip(resting, new_quantities)]
+
+    def run(state):
+        order_book, changes = state
+        for order_id, quantity in changes:
+            order_book.modify_order(order_id, quantity)
+    return setup, run, orders
+
+def deep_sweep(book='sorted', levels=1000, orders_per_level=5, batch_fills=False):
+    """One market order that consumes the whole ask side."""
+    fills = levels * orders_per_level
+
+    def setup():
+        order_book = _make_book(book)
+        order_id = 1
+        for level in range(1, levels + 1):
+            for _ in range(orders_per_level):
+                order_book.add_order(Order(order_id, 1, 0, 'sell', 'limit', 1, MID_PRICE + level * TICK_SIZE))
+                order_id += 1
+        engine = MatchingEngine(EventBus(), batch_fills=batch_fills, per_fill_events=not batch_fills)
+        return engine, order_book, Order(order_id, 2, 0, 'buy', 'market', fills)
+
+    def run(state):
+        engine, order_book, order = state
+        engine.execute_order(order, order_book, 0)
+    return setup, run, fills
+
+def match_churn(book='sorted', pooled=False, orders=20000):
+    """
+    Limit orders at fresh prices, each taken out by a market order, with subscribers on
+    every per-fill event: levels and fill events are created and dropped constantly.
+    """
+    def setup():
+        rng = np.random.default_rng(7)
+        offsets = rng.integers(1, 50, orders).tolist()
+        event_bus = CompiledEventBus()
+        fills = []
+        event_bus.subscribe('transaction', lambda event: fills.append(event.transaction.quantity))
+        event_bus.subscribe('order_executed', lambda event: None)
+        engine = MatchingEngine(event_bus, pooled=pooled)
+        flow = []
+        for i, offset in enumerate(offsets):
+            flow.append(Order(2 * i + 1, 1, 0, 'sell', 'limit', 2, MID_PRICE + offset * TICK_SIZE))
+            flow.append(Order(2 * i + 2, 2, 0, 'buy', 'market', 2))
+        return engine, _make_book(book, pooled), flow
+
+    def run(state):
+        engine, order_book, flow = state
+        execute_order = engine.execute_order
+        for order in flow:
+            execute_order(order, order_book, 0)
+    return setup, run, 2 * orders
+
+def event_dispatch(compiled=False, handlers=1, events=100000):
+    """Publishing to `handlers` subscribers of one event type."""
+    def setup():
+        event_bus = CompiledEventBus() if compiled else EventBus()
+        received = []
+        for _ in range(handlers):
+            event_bus.subscribe('order_cancelled', received.append)
+        return event_bus, [OrderCancelledEvent(time, None) for time in range(events)]
+
+    def run(state):
+        event_bus, batch = state
+        publish = event_bus.publish
+        for event in batch:
+            publish(event)
+    return setup, run, events
+
+def scheduler(kind='heap', agents=100000, mean_delay=50, steps=200):
+    """Activation scheduling alone: every due agent is popped and rescheduled, as in AgentManager."""
+    rng = np.random.default_rng(7)
+    start_times = rng.integers(0, mean_delay, agents).tolist()
+    delays = (1 + rng.poisson(mean_delay, agents)).tolist()
+    #activations within `steps`: each agent is due at start, start + delay, ...
+    ops = sum(-(-(steps - time) // delay) for time, delay in zip(start_times, delays) if time < steps)
+
+    def setup():
+        queue = create_scheduler(kind)
+        for agent_id, time in enumerate(start_times):
+            queue.push(time, agent_id)
+        return queue
+
+    def run(queue):
+        for current_time in range(steps):
+            due_time, batch = queue.pop_due(current_time)
+            while batch is not None:
+                for agent_id in batch:
+                    queue.push(due_time + delays[agent_id], agent_id)
+                due_time, batch = queue.pop_due(current_time)
+    return setup, run, ops
+
+def add_tick(periods=(1, 10, 100, 1000), ticks=50000, store_tick_data=True):
+    def setup():
+        rng = np.random.default_rng(6)
+        prices = np.round(MID_PRICE + np.cumsum(rng.normal(0, TICK_SIZE, ticks)), 2).tolist()
+        volumes = rng.integers(0, 10, ticks).tolist()
+        market_data = MarketDataManager(list(periods), store_tick_data=store_tick_data, max_ticks=ticks)
+        return market_data, prices, volumes
+
+    def run(state):
+        market_data, prices, volumes = state
+        for time, (price, volume) in enumerate(zip(prices, volumes)):
+            market_data.add_tick(time, price if volume else None, price - TICK_SIZE, price + TICK_SIZE, volume, 100, 100)
+    return setup, run, ticks
+
+def sample_config(num_fundamentalists=50, max_time=2000, seed=0):
+    """The config of sample_simulation.py with a chosen number of fundamentalists and a fixed seed."""
+    rng = np.random.default_rng(seed)
+    fundamental_values = rng.normal(100.0, 30.0, num_fundamentalists).tolist()
+    activation_rates = rng.uniform(0.01, 0.05, num_fundamentalists).tolist()
+    fundamentalists = [{
+        "id": 100 + i,
+        "type": "fundamentalist",
+        "cash": 0,
+        "fundamental_value": fundamental_values[i],
+        "activation_rate": activation_rates[i],
+        "max_order_size": 1
+    } for i in range(num_fundamentalists)]
+
+    return {
+        "market": {"ohlcv_periods": [1000], "store_tick_data": False, "max_ticks": 1000},
+        "agents": [
+            {"id": 1, "type": "zero_intelligence", "cash": 0, "max_order_size": 5, "limit_order_rate": 0.7,
+             "market_order_rate": 0.2, "cancellation_rate": 0.1, "activation_rate": 0.4},
+            {"id": 2, "type": "chartist", "cash": 0, "activation_rate": 0.1, "max_order_size": 5, "window": 5},
+            {"id": 3, "type": "chartist", "cash": 0, "activation_rate": 0.1, "max_order_size": 5, "window": 100},
+        ] + fundamentalists,
+        "time_step": 1,
+        "max_time": max_time,
+        "seed": seed,
+        "verbose": False
+    }
+
+def simulation_run(agents=100, max_time=2000):
+    """Full Simulation.run; ops is the number of agents (activations grow with it)."""
+    def setup():
+        return Simulation(sample_config(num_fundamentalists=agents, max_time=max_time))
+
+    def run(simulation):
+        simulation.run()
+    return setup, run, agents
+
+#name -> (workload, list of parameter sets); `quick` sets are used with --quick
+SUITE = {
+    'book_add': (book_add, [{'book': book, 'depth': depth} for book in ('sorted', 'tick') for depth in (10, 100, 1000)]),
+    'book_cancel': (book_cancel, [{'book': book, 'depth': depth} for book in ('sorted', 'tick') for depth in (10, 100, 1000)]),
+    'book_modify': (book_modify, [{'book': book, 'depth': depth} for book in ('sorted', 'tick') for depth in (10, 100, 1000)]),
+    'deep_sweep': (deep_sweep, [{'book': book, 'levels': levels, 'batch_fills': batch}
+                                for book in ('sorted', 'tick') for levels in (100, 1000) for batch in (False, True)]),
+    'match_churn': (match_churn, [{'book': book, 'pooled': pooled} for book in ('sorted', 'tick') for pooled in (False, True)]),
+    'event_dispatch': (event_dispatch, [{'compiled': compiled, 'handlers': handlers}
+                                        for compiled in (False, True) for handlers in (1, 2, 4)]),
+    'scheduler': (scheduler, [{'kind': kind, 'agents': agents} for kind in ('heap', 'calendar') for agents in (10000, 1000000)]),
+    'add_tick': (add_tick, [{'periods': [1000]}, {'periods': [1, 10, 100, 1000]}]),
+    'simulation_run': (simulation_run, [{'agents': agents} for agents in (100, 1000, 10000, 100000)]),
+}
+
+QUICK_PARAMS = {
+    'book_add': {'orders': 2000},
+    'book_cancel': {'orders': 2000},
+    'book_modify': {'orders': 2000},
+    'deep_sweep': {'orders_per_level': 1},
+    'match_churn': {'orders': 2000},
+    'event_dispatch': {'events': 5000},
+    'scheduler': {'steps': 20},
+    'add_tick': {'ticks': 5000},
+    'simulation_run': {'max_time': 200},
+}
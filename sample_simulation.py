@@ -86,12 +86,11 @@ def summarize_agents_to_file(simulation, filename):
 
 summarize_agents_to_file(simulation, 'agents_result.txt')
 
-print(simulation.market.market_data.ohlcv_data[1000].tail(10))
+print(simulation.market.market_data.ohlcv_data[1000].to_dataframe().tail(10))
 
 import os
 
-ohlcv_data = simulation.market.market_data.ohlcv_data[1000]
 results_folder = 'results'
 os.makedirs(results_folder, exist_ok=True)
 output_file = os.path.join(results_folder, 'ohlcv_data.csv')
-ohlcv_data.to_csv(output_file, index=False)
+simulation.market.market_data.export_ohlcv_csv(1000, output_file)
@@ -0,0 +1,123 @@
+import numpy as np
+from src.agents.agent_time_activated import TimeActivatedAgent
+from src.agents.pending_orders import PendingOrders
+
+class CohortMember:
+    """
+    Per-member view of an AgentCohort, exposing the portfolio interface of BaseAgent.
+
+    Orders are placed under the member's id, so AgentManager resolves fills and
+    cancellations for that id to this view.
+    """
+    __slots__ = ('cohort', 'index', 'agent_id', 'pending_limit_orders')
+
+    def __init__(self, cohort, index):
+        self.cohort = cohort
+        self.index = index
+        self.agent_id = int(cohort.member_ids[index])
+        self.pending_limit_orders = PendingOrders()
+
+    @property
+    def active(self):
+        return self.cohort.active
+
+    @property
+    def initial_cash(self):
+        return self.cohort.initial_cash
+
+    @property
+    def agent_type(self):
+        return self.cohort.__class__.__name__
+
+    @property
+    def cash(self):
+        return float(self.cohort.cash[self.index])
+
+    @property
+    def holdings(self):
+        return int(self.cohort.holdings[self.index])
+
+    def remove_pending_limit_order(self, order_id):
+        self.pending_limit_orders.pop(order_id)
+
+    def add_cash(self, cash):
+        self.cohort.cash[self.index] += cash
+
+    def deduct_cash(self, cash):
+        self.cohort.cash[self.index] -= cash
+
+    #cohorts trade a single symbol, so fills are always in it
+    def add_holding(self, quantity, symbol=None):
+        self.cohort.holdings[self.index] += quantity
+
+    def deduct_holding(self, quantity, symbol=None):
+        self.cohort.holdings[self.index] -= quantity
+
+    def get_holding_value(self, current_price):
+        return self.holdings * current_price
+
+    def get_total_value(self, current_price):
+        return self.cash + self.get_holding_value(current_price)
+
+    def get_portfolio_value(self, prices: dict):
+        return self.get_total_value(prices.get(self.cohort.symbol, 0.0))
+
+class AgentCohort(TimeActivatedAgent):
+    """
+    A population of time-activated agents scheduled and decided as one unit.
+
+    Cash, holdings, activation rates and next activation times are NumPy arrays indexed
+    by member. The cohort is registered with AgentManager as a single agent whose
+    `next_activation_time` is the earliest member activation; `activate` receives
+    the indices of all members due at that time.
+    """
+
+    def __init__(self, agent_id, member_ids, initial_cash, market, activation_rates, rng=None, **kwargs):
+        self.member_ids = np.asarray(member_ids, dtype=np.int64)
+        size = len(self.member_ids)
+        self.activation_rates = np.broadcast_to(np.asarray(activation_rates, dtype=np.float64), (size,)).copy()
+        self.next_activation_times = np.zeros(size, dtype=np.int64)
+        self.member_index = {int(member_id): i for i, member_id in enumerate(self.member_ids)}
+        self.member_views = {}
+
+        super().__init__(agent_id, initial_cash, market, market.indicator_manager, self.activation_rates, rng=rng, **kwargs)
+        self.cash = np.full(size, initial_cash, dtype=np.float64)
+        self.holdings = np.zeros(size, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.member_ids)
+
+    def _draw_activation_delays(self, rates):
+        return self.rng.generator.exponential(scale=1 / rates)
+
+    def _generate_next_activation_time(self):
+        current_time = self.market.get_current_time()
+        delays = self._draw_activation_delays(self.activation_rates)
+        self.next_activation_times[:] = np.rint(current_time + delays)
+        return int(self.next_activation_times.min())
+
+    def activate(self, current_time):
+        due = np.flatnonzero(self.next_activation_times <= current_time)
+        if len(due):
+            self.activate_members(due, current_time)
+
+            delays = self._draw_activation_delays(self.activation_rates[due])
+            self.next_activation_times[due] = np.rint(current_time + delays)
+        self.next_activation_time = int(self.next_activation_times.min())
+
+    def activate_members(self, indices, current_time):
+        raise NotImplementedError("Subclasses must implement the `activate_members` method.")
+
+    def update_activation_time(self):
+        self.next_activation_time = int(self.next_activation_times.min())
+
+    def member(self, member_id) -> CohortMember:
+        view = self.member_views.get(member_id)
+        if view is None:
+            view = CohortMember(self, self.member_index[member_id])
+            self.member_views[member_id] = view
+        return view
+
+    def members(self):
+        for member_id in self.member_ids.tolist():
+            yield self.member(member_id)
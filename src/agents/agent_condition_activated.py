@@ -1,9 +1,69 @@
 from src.agents.base_agent import BaseAgent
+from src.managers.trigger_index import Trigger
+from src.simulation.random_streams import default_stream
 
 class ConditionActivatedAgent(BaseAgent):
+    """
+    Agent woken by market conditions instead of a clock.
 
-    def __init__(self):
-        pass 
+    Conditions are declared as triggers (`add_trigger`) and kept by AgentManager in a
+    TriggerIndex, so only agents whose triggers were reached are activated, through
+    `on_trigger`. Triggers are one-shot; re-arm them from `on_trigger` if needed.
+    """
+
+    def __init__(self, agent_id, initial_cash, market, indicator_manager=None, rng=None):
+        """
+        Args:
+            agent_id (int): Unique identifier for the agent.
+            initial_cash (float): Initial cash balance for the agent.
+            market (Market): Reference to the market object.
+            indicator_manager: Reference to the indicator manager (default: the market's).
+            rng (RandomStream): Random stream of this agent (an unseeded one if None).
+        """
+        if indicator_manager is None:
+            indicator_manager = market.indicator_manager
+        super().__init__(agent_id, initial_cash, market, indicator_manager)
+        self.rng = rng if rng is not None else default_stream()
+        self.triggers = []
+        #set by AgentManager when the agent is registered
+        self.trigger_index = None
+
+    def add_trigger(self, metric, direction, level, key=None) -> Trigger:
+        """
+        Arms a trigger on `metric` ('price', 'spread', 'volume' or 'indicator') of the
+        agent's symbol. `direction` is 'above' (fires once value >= level) or 'below'
+        (fires once value <= level); `key` is the bar period for 'volume' and the
+        indicator key for 'indicator'.
+        """
+        trigger = Trigger(self, metric, direction, level, symbol=self.symbol, key=key)
+        self.triggers.append(trigger)
+        if self.trigger_index is not None:
+            self.trigger_index.add(trigger)
+        return trigger
+
+    def remove_trigger(self, trigger: Trigger):
+        if trigger in self.triggers:
+            self.triggers.remove(trigger)
+        if self.trigger_index is not None:
+            self.trigger_index.remove(trigger)
+
+    def clear_triggers(self):
+        for trigger in list(self.triggers):
+            self.remove_trigger(trigger)
+
+    def handle_trigger(self, trigger: Trigger, current_time):
+        """Called by AgentManager with a trigger popped from the index."""
+        if trigger in self.triggers:
+            self.triggers.remove(trigger)
+        if self.active:
+            self.on_trigger(trigger, current_time)
+
+    def on_trigger(self, trigger: Trigger, current_time):
+        raise NotImplementedError("Subclasses must implement the `on_trigger` method.")
+
+    def activate(self, current_time):
+        pass
 
     def check_condition_and_activate(self, current_time):
-        pass
\ No newline at end of file
+        """Polling hook, called every step only for subclasses that override it."""
+        pass
@@ -1,8 +1,8 @@
-import numpy as np
 from src.agents.base_agent import BaseAgent
+from src.simulation.random_streams import default_stream
 
 class TimeActivatedAgent(BaseAgent):
-    def __init__(self, agent_id, initial_cash, market, indicator_manager, activation_rate, **kwargs):
+    def __init__(self, agent_id, initial_cash, market, indicator_manager, activation_rate, rng=None, **kwargs):
         """
         Initializes a Time-Activated Agent.
         Args:
@@ -11,15 +11,17 @@ class TimeActivatedAgent(BaseAgent):
             market (Market): Reference to the market object.
             indicator_manager: Reference to the indicator manager.
             activation_rate (float): Rate parameter for exponential distribution.
+            rng (RandomStream): Random stream of this agent (an unseeded one if None).
             **kwargs: Additional arguments for specific agent types.
         """
         super().__init__(agent_id, initial_cash, market, indicator_manager)
+        self.rng = rng if rng is not None else default_stream()
         self.activation_rate = activation_rate
         self.next_activation_time = self._generate_next_activation_time()
 
     def _generate_next_activation_time(self):
         current_time = self.market.get_current_time()
-        next_time = current_time + np.random.exponential(scale=1 / self.activation_rate)
+        next_time = current_time + self.rng.exponential(1 / self.activation_rate)
         return int(round(next_time))
 
     def activate(self, current_time):
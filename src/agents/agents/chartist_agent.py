@@ -1,20 +1,19 @@
-import random
 from src.agents.agent_time_activated import TimeActivatedAgent
-from src.indicators.ema import calculate_ema
 
 class ChartistAgent(TimeActivatedAgent):
-    def __init__(self, agent_id, initial_cash, market, activation_rate, max_order_size, window):
-        super().__init__(agent_id, initial_cash, market, market.indicator_manager, activation_rate)
+    def __init__(self, agent_id, initial_cash, market, activation_rate, max_order_size, window, rng=None):
+        super().__init__(agent_id, initial_cash, market, market.indicator_manager, activation_rate, rng=rng)
         self.max_order_size = max_order_size
         self.window = window
+        #EMA of the last `window` 1000-bars (the open one included); shared with every chartist using the same window
+        self.ema_key = self.indicator_manager.add_incremental_indicator('windowed_ema', period=1000, window=window)
 
     def activate(self, current_time):
-        price_history = self.market.market_data.get_price_history(period=1000, window=self.window)
-        if price_history.empty:
+        ewma = self.indicator_manager.get_incremental_value(self.ema_key, include_current_bar=True)
+        if ewma is None:
             self.update_activation_time()
             return
 
-        ewma = calculate_ema(price_history, self.window).iloc[-1]
         best_bid = self.market.order_book.get_best_bid()
         best_ask = self.market.order_book.get_best_ask()
         mid_price = self.market.market_data.calculate_mid_price(best_bid, best_ask)
@@ -23,7 +22,7 @@ class ChartistAgent(TimeActivatedAgent):
             mid_price = self.market.market_data.get_last_transaction_price() or 100.0
 
         if ewma > mid_price + 0.5:
-            order_size = random.randint(1, self.max_order_size)
+            order_size = self.rng.randint(1, self.max_order_size)
             self.market.place_order(
                 agent_id=self.agent_id,
                 order_type='limit',
@@ -32,7 +31,7 @@ class ChartistAgent(TimeActivatedAgent):
                 price=mid_price
             )
         elif ewma < mid_price - 0.5:
-            order_size = random.randint(1, self.max_order_size)
+            order_size = self.rng.randint(1, self.max_order_size)
             self.market.place_order(
                 agent_id=self.agent_id,
                 order_type='limit',
@@ -1,9 +1,8 @@
-import random
 from src.agents.agent_time_activated import TimeActivatedAgent
 
 class FundamentalistAgent(TimeActivatedAgent):
-    def __init__(self, agent_id, initial_cash, market, fundamental_value, activation_rate, max_order_size):
-        super().__init__(agent_id, initial_cash, market, market.indicator_manager, activation_rate)
+    def __init__(self, agent_id, initial_cash, market, fundamental_value, activation_rate, max_order_size, rng=None):
+        super().__init__(agent_id, initial_cash, market, market.indicator_manager, activation_rate, rng=rng)
         self.fundamental_value = fundamental_value
         self.max_order_size = max_order_size
 
@@ -16,7 +15,7 @@ class FundamentalistAgent(TimeActivatedAgent):
             mid_price = self.market.market_data.get_last_transaction_price() or 100.0
 
         if mid_price < self.fundamental_value - 0.5:
-            order_size = random.randint(1, self.max_order_size)
+            order_size = self.rng.randint(1, self.max_order_size)
             self.market.place_order(
                 agent_id=self.agent_id,
                 order_type='limit',
@@ -25,7 +24,7 @@ class FundamentalistAgent(TimeActivatedAgent):
                 price=mid_price
             )
         elif mid_price > self.fundamental_value + 0.5:
-            order_size = random.randint(1, self.max_order_size)
+            order_size = self.rng.randint(1, self.max_order_size)
             self.market.place_order(
                 agent_id=self.agent_id,
                 order_type='limit',
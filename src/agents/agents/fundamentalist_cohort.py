@@ -0,0 +1,45 @@
+import numpy as np
+from src.agents.agent_cohort import AgentCohort
+
+class FundamentalistCohort(AgentCohort):
+    def __init__(self, agent_id, member_ids, initial_cash, market, fundamental_values, activation_rates, max_order_size, rng=None):
+        """
+        Initializes a cohort of fundamentalists that behave like FundamentalistAgent.
+        Args:
+            agent_id: Identifier of the cohort itself (used for scheduling).
+            member_ids (array-like): Agent ids under which members place orders.
+            initial_cash (float): Starting cash balance of every member.
+            market (Market): Reference to the market object.
+            fundamental_values (array-like): Fundamental value per member.
+            activation_rates (array-like or float): Activation rate per member.
+            max_order_size (int): Maximum number of shares per order.
+            rng (RandomStream): Random stream shared by the cohort.
+        """
+        self.fundamental_values = np.asarray(fundamental_values, dtype=np.float64)
+        super().__init__(agent_id, member_ids, initial_cash, market, activation_rates, rng=rng)
+        self.max_order_size = max_order_size
+
+    def activate_members(self, indices, current_time):
+        best_bid = self.market.order_book.get_best_bid()
+        best_ask = self.market.order_book.get_best_ask()
+        mid_price = self.market.market_data.calculate_mid_price(best_bid, best_ask)
+
+        if mid_price is None:
+            mid_price = self.market.market_data.get_last_transaction_price() or 100.0
+
+        fundamental_values = self.fundamental_values[indices]
+        sides = np.where(mid_price < fundamental_values - 0.5, 1, np.where(mid_price > fundamental_values + 0.5, -1, 0))
+        trading = np.flatnonzero(sides)
+        if not len(trading):
+            return
+
+        order_sizes = self.rng.generator.integers(1, self.max_order_size + 1, size=len(trading))
+        member_ids = self.member_ids[indices[trading]].tolist()
+        for member_id, side, order_size in zip(member_ids, sides[trading].tolist(), order_sizes.tolist()):
+            self.market.place_order(
+                agent_id=member_id,
+                order_type='limit',
+                side='buy' if side > 0 else 'sell',
+                quantity=order_size,
+                price=mid_price
+            )
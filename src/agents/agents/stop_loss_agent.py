@@ -0,0 +1,41 @@
+from src.agents.agent_condition_activated import ConditionActivatedAgent
+from src.managers.trigger_index import ABOVE, BELOW
+
+class StopLossAgent(ConditionActivatedAgent):
+    def __init__(self, agent_id, initial_cash, market, stop_price, quantity, take_profit=None, holdings=None, rng=None):
+        """
+        Holds a long position and sells it with a market order once the price falls to
+        `stop_price` (or rises to `take_profit`, if given). The agent exits once.
+
+        Args:
+            agent_id (int): Unique identifier for the agent.
+            initial_cash (float): Starting cash balance for the agent.
+            market (Market): Reference to the market object.
+            stop_price (float): Price at or below which the position is sold.
+            quantity (int): Number of shares sold on exit.
+            take_profit (float): Price at or above which the position is sold.
+            holdings (int): Initial holdings (default: `quantity`).
+            rng (RandomStream): Random stream of this agent.
+        """
+        super().__init__(agent_id, initial_cash, market, rng=rng)
+        self.stop_price = stop_price
+        self.quantity = quantity
+        self.take_profit = take_profit
+        self.holdings = quantity if holdings is None else holdings
+        self.exited = False
+
+        self.add_trigger('price', BELOW, stop_price)
+        if take_profit is not None:
+            self.add_trigger('price', ABOVE, take_profit)
+
+    def on_trigger(self, trigger, current_time):
+        if self.exited:
+            return
+        self.exited = True
+        self.clear_triggers()
+        self.market.place_order(
+            agent_id=self.agent_id,
+            order_type='market',
+            side='sell',
+            quantity=self.quantity
+        )
@@ -1,9 +1,7 @@
-import random
-import numpy as np
 from src.agents.agent_time_activated import TimeActivatedAgent
 
 class ZeroIntelligenceAgent(TimeActivatedAgent):
-    def __init__(self, agent_id, initial_cash, market, max_order_size, limit_order_rate, market_order_rate, cancellation_rate, activation_rate):
+    def __init__(self, agent_id, initial_cash, market, max_order_size, limit_order_rate, market_order_rate, cancellation_rate, activation_rate, rng=None, order_lifetime=None, symbols=None):
         """
         Initializes a Zero-Intelligence Agent.
         Args:
@@ -15,13 +13,22 @@ class ZeroIntelligenceAgent(TimeActivatedAgent):
             market_order_rate (float): Probability of placing a market order.
             cancellation_rate (float): Probability of canceling a limit order.
             activation_rate (float): Rate parameter for exponential distribution determining activation time.
+            rng (RandomStream): Random stream of this agent.
+            order_lifetime (int): If set, limit orders are GTT and expire this many time units after placement.
+            symbols (list): If set, each activation trades one of these symbols of the (multi-instrument)
+                market, chosen at random.
         """
-        super().__init__(agent_id, initial_cash, market, market.indicator_manager, activation_rate)
+        super().__init__(agent_id, initial_cash, market, market.indicator_manager, activation_rate, rng=rng)
         self.max_order_size = max_order_size
         self.limit_order_rate = limit_order_rate
         self.market_order_rate = market_order_rate
         self.cancellation_rate = cancellation_rate
         self.activation_rate = activation_rate
+        self.order_lifetime = order_lifetime
+        self.symbol_markets = [market.symbol_market(symbol) for symbol in symbols] if symbols else None
+        if self.symbol_markets:
+            #no home symbol: every fill is kept in `positions`
+            self.symbol = None
         self.next_activation_time = self._generate_next_activation_time()
 
     def activate(self, current_time):
@@ -33,45 +40,61 @@ class ZeroIntelligenceAgent(TimeActivatedAgent):
         """
         # Normalize probabilities to ensure only one action is chosen
         total_rate = self.limit_order_rate + self.market_order_rate + self.cancellation_rate
-        rand = random.uniform(0, total_rate)
+        rand = self.rng.uniform(0, total_rate)
+        #the symbol traded in this activation; `self.market` stays the whole market
+        market = self.rng.choice(self.symbol_markets) if self.symbol_markets else self.market
 
         if rand < self.limit_order_rate:
-            self.place_limit_order()
+            self.place_limit_order(market)
         elif rand < self.limit_order_rate + self.market_order_rate:
-            self.place_market_order()
+            self.place_market_order(market)
         else:
             self.cancel_random_limit_order()
 
         # Schedule next activation
         self.next_activation_time = self._generate_next_activation_time()
 
-    def place_limit_order(self):
+    def place_limit_order(self, market=None):
         """
-        Places a limit order with random attributes.
+        Places a limit order with random attributes in `market` (default: the agent's market).
         """
-        order_size = random.randint(1, self.max_order_size)
-        side = random.choice(['buy', 'sell'])
+        if market is None:
+            market = self.market
+        order_size = self.rng.randint(1, self.max_order_size)
+        side = self.rng.choice(['buy', 'sell'])
 
-        best_bid = self.market.order_book.get_best_bid()
-        best_ask = self.market.order_book.get_best_ask()
-        last_transaction_price = self.market.market_data.get_last_transaction_price()
+        best_bid = market.order_book.get_best_bid()
+        best_ask = market.order_book.get_best_ask()
+        last_transaction_price = market.market_data.get_last_transaction_price()
 
         if side == 'buy':
             if best_ask is not None:
-                price = random.uniform(max(0, best_ask - 10), best_ask)
+                price = self.rng.uniform(max(0, best_ask - 10), best_ask)
             elif last_transaction_price is not None:
-                price = random.uniform(max(0, last_transaction_price - 5), last_transaction_price + 5)
+                price = self.rng.uniform(max(0, last_transaction_price - 5), last_transaction_price + 5)
             else:
-                price = random.uniform(50, 150)
+                price = self.rng.uniform(50, 150)
         else:
             if best_bid is not None:
-                price = random.uniform(best_bid, best_bid + 10)
+                price = self.rng.uniform(best_bid, best_bid + 10)
             elif last_transaction_price is not None:
-                price = random.uniform(max(0, last_transaction_price - 5), last_transaction_price + 5)
+                price = self.rng.uniform(max(0, last_transaction_price - 5), last_transaction_price + 5)
             else:
-                price = random.uniform(50, 150)
+                price = self.rng.uniform(50, 150)
 
-        self.market.place_order(
+        if self.order_lifetime is not None:
+            market.place_order(
+                agent_id=self.agent_id,
+                order_type='limit',
+                side=side,
+                quantity=order_size,
+                price=price,
+                time_in_force='gtt',
+                expire_time=market.get_current_time() + self.order_lifetime
+            )
+            return
+
+        market.place_order(
             agent_id=self.agent_id,
             order_type='limit',
             side=side,
@@ -79,14 +102,16 @@ class ZeroIntelligenceAgent(TimeActivatedAgent):
             price=price
         )
 
-    def place_market_order(self):
+    def place_market_order(self, market=None):
         """
-        Places a market order with random size.
+        Places a market order with random size in `market` (default: the agent's market).
         """
-        order_size = random.randint(1, self.max_order_size)
-        side = random.choice(['buy', 'sell'])
+        if market is None:
+            market = self.market
+        order_size = self.rng.randint(1, self.max_order_size)
+        side = self.rng.choice(['buy', 'sell'])
 
-        self.market.place_order(
+        market.place_order(
             agent_id=self.agent_id,
             order_type='market',
             side=side,
@@ -100,5 +125,6 @@ class ZeroIntelligenceAgent(TimeActivatedAgent):
         if not self.pending_limit_orders:
             return
 
-        order_id = random.choice(list(self.pending_limit_orders.keys()))
-        self.market.cancel_order(order_id)
+        order_id = self.pending_limit_orders.random_order_id(self.rng)
+        #cancelled in the symbol the order rests in
+        self.market.cancel_order(order_id, getattr(self.pending_limit_orders.get(order_id), 'symbol', None))
@@ -1,18 +1,24 @@
 from abc import ABC, abstractmethod
+from src.agents.pending_orders import PendingOrders
 
 class BaseAgent(ABC):
     def __init__(self, agent_id, initial_cash, market, indicator_manager):
         self.agent_id = agent_id
         self.cash = initial_cash
+        self.initial_cash = initial_cash
         self.market = market
         self.indicator_manager = indicator_manager
         self.active = True
         self.holdings = 0  #quantity of stock held
+        #symbol the agent trades through `market` (None in single-instrument markets);
+        #fills in any other symbol are kept in `positions`
+        self.symbol = getattr(market, 'symbol', None)
+        self.positions = {}
         
-        #order_id -> {order_id: order} 
+        #order_id -> order
         #keep reference to order stored in the book to 
         #skip the process of manual modification of pending orders
-        self.pending_limit_orders = {}
+        self.pending_limit_orders = PendingOrders()
     
     @abstractmethod
     def activate(self, current_time):
@@ -27,8 +33,7 @@ class BaseAgent(ABC):
             }
 
     def remove_pending_limit_order(self, order_id):
-        if order_id in self.pending_limit_orders:
-            del self.pending_limit_orders[order_id]
+        self.pending_limit_orders.pop(order_id)
 
     def add_cash(self, cash):
         self.cash += cash
@@ -36,14 +41,24 @@ class BaseAgent(ABC):
     def deduct_cash(self, cash):
         self.cash -= cash
 
-    def add_holding(self, quantity):
-        self.holdings += quantity
+    def add_holding(self, quantity, symbol=None):
+        if symbol is None or symbol == self.symbol:
+            self.holdings += quantity
+        else:
+            self.positions[symbol] = self.positions.get(symbol, 0) + quantity
 
-    def deduct_holding(self, quantity):
-        self.holdings -= quantity
+    def deduct_holding(self, quantity, symbol=None):
+        self.add_holding(-quantity, symbol)
 
     def get_holding_value(self, current_price):
         return self.holdings * current_price
     
     def get_total_value(self, current_price):
-        return self.cash + self.get_holding_value(current_price)
\ No newline at end of file
+        return self.cash + self.get_holding_value(current_price)
+
+    def get_portfolio_value(self, prices: dict):
+        """Cash plus all holdings and positions valued at `prices` (symbol -> price)."""
+        value = self.cash + self.holdings * prices.get(self.symbol, 0.0)
+        for symbol, quantity in self.positions.items():
+            value += quantity * prices.get(symbol, 0.0)
+        return value
\ No newline at end of file
@@ -0,0 +1,67 @@
+class PendingOrders:
+    """
+    Resting limit orders of one agent: order_id -> order.
+
+    Besides the mapping, order ids are kept in a list; removal swaps the last id into
+    the freed slot, so both removal and drawing a uniformly random order are O(1)
+    regardless of how many orders the agent has resting.
+    """
+
+    __slots__ = ('orders', 'order_ids', 'positions')
+
+    def __init__(self):
+        self.orders = {}
+        self.order_ids = []
+        self.positions = {}  #order_id -> index in order_ids
+
+    def __len__(self):
+        return len(self.order_ids)
+
+    def __bool__(self):
+        return bool(self.order_ids)
+
+    def __contains__(self, order_id):
+        return order_id in self.orders
+
+    def __getitem__(self, order_id):
+        return self.orders[order_id]
+
+    def __setitem__(self, order_id, order):
+        if order_id not in self.orders:
+            self.positions[order_id] = len(self.order_ids)
+            self.order_ids.append(order_id)
+        self.orders[order_id] = order
+
+    def __delitem__(self, order_id):
+        del self.orders[order_id]
+        index = self.positions.pop(order_id)
+        last = self.order_ids.pop()
+        if last != order_id:
+            self.order_ids[index] = last
+            self.positions[last] = index
+
+    def __iter__(self):
+        return iter(self.orders)
+
+    def get(self, order_id, default=None):
+        return self.orders.get(order_id, default)
+
+    def pop(self, order_id, default=None):
+        if order_id not in self.orders:
+            return default
+        order = self.orders[order_id]
+        del self[order_id]
+        return order
+
+    def keys(self):
+        return self.orders.keys()
+
+    def values(self):
+        return self.orders.values()
+
+    def items(self):
+        return self.orders.items()
+
+    def random_order_id(self, rng):
+        """Draws the id of a uniformly random pending order with a RandomStream."""
+        return rng.choice(self.order_ids)
@@ -1,4 +1,3 @@
-import pandas as pd
-
 def calculate_ema(series, window):
-    return series.ewm(span=window, adjust=False).mean()
\ No newline at end of file
+    """EMA of a pandas Series."""
+    return series.ewm(span=window, adjust=False).mean()
@@ -0,0 +1,272 @@
+import math
+from collections import deque
+
+class IncrementalIndicator:
+    """
+    Base class for indicators that keep running state and are updated once per closed bar.
+
+    `value` reflects closed bars only. `peek` returns the value the indicator would
+    have if the currently open bar closed at the given price (and volume), without
+    changing state; every subclass implements it.
+    """
+
+    def __init__(self, window: int):
+        if window < 1:
+            raise ValueError("Window must be a positive integer.")
+        self.window = window
+        self.value = None
+        self.count = 0
+
+    def update(self, close: float, volume: int = 0):
+        raise NotImplementedError("Subclasses must implement the `update` method.")
+
+    def peek(self, close: float, volume: int = 0):
+        raise NotImplementedError("Subclasses must implement the `peek` method.")
+
+class IncrementalEMA(IncrementalIndicator):
+    """Exponential moving average with span `window` (same as pandas `ewm(span=window, adjust=False)`)."""
+
+    def __init__(self, window: int):
+        super().__init__(window)
+        self.alpha = 2.0 / (window + 1)
+
+    def update(self, close, volume=0):
+        self.count += 1
+        if self.value is None:
+            self.value = close
+        else:
+            self.value += self.alpha * (close - self.value)
+
+    def peek(self, close, volume=0):
+        if self.value is None:
+            return close
+        return self.value + self.alpha * (close - self.value)
+
+class IncrementalRSI(IncrementalIndicator):
+    """
+    Relative strength index over `window` bars.
+
+    method='wilder' uses Wilder's smoothing seeded with a simple average of the first
+    `window` changes; method='sma' uses a plain rolling mean of gains and losses.
+    """
+
+    def __init__(self, window: int, method: str = 'wilder'):
+        super().__init__(window)
+        if method not in ('wilder', 'sma'):
+            raise ValueError(f"Unknown RSI method: {method}")
+        self.method = method
+        self.prev_close = None
+        self.avg_gain = 0.0
+        self.avg_loss = 0.0
+        self.gains = deque()
+        self.losses = deque()
+        self.gain_sum = 0.0
+        self.loss_sum = 0.0
+
+    def update(self, close, volume=0):
+        if self.prev_close is None:
+            self.prev_close = close
+            return
+
+        delta = close - self.prev_close
+        self.prev_close = close
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+        self.count += 1
+
+        if self.method == 'sma' or self.count <= self.window:
+            self.gains.append(gain)
+            self.losses.append(loss)
+            self.gain_sum += gain
+            self.loss_sum += loss
+            if len(self.gains) > self.window:
+                self.gain_sum -= self.gains.popleft()
+                self.loss_sum -= self.losses.popleft()
+
+        if self.count < self.window:
+            return
+
+        if self.method == 'sma' or self.count == self.window:
+            self.avg_gain = self.gain_sum / self.window
+            self.avg_loss = self.loss_sum / self.window
+            if self.method == 'wilder':
+                self.gains.clear()
+                self.losses.clear()
+        else:
+            self.avg_gain = (self.avg_gain * (self.window - 1) + gain) / self.window
+            self.avg_loss = (self.avg_loss * (self.window - 1) + loss) / self.window
+
+        self.value = self._rsi(self.avg_gain, self.avg_loss)
+
+    def peek(self, close, volume=0):
+        if self.prev_close is None:
+            return None
+        delta = close - self.prev_close
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+        count = self.count + 1
+        if count < self.window:
+            return None
+
+        if self.method == 'sma' or count == self.window:
+            gain_sum = self.gain_sum + gain
+            loss_sum = self.loss_sum + loss
+            if len(self.gains) == self.window:
+                gain_sum -= self.gains[0]
+                loss_sum -= self.losses[0]
+            return self._rsi(gain_sum / self.window, loss_sum / self.window)
+        avg_gain = (self.avg_gain * (self.window - 1) + gain) / self.window
+        avg_loss = (self.avg_loss * (self.window - 1) + loss) / self.window
+        return self._rsi(avg_gain, avg_loss)
+
+    @staticmethod
+    def _rsi(avg_gain, avg_loss):
+        #a flat market has no RSI: nan, as in calculate_rsi
+        if avg_loss == 0:
+            return 100.0 if avg_gain > 0 else math.nan
+        return 100 - (100 / (1 + avg_gain / avg_loss))
+
+class RollingMean(IncrementalIndicator):
+    """Simple moving average of the last `window` closes."""
+
+    def __init__(self, window: int):
+        super().__init__(window)
+        self.values = deque()
+        self.total = 0.0
+
+    def update(self, close, volume=0):
+        self.count += 1
+        self.values.append(close)
+        self.total += close
+        if len(self.values) > self.window:
+            self.total -= self.values.popleft()
+        if len(self.values) == self.window:
+            self.value = self.total / self.window
+
+    def peek(self, close, volume=0):
+        if len(self.values) < self.window - 1:
+            return None
+        oldest = self.values[0] if len(self.values) == self.window else 0.0
+        return (self.total - oldest + close) / self.window
+
+class RollingStd(IncrementalIndicator):
+    """Sample standard deviation (ddof=1) of the last `window` closes."""
+
+    def __init__(self, window: int):
+        if window < 2:
+            raise ValueError("Window must be at least 2 for a standard deviation.")
+        super().__init__(window)
+        self.values = deque()
+        self.total = 0.0
+        self.total_sq = 0.0
+
+    def update(self, close, volume=0):
+        self.count += 1
+        self.values.append(close)
+        self.total += close
+        self.total_sq += close * close
+        if len(self.values) > self.window:
+            oldest = self.values.popleft()
+            self.total -= oldest
+            self.total_sq -= oldest * oldest
+        if len(self.values) == self.window:
+            self.value = self._std(self.total, self.total_sq)
+
+    def _std(self, total, total_sq):
+        variance = (total_sq - total * total / self.window) / (self.window - 1)
+        return math.sqrt(max(variance, 0.0))
+
+    def peek(self, close, volume=0):
+        if len(self.values) < self.window - 1:
+            return None
+        oldest = self.values[0] if len(self.values) == self.window else 0.0
+        return self._std(self.total - oldest + close, self.total_sq - oldest * oldest + close * close)
+
+class IncrementalVWAP(IncrementalIndicator):
+    """Volume-weighted average of bar closes over the last `window` bars."""
+
+    def __init__(self, window: int):
+        super().__init__(window)
+        self.bars = deque()
+        self.notional = 0.0
+        self.volume = 0
+
+    def update(self, close, volume=0):
+        self.count += 1
+        self.bars.append((close, volume))
+        self.notional += close * volume
+        self.volume += volume
+        if len(self.bars) > self.window:
+            old_close, old_volume = self.bars.popleft()
+            self.notional -= old_close * old_volume
+            self.volume -= old_volume
+        self.value = self.notional / self.volume if self.volume > 0 else None
+
+    def peek(self, close, volume=0):
+        notional = self.notional + close * volume
+        total_volume = self.volume + volume
+        if len(self.bars) == self.window:
+            old_close, old_volume = self.bars[0]
+            notional -= old_close * old_volume
+            total_volume -= old_volume
+        return notional / total_volume if total_volume > 0 else None
+
+class WindowedEMA(IncrementalIndicator):
+    """
+    EMA (span `window`) of only the last `window` closes, seeded with the first of them,
+    i.e. `ewm(span=window, adjust=False).mean()` of the last `window` values.
+
+    Kept in O(1) per bar through the running sum T = sum((1 - alpha) ** (n - 1 - k) * x_k)
+    over the window: the EMA is alpha * T + (1 - alpha) ** n * x_0. T is recomputed
+    from the window once every `window` bars so rounding errors do not build up.
+    """
+
+    def __init__(self, window: int):
+        super().__init__(window)
+        self.alpha = 2.0 / (window + 1)
+        self.decay = 1.0 - self.alpha
+        #weight of the oldest value of a full window
+        self.oldest_weight = self.decay ** (window - 1)
+        self.values = deque()
+        self.weighted_sum = 0.0
+
+    def _ema(self, weighted_sum, count, first):
+        return self.alpha * weighted_sum + self.decay ** count * first
+
+    def update(self, close, volume=0):
+        self.count += 1
+        values = self.values
+        if len(values) == self.window:
+            self.weighted_sum -= self.oldest_weight * values.popleft()
+        values.append(close)
+        if self.count % self.window == 0:
+            weighted_sum = 0.0
+            for value in values:
+                weighted_sum = weighted_sum * self.decay + value
+            self.weighted_sum = weighted_sum
+        else:
+            self.weighted_sum = self.weighted_sum * self.decay + close
+        self.value = self._ema(self.weighted_sum, len(values), values[0])
+
+    def peek(self, close, volume=0):
+        values = self.values
+        if not values:
+            return close
+        weighted_sum = self.weighted_sum
+        first = values[0]
+        if len(values) == self.window:
+            weighted_sum -= self.oldest_weight * first
+            first = values[1] if self.window > 1 else close
+            count = self.window
+        else:
+            count = len(values) + 1
+        return self._ema(weighted_sum * self.decay + close, count, first)
+
+INCREMENTAL_INDICATORS = {
+    'ema': IncrementalEMA,
+    'windowed_ema': WindowedEMA,
+    'rsi': IncrementalRSI,
+    'sma': RollingMean,
+    'std': RollingStd,
+    'vwap': IncrementalVWAP,
+}
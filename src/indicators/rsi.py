@@ -1,9 +1,15 @@
-import pandas as pd
+import numpy as np
 
 def calculate_rsi(series, window):
-    delta = series.diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=window).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=window).mean()
+    values = np.asarray(series, dtype=np.float64)
+    delta = np.diff(values)
+    if len(delta) < window:
+        return np.nan
+
+    delta = delta[-window:]
+    gain = np.where(delta > 0, delta, 0.0).mean()
+    loss = np.where(delta < 0, -delta, 0.0).mean()
+    if loss == 0:
+        return 100.0 if gain > 0 else np.nan
     rs = gain / loss
-    rsi = 100 - (100 / (1 + rs))
-    return rsi.iloc[-1]
\ No newline at end of file
+    return 100 - (100 / (1 + rs))
@@ -1,36 +1,96 @@
-import heapq
+from bisect import insort
 from src.agents.agent_time_activated import TimeActivatedAgent
 from src.agents.agent_condition_activated import ConditionActivatedAgent
+from src.agents.agent_cohort import AgentCohort
 
+from src.managers.scheduler import create_scheduler
+from src.managers.trigger_index import TriggerIndex
 from src.market.transaction import Transaction
+from src.market.order import BUY
+
+#a fired trigger can move the market and reach more triggers (stop-loss cascades);
+#checks are repeated within a step at most this many times
+MAX_TRIGGER_ROUNDS = 64
 
 class AgentManager:
-    def __init__(self, market, market_data_manager, indicator_manager):
+    def __init__(self, market, market_data_manager, indicator_manager, scheduler='calendar'):
+        """
+        Args:
+            market (Market): Market the agents trade in.
+            market_data_manager (MarketDataManager): Market data of the default symbol.
+            indicator_manager (IndicatorManager): Indicators of the default symbol.
+            scheduler (str): Activation scheduler of time-activated agents, 'calendar' or 'heap'
+                (see src/managers/scheduler.py).
+        """
         self.market = market
         self.market_data_manager = market_data_manager
         self.indicator_manager = indicator_manager
         self.agents = {}
-        self.time_queue = []
+        self.scheduler = create_scheduler(scheduler)
+        #condition agents overriding the polling hook; all others wake through trigger_index
         self.condition_agents = []
+        self.trigger_index = TriggerIndex()
+        #member id -> cohort, so fills for cohort members resolve to their member view
+        self.cohort_members = {}
+        #order id -> agent owning the resting order (cohort member view for cohorts)
+        self.order_owners = {}
 
     def register_agent(self, agent):
         self.agents[agent.agent_id] = agent
 
+        if isinstance(agent, AgentCohort):
+            for member_id in agent.member_ids.tolist():
+                self.cohort_members[member_id] = agent
+
         if isinstance(agent, TimeActivatedAgent):
-            heapq.heappush(self.time_queue, (agent.next_activation_time, agent.agent_id))
+            self.scheduler.push(agent.next_activation_time, agent.agent_id)
             
         elif isinstance(agent, ConditionActivatedAgent):
-            self.condition_agents.append(agent)
+            agent.trigger_index = self.trigger_index
+            for trigger in agent.triggers:
+                self.trigger_index.add(trigger)
+            if type(agent).check_condition_and_activate is not ConditionActivatedAgent.check_condition_and_activate:
+                self.condition_agents.append(agent)
+
+    @property
+    def time_queue(self):
+        """Sorted (time, agent_id) pairs of the scheduled activations."""
+        return self.scheduler.entries()
 
     def activate_time_agents(self, current_time):
-        while self.time_queue and self.time_queue[0][0] <= current_time:
-            _, agent_id = heapq.heappop(self.time_queue)
-            agent = self.agents.get(agent_id)
-            if agent and agent.active:
-                agent.activate(current_time)
-                heapq.heappush(self.time_queue, (agent.next_activation_time, agent_id))
+        scheduler = self.scheduler
+        agents = self.agents
+        while True:
+            due_time, batch = scheduler.pop_due(current_time)
+            if batch is None:
+                break
+            #the batch grows when an agent is due again at the same time; it is kept in
+            #agent id order so activations run in the order of a single (time, agent_id) heap
+            i = 0
+            while i < len(batch):
+                agent_id = batch[i]
+                i += 1
+                agent = agents.get(agent_id)
+                if agent and agent.active:
+                    agent.activate(current_time)
+                    next_time = agent.next_activation_time
+                    if next_time <= due_time:
+                        insort(batch, agent_id, i)
+                    else:
+                        scheduler.push(next_time, agent_id)
 
     def activate_condition_agents(self, current_time):
+        trigger_index = self.trigger_index
+        for _ in range(MAX_TRIGGER_ROUNDS):
+            if not trigger_index.triggers:
+                trigger_index.price_ranges.clear()
+                break
+            fired = trigger_index.check(self.market)
+            if not fired:
+                break
+            for trigger in fired:
+                trigger.agent.handle_trigger(trigger, current_time)
+
         for agent in self.condition_agents:
             if agent.active:
                 agent.check_condition_and_activate(current_time)
@@ -40,7 +100,20 @@ class AgentManager:
         self.activate_condition_agents(current_time)
 
     def get_agent(self, agent_id):
-        return self.agents.get(agent_id)
+        agent = self.agents.get(agent_id)
+        if agent is None:
+            cohort = self.cohort_members.get(agent_id)
+            if cohort is not None:
+                return cohort.member(agent_id)
+        return agent
+
+    def iter_portfolios(self):
+        """Yields every individual agent, expanding cohorts into their members."""
+        for agent in self.agents.values():
+            if isinstance(agent, AgentCohort):
+                yield from agent.members()
+            else:
+                yield agent
 
     #handing events that effect agents assets
 
@@ -49,32 +122,66 @@ class AgentManager:
 
         buyer = self.get_agent(transaction.buyer_id)
         seller = self.get_agent(transaction.seller_id)
+        if self.trigger_index.triggers:
+            self.trigger_index.observe_price(transaction.symbol, transaction.price, transaction.price)
 
         if buyer:
             buyer.deduct_cash(transaction.price * transaction.quantity)
-            buyer.add_holding(transaction.quantity)
+            buyer.add_holding(transaction.quantity, transaction.symbol)
 
         if seller:
             seller.add_cash(transaction.price * transaction.quantity)
-            seller.deduct_holding(transaction.quantity)
+            seller.deduct_holding(transaction.quantity, transaction.symbol)
+
+    def handle_fill_batch(self, event):
+        """Settles all fills of one incoming order: the aggressor once, each resting order's owner per fill."""
+
+        order = event.order
+        is_buy = order.side_code == BUY
+        symbol = order.symbol
+        if self.trigger_index.triggers and event.prices:
+            prices = event.prices
+            self.trigger_index.observe_price(symbol, min(prices), max(prices))
+
+        aggressor = self.get_agent(order.agent_id)
+        if aggressor:
+            if is_buy:
+                aggressor.deduct_cash(event.notional)
+                aggressor.add_holding(event.total_quantity, symbol)
+            else:
+                aggressor.add_cash(event.notional)
+                aggressor.deduct_holding(event.total_quantity, symbol)
+
+        for resting_order, price, quantity in zip(event.resting_orders, event.prices, event.quantities):
+            agent = self.get_agent(resting_order.agent_id)
+            if agent:
+                if is_buy:
+                    agent.add_cash(price * quantity)
+                    agent.deduct_holding(quantity, symbol)
+                else:
+                    agent.deduct_cash(price * quantity)
+                    agent.add_holding(quantity, symbol)
+                if resting_order.quantity == 0:
+                    agent.remove_pending_limit_order(resting_order.order_id)
+                    self.order_owners.pop(resting_order.order_id, None)
 
     def handle_order_executed(self, order_id, order_type, executed_quantity):
-
-        #TODO: 
-        agent = self.get_agent(order_id)
+        #only resting orders have an owner entry; incoming orders are never pending
+        agent = self.order_owners.get(order_id)
         if agent:
             order = agent.pending_limit_orders.get(order_id)
-            if order:
-                if order.quantity == 0:
-                    agent.remove_pending_limit_order(order_id)
+            if order is None or order.quantity == 0:
+                agent.remove_pending_limit_order(order_id)
+                del self.order_owners[order_id]
     
     def handle_order_stored(self, order):
         agent = self.get_agent(order.agent_id)
         if agent:
             agent.pending_limit_orders[order.order_id] = order
+            self.order_owners[order.order_id] = agent
 
     def handle_order_cancelled(self, order_id):
-        agent = self.get_agent(order_id)
+        agent = self.order_owners.pop(order_id, None)
         if agent:
             agent.remove_pending_limit_order(order_id)
 
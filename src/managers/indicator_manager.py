@@ -1,38 +1,93 @@
 import numpy as np
 from typing import Optional
 
+from src.indicators.incremental import INCREMENTAL_INDICATORS, IncrementalIndicator
+
 class IndicatorManager:
-    
+
     def __init__(self, market_data_manager: 'MarketDataManager'):
         self.market = market_data_manager
+        #name -> indicator entry; names registered with the same (func, period, window) share one entry
         self.indicators = {}
+        self.indicators_by_key = {}
+        #(kind, period, window, params) -> IncrementalIndicator updated on every closed bar
+        self.incremental_indicators = {}
 
     def add_indicator(self, name: str, func, window: int, period: int):
-        self.indicators[name] = {
-            'func': func,
-            'window': window,
-            'period': period,
-            'value': None
-        }
-        self.calculate_indicator(name)
+        key = (func, period, window)
+        indicator = self.indicators_by_key.get(key)
+        if indicator is None:
+            indicator = {
+                'func': func,
+                'window': window,
+                'period': period,
+                'value': None
+            }
+            self.indicators_by_key[key] = indicator
+            self._calculate(indicator)
+        self.indicators[name] = indicator
 
-    def calculate_indicator(self, name: str):
-        indicator = self.indicators[name]
+    def _calculate(self, indicator):
         window = indicator['window']
         period = indicator['period']
-        series = self.market.get_price_history(period=period, window=window)
-        if series.empty or len(series) < window:
+        series = self.market.get_close_window(period=period, window=window)
+        if len(series) < window:
             indicator['value'] = None
         else:
             indicator['value'] = indicator['func'](series, window)
 
+    def calculate_indicator(self, name: str):
+        self._calculate(self.indicators[name])
+
     def update_indicators(self):
-        for name in self.indicators:
-            self.calculate_indicator(name)
+        for indicator in self.indicators_by_key.values():
+            self._calculate(indicator)
 
     def get_indicator(self, name: str) -> Optional[float]:
         return self.indicators[name]['value']
 
     def calculate_all_indicators(self):
-        for name in self.indicators:
-            self.calculate_indicator(name)
\ No newline at end of file
+        self.update_indicators()
+
+    #incremental indicators
+
+    def add_incremental_indicator(self, kind: str, period: int, window: int, **params) -> tuple:
+        """
+        Registers an incremental indicator and returns its key.
+
+        Indicators with the same kind, period, window and parameters are created once
+        and shared. A new indicator is warmed up from the bars already closed.
+
+        Args:
+            kind (str): One of 'ema', 'windowed_ema', 'rsi', 'sma', 'std', 'vwap'.
+            period (int): The OHLCV period the indicator is computed on.
+            window (int): The indicator window in bars.
+            **params: Extra arguments for the indicator (e.g. method='sma' for RSI).
+        """
+        if kind not in INCREMENTAL_INDICATORS:
+            raise ValueError(f"Unknown indicator kind: {kind}")
+        if period not in self.market.ohlcv_periods:
+            raise ValueError(f"Period {period} not found in OHLCV periods.")
+
+        key = (kind, period, window, tuple(sorted(params.items())))
+        if key not in self.incremental_indicators:
+            indicator = INCREMENTAL_INDICATORS[kind](window, **params)
+            store = self.market.ohlcv_data[period]
+            for close, volume in zip(store.get_column('close').tolist(), store.get_column('volume').tolist()):
+                indicator.update(close, volume)
+            self.market.add_bar_listener(period, indicator.update)
+            self.incremental_indicators[key] = indicator
+        return key
+
+    def get_incremental_indicator(self, key: tuple) -> IncrementalIndicator:
+        return self.incremental_indicators[key]
+
+    def get_incremental_value(self, key: tuple, include_current_bar: bool = False) -> Optional[float]:
+        """Value of an incremental indicator, optionally as if the open bar closed now."""
+        indicator = self.incremental_indicators[key]
+        if include_current_bar:
+            period = key[1]
+            close = self.market.get_current_close(period)
+            if close is not None:
+                return indicator.peek(close, self.market.get_current_volume(period))
+        return indicator.value
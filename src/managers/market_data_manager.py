@@ -1,9 +1,27 @@
-import pandas as pd
 import numpy as np
-from typing import Optional, List
+from typing import Optional, List, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+from src.managers.ohlcv_store import OHLCVStore
+from src.managers.market_data_recorder import MarketDataRecorder
 
 class MarketDataManager:
-    def __init__(self, ohlcv_periods: List[int], store_tick_data: bool = True, max_ticks: int = 3000):
+
+    tick_dtype = np.dtype([
+        ('time', 'int64'),
+        ('transaction_price', 'float64'),
+        ('best_bid', 'float64'),
+        ('best_ask', 'float64'),
+        ('transaction_volume', 'int32'),
+        ('bid_volume', 'int32'),
+        ('ask_volume', 'int32')
+    ])
+
+    def __init__(self, ohlcv_periods: List[int], store_tick_data: bool = True, max_ticks: int = 3000,
+                 recording_dir: Optional[str] = None, recording_chunk_size: int = 65536,
+                 max_bars_in_memory: Optional[int] = None):
         """
         Initializes the MarketData object.
 
@@ -11,13 +29,15 @@ class MarketDataManager:
         - ohlcv_periods (List[int]): Periods for OHLCV aggregation in units of dt.
         - store_tick_data (bool): Whether to store tick-by-tick data.
         - max_ticks (int): Maximum number of ticks to store if store_tick_data is True.
+        - recording_dir (Optional[str]): If set, every tick and closed bar is also streamed to disk there.
+        - recording_chunk_size (int): Number of records buffered in memory before writing to disk.
+        - max_bars_in_memory (Optional[int]): Closed bars kept in memory per period (all if None).
         """
         self.ohlcv_periods = set(ohlcv_periods) if ohlcv_periods else set()
-        self.ohlcv_data = {
-            period: pd.DataFrame(columns=['open', 'high', 'low', 'close', 'volume'])
-            for period in self.ohlcv_periods
-        }
-        self.current_bars = {period: None for period in self.ohlcv_periods}
+        #closed bars per period, appended in amortized O(1)
+        self.ohlcv_data = {period: OHLCVStore(max_bars=max_bars_in_memory) for period in self.ohlcv_periods}
+        #period -> callbacks invoked with (close, volume) of every closed bar
+        self.bar_listeners = {period: [] for period in self.ohlcv_periods}
 
         self.best_bid = None
         self.best_ask = None
@@ -30,18 +50,17 @@ class MarketDataManager:
         self.store_tick_data = store_tick_data
         if self.store_tick_data:
             self.max_ticks = max_ticks
-            self.tick_dtype = np.dtype([
-                ('time', 'int64'),
-                ('transaction_price', 'float64'),
-                ('best_bid', 'float64'),
-                ('best_ask', 'float64'),
-                ('transaction_volume', 'int32'),
-                ('bid_volume', 'int32'),
-                ('ask_volume', 'int32')
-            ])
-            self.tick_data = np.zeros(self.max_ticks, dtype=self.tick_dtype)
+            #circular buffer: the oldest tick sits at tick_head
+            self.tick_buffer = np.zeros(self.max_ticks, dtype=self.tick_dtype)
+            self.tick_head = 0
             self.tick_count = 0
 
+        #on-disk recording of the full tick and bar history
+        self.recorder = None
+        if recording_dir is not None:
+            self.recorder = MarketDataRecorder(recording_dir, self.tick_dtype, OHLCVStore.bar_dtype,
+                                               self.ohlcv_periods, chunk_size=recording_chunk_size)
+
     def update_market_parameters(self, best_bid: Optional[float], best_ask: Optional[float],
                                  last_transaction_price: Optional[float], bid_volume: int, ask_volume: int):
         self.best_bid = best_bid
@@ -58,56 +77,121 @@ class MarketDataManager:
                  transaction_volume: Optional[int], bid_volume: Optional[int], ask_volume: Optional[int]):
         self.update_market_parameters(best_bid, best_ask, transaction_price, bid_volume, ask_volume)
 
-        if self.store_tick_data:
-            if self.tick_count >= self.max_ticks:
-                self.tick_data[:-1] = self.tick_data[1:]
-                self.tick_count -= 1
-            self.tick_data[self.tick_count] = (
+        if self.store_tick_data or self.recorder is not None:
+            tick = (
                 time, transaction_price or 0.0, best_bid or 0.0, best_ask or 0.0,
                 transaction_volume or 0, bid_volume or 0, ask_volume or 0
             )
-            self.tick_count += 1
+            if self.recorder is not None:
+                self.recorder.record_tick(tick)
+
+        if self.store_tick_data:
+            if self.tick_count < self.max_ticks:
+                index = (self.tick_head + self.tick_count) % self.max_ticks
+                self.tick_count += 1
+            else:
+                #overwrite the oldest tick
+                index = self.tick_head
+                self.tick_head = (self.tick_head + 1) % self.max_ticks
+            self.tick_buffer[index] = tick
 
         for period in self.ohlcv_periods:
             self.update_ohlcv(time, transaction_price or 0.0, transaction_volume or 0, period)
 
     def update_ohlcv(self, time: int, transaction_price: Optional[float], transaction_volume: int, period: int):
         current_interval = time // period
-        current_bar = self.current_bars[period]
+        store = self.ohlcv_data[period]
 
-        if current_bar is None or current_bar['time'] < current_interval * period:
-            if current_bar:
-                current_bar_df = pd.DataFrame([current_bar])
-                self.ohlcv_data[period] = pd.concat([self.ohlcv_data[period], current_bar_df], ignore_index=True)
+        if not store.has_current_bar or store.time[store.size] < current_interval * period:
+            if store.has_current_bar:
+                i = store.size
+                if self.recorder is not None:
+                    self.recorder.record_bar(period, (store.time[i], store.open[i], store.high[i],
+                                                      store.low[i], store.close[i], store.volume[i]))
+                if self.bar_listeners[period]:
+                    close = float(store.close[i])
+                    volume = int(store.volume[i])
+                    for listener in self.bar_listeners[period]:
+                        listener(close, volume)
 
             initial_price = transaction_price or self.last_transaction_price or self.best_bid or self.best_ask or 0.0
-            self.current_bars[period] = {
-                'time': current_interval * period,
-                'open': initial_price,
-                'high': initial_price,
-                'low': initial_price,
-                'close': initial_price,
-                'volume': transaction_volume
-            }
+            store.start_bar(current_interval * period, initial_price, transaction_volume)
         else:
-            current_bar['high'] = max(current_bar['high'], transaction_price or self.best_bid or self.best_ask or 0.0)
-            current_bar['low'] = min(current_bar['low'], transaction_price or self.best_bid or self.best_ask or float('inf'))
-            current_bar['close'] = transaction_price or self.last_transaction_price or self.best_bid or self.best_ask or current_bar['close']
-            current_bar['volume'] += transaction_volume
+            i = store.size
+            store.high[i] = max(store.high[i], transaction_price or self.best_bid or self.best_ask or 0.0)
+            store.low[i] = min(store.low[i], transaction_price or self.best_bid or self.best_ask or float('inf'))
+            store.close[i] = transaction_price or self.last_transaction_price or self.best_bid or self.best_ask or store.close[i]
+            store.volume[i] += transaction_volume
+
+    def get_ohlcv(self, period: int) -> 'pd.DataFrame':
+        if period not in self.ohlcv_periods:
+            raise ValueError(f"Period {period} not found. Please add it during initialization.")
 
+        return self.ohlcv_data[period].to_dataframe(include_current_bar=True)
 
-    def get_ohlcv(self, period: int) -> pd.DataFrame:
+    def flush_recording(self):
+        if self.recorder is not None:
+            self.recorder.flush()
+
+    def close_recording(self, include_open_bar: bool = True):
+        """
+        Flushes and closes the on-disk recording. The files can then be opened with
+        `open_recording`.
+
+        Args:
+            include_open_bar (bool): Also record the bar still open in every period,
+                as its last row (flagged partial). Otherwise only closed bars are kept.
+        """
+        if self.recorder is None:
+            return
+        open_bars = {}
+        if include_open_bar:
+            for period, store in self.ohlcv_data.items():
+                if store.has_current_bar:
+                    i = store.size
+                    open_bars[period] = (store.time[i], store.open[i], store.high[i],
+                                         store.low[i], store.close[i], store.volume[i])
+        self.recorder.close(open_bars)
+
+    def add_bar_listener(self, period: int, listener):
+        """Registers `listener(close, volume)` to be called each time a bar of `period` closes."""
         if period not in self.ohlcv_periods:
             raise ValueError(f"Period {period} not found. Please add it during initialization.")
+        self.bar_listeners[period].append(listener)
 
-        ohlcv_df = self.ohlcv_data[period].copy()
+    def get_current_close(self, period: int) -> Optional[float]:
+        """Close price of the bar that is still open, or None if no bar has started."""
+        store = self.ohlcv_data[period]
+        if not store.has_current_bar:
+            return None
+        return float(store.close[store.size])
 
-        current_bar = self.current_bars[period]
-        if current_bar:
-            current_bar_df = pd.DataFrame([current_bar])
-            ohlcv_df = pd.concat([ohlcv_df, current_bar_df], ignore_index=True)
+    def get_current_volume(self, period: int) -> int:
+        """Volume traded so far in the bar that is still open (0 if no bar has started)."""
+        store = self.ohlcv_data[period]
+        if not store.has_current_bar:
+            return 0
+        return int(store.volume[store.size])
 
-        return ohlcv_df
+    def get_current_bar(self, period: int) -> Optional[dict]:
+        if period not in self.ohlcv_periods:
+            raise ValueError(f"Period {period} not found. Please add it during initialization.")
+
+        return self.ohlcv_data[period].current_bar()
+
+    def export_ohlcv_csv(self, period: int, path: str, include_current_bar: bool = False):
+        """
+        Writes OHLCV bars for a given period to a CSV file.
+
+        Args:
+            period (int): The OHLCV period to export.
+            path (str): Output file path.
+            include_current_bar (bool): Whether to include the bar that is still open.
+        """
+        if period not in self.ohlcv_periods:
+            raise ValueError(f"Period {period} not found. Please add it during initialization.")
+
+        self.ohlcv_data[period].to_dataframe(include_current_bar=include_current_bar).to_csv(path, index=False)
 
     def calculate_mid_price(self, best_bid: Optional[float], best_ask: Optional[float]) -> Optional[float]:
         if best_bid is not None and best_ask is not None:
@@ -115,12 +199,28 @@ class MarketDataManager:
         return None
 
     def get_recent_ticks(self, n: int) -> np.ndarray:
+        """
+        Returns the last `n` stored ticks in chronological order.
 
+        The result is a view of the tick buffer when the requested range does not
+        wrap around its end, and a single concatenated copy when it does.
+        """
         if not self.store_tick_data:
             raise ValueError("Tick data storage is disabled.")
-        return self.tick_data[max(0, self.tick_count - n):self.tick_count]
+
+        n = max(0, min(n, self.tick_count))
+        start = (self.tick_head + self.tick_count - n) % self.max_ticks
+        end = start + n
+        if end <= self.max_ticks:
+            return self.tick_buffer[start:end]
+        return np.concatenate((self.tick_buffer[start:], self.tick_buffer[:end - self.max_ticks]))
+
+    @property
+    def tick_data(self) -> np.ndarray:
+        """All stored ticks in chronological order."""
+        return self.get_recent_ticks(self.tick_count)
     
-    def get_price_history(self, period: int, window: int) -> pd.Series:
+    def get_price_history(self, period: int, window: int) -> 'pd.Series':
         """
         Returns the price history (close prices) for a given period and window.
 
@@ -134,12 +234,25 @@ class MarketDataManager:
         if period not in self.ohlcv_periods:
             raise ValueError(f"Period {period} not found in OHLCV periods.")
 
-        ohlcv_df = self.get_ohlcv(period)
-        if ohlcv_df.empty:
-            return pd.Series([], dtype=float)
+        import pandas as pd
+        return pd.Series(self.get_close_window(period, window), dtype=float)
+
+    def get_close_window(self, period: int, window: int) -> np.ndarray:
+        """
+        Returns the last `window` close prices, including the bar that is still open,
+        as a read-only view into the OHLCV store. No data is copied.
+
+        Args:
+            period (int): The OHLCV period to use.
+            window (int): The number of intervals to retrieve.
+
+        Returns:
+            np.ndarray: Read-only array of close prices (may be shorter than `window`).
+        """
+        if period not in self.ohlcv_periods:
+            raise ValueError(f"Period {period} not found in OHLCV periods.")
 
-        # Return the last `window` close prices
-        return ohlcv_df['close'].iloc[-window:]
+        return self.ohlcv_data[period].get_window('close', window)
     
     def get_last_transaction_price(self) -> Optional[float]:
         return self.last_transaction_price
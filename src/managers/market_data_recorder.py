@@ -0,0 +1,145 @@
+import json
+import os
+import numpy as np
+
+META_FILE = 'meta.json'
+TICKS_FILE = 'ticks.bin'
+
+def _bars_file(period):
+    return f'ohlcv_{period}.bin'
+
+class MarketDataRecorder:
+    """
+    Streams ticks and closed OHLCV bars to fixed-dtype binary files on disk.
+
+    Records are collected in in-memory chunks of `chunk_size` rows and appended
+    to the files when a chunk fills up, so memory use stays bounded no matter how
+    long the run is. The files are raw arrays of the recorded dtype and can be
+    reopened read-only with `np.memmap` (see `open_recording`).
+
+    Bars are recorded as they close. `close` can also write the bars still open as
+    final rows; those periods are flagged `partial_last` in the metadata (see
+    `open_recording`). Recording after `close` raises ValueError.
+    """
+
+    def __init__(self, directory: str, tick_dtype: np.dtype, bar_dtype: np.dtype, ohlcv_periods, chunk_size: int = 65536):
+        self.directory = directory
+        self.chunk_size = chunk_size
+        os.makedirs(directory, exist_ok=True)
+
+        self.tick_dtype = tick_dtype
+        self.bar_dtype = bar_dtype
+        self.tick_chunk = np.zeros(chunk_size, dtype=tick_dtype)
+        self.tick_chunk_count = 0
+        self.tick_file = open(os.path.join(directory, TICKS_FILE), 'wb')
+        self.ticks_written = 0
+
+        self.bar_chunks = {period: np.zeros(chunk_size, dtype=bar_dtype) for period in ohlcv_periods}
+        self.bar_chunk_counts = {period: 0 for period in ohlcv_periods}
+        self.bar_files = {period: open(os.path.join(directory, _bars_file(period)), 'wb') for period in ohlcv_periods}
+        self.bars_written = {period: 0 for period in ohlcv_periods}
+        #periods whose last recorded bar was still open when the recording closed
+        self.partial_last = set()
+
+        self.closed = False
+        self._write_meta()
+
+    def record_tick(self, tick: tuple):
+        if self.closed:
+            raise ValueError(f"Recording in {self.directory} is closed")
+        self.tick_chunk[self.tick_chunk_count] = tick
+        self.tick_chunk_count += 1
+        if self.tick_chunk_count == self.chunk_size:
+            self._flush_ticks()
+
+    def record_bar(self, period: int, bar: tuple):
+        if self.closed:
+            raise ValueError(f"Recording in {self.directory} is closed")
+        count = self.bar_chunk_counts[period]
+        self.bar_chunks[period][count] = bar
+        self.bar_chunk_counts[period] = count + 1
+        if count + 1 == self.chunk_size:
+            self._flush_bars(period)
+
+    def _flush_ticks(self):
+        if self.tick_chunk_count:
+            self.tick_file.write(self.tick_chunk[:self.tick_chunk_count].tobytes())
+            self.ticks_written += self.tick_chunk_count
+            self.tick_chunk_count = 0
+
+    def _flush_bars(self, period):
+        count = self.bar_chunk_counts[period]
+        if count:
+            self.bar_files[period].write(self.bar_chunks[period][:count].tobytes())
+            self.bars_written[period] += count
+            self.bar_chunk_counts[period] = 0
+
+    def flush(self):
+        """Writes all buffered records to disk."""
+        if self.closed:
+            return
+        self._flush_ticks()
+        self.tick_file.flush()
+        for period, bar_file in self.bar_files.items():
+            self._flush_bars(period)
+            bar_file.flush()
+        self._write_meta()
+
+    def close(self, open_bars: dict = None):
+        """
+        Writes out everything buffered and closes the files.
+
+        Args:
+            open_bars (dict): {period: bar tuple} of bars still open, appended as the
+                last (partial) row of their period.
+        """
+        if self.closed:
+            return
+        for period, bar in (open_bars or {}).items():
+            self.record_bar(period, bar)
+            self.partial_last.add(period)
+        self.flush()
+        self.tick_file.close()
+        for bar_file in self.bar_files.values():
+            bar_file.close()
+        self.closed = True
+
+    def _write_meta(self):
+        meta = {
+            'tick_dtype': np.lib.format.dtype_to_descr(self.tick_dtype),
+            'bar_dtype': np.lib.format.dtype_to_descr(self.bar_dtype),
+            'ticks': self.ticks_written,
+            'ohlcv': {str(period): {'file': _bars_file(period), 'bars': count,
+                                    'partial_last': period in self.partial_last}
+                      for period, count in self.bars_written.items()},
+        }
+        with open(os.path.join(self.directory, META_FILE), 'w') as file:
+            json.dump(meta, file)
+
+def _open_array(path, dtype, count):
+    if count == 0:
+        return np.zeros(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode='r', shape=(count,))
+
+def open_recording(directory: str) -> dict:
+    """
+    Opens a recording made by `MarketDataRecorder` as read-only memory-mapped arrays.
+
+    Returns:
+        dict: {'ticks': array, 'ohlcv': {period: array}, 'partial_last': {period: bool}}
+            with the recorded dtypes; `partial_last` tells whether the last bar of a
+            period was still open when the recording closed.
+    """
+    with open(os.path.join(directory, META_FILE)) as file:
+        meta = json.load(file)
+
+    tick_dtype = np.lib.format.descr_to_dtype([tuple(field) for field in meta['tick_dtype']])
+    bar_dtype = np.lib.format.descr_to_dtype([tuple(field) for field in meta['bar_dtype']])
+    return {
+        'ticks': _open_array(os.path.join(directory, TICKS_FILE), tick_dtype, meta['ticks']),
+        'ohlcv': {
+            int(period): _open_array(os.path.join(directory, info['file']), bar_dtype, info['bars'])
+            for period, info in meta['ohlcv'].items()
+        },
+        'partial_last': {int(period): info['partial_last'] for period, info in meta['ohlcv'].items()},
+    }
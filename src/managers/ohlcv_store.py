@@ -0,0 +1,139 @@
+import numpy as np
+from typing import Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+class OHLCVStore:
+    """
+    Append-only, column-oriented storage for OHLCV bars.
+
+    Each column is a preallocated NumPy array that doubles in capacity when full,
+    so closing a bar is amortized O(1). The bar that is still open lives in the
+    row right after the last closed bar, which lets readers take windows that
+    include it as plain array views. Conversion to a DataFrame happens only on
+    request (see `to_dataframe`).
+
+    With `max_bars` set, only the most recent `max_bars` closed bars are kept in
+    memory; older bars are dropped in blocks, which keeps appends amortized O(1).
+    """
+
+    columns = ('open', 'high', 'low', 'close', 'volume', 'time')
+    bar_dtype = np.dtype([
+        ('time', 'int64'),
+        ('open', 'float64'),
+        ('high', 'float64'),
+        ('low', 'float64'),
+        ('close', 'float64'),
+        ('volume', 'int64')
+    ])
+
+    def __init__(self, initial_capacity: int = 1024, max_bars: Optional[int] = None):
+        self.max_bars = max_bars
+        if max_bars is not None:
+            initial_capacity = 2 * max_bars + 2
+        self.capacity = max(2, initial_capacity)
+        self.size = 0  #number of closed bars held in memory
+        self.dropped = 0  #number of closed bars discarded from memory
+        self.has_current_bar = False
+        self.open = np.zeros(self.capacity, dtype=np.float64)
+        self.high = np.zeros(self.capacity, dtype=np.float64)
+        self.low = np.zeros(self.capacity, dtype=np.float64)
+        self.close = np.zeros(self.capacity, dtype=np.float64)
+        self.volume = np.zeros(self.capacity, dtype=np.int64)
+        self.time = np.zeros(self.capacity, dtype=np.int64)
+
+    def __len__(self):
+        return self.size
+
+    def _grow(self):
+        new_capacity = self.capacity * 2
+        used = self.size + 1 if self.has_current_bar else self.size
+        for name in self.columns:
+            old = getattr(self, name)
+            new = np.zeros(new_capacity, dtype=old.dtype)
+            new[:used] = old[:used]
+            setattr(self, name, new)
+        self.capacity = new_capacity
+
+    def _make_room(self):
+        if self.max_bars is None or self.size <= self.max_bars:
+            self._grow()
+            return
+
+        drop = self.size - self.max_bars
+        used = self.size + 1 if self.has_current_bar else self.size
+        for name in self.columns:
+            column = getattr(self, name)
+            column[:used - drop] = column[drop:used]
+        self.size -= drop
+        self.dropped += drop
+
+    def _write_row(self, i, time, open_, high, low, close, volume):
+        self.time[i] = time
+        self.open[i] = open_
+        self.high[i] = high
+        self.low[i] = low
+        self.close[i] = close
+        self.volume[i] = volume
+
+    def append(self, time: int, open_: float, high: float, low: float, close: float, volume: int):
+        """Appends a closed bar. Must not be mixed with an open current bar."""
+        if self.has_current_bar:
+            raise ValueError("Cannot append a closed bar while a bar is open.")
+        if self.size + 1 >= self.capacity:
+            self._make_room()
+        self._write_row(self.size, time, open_, high, low, close, volume)
+        self.size += 1
+
+    def append_bar(self, bar: dict):
+        self.append(bar['time'], bar['open'], bar['high'], bar['low'], bar['close'], bar['volume'])
+
+    #current (open) bar
+
+    def start_bar(self, time: int, price: float, volume: int):
+        """Closes the current bar, if any, and opens a new one."""
+        if self.has_current_bar:
+            self.size += 1
+        if self.size + 1 >= self.capacity:
+            self._make_room()
+        self._write_row(self.size, time, price, price, price, price, volume)
+        self.has_current_bar = True
+
+    def current_bar(self) -> Optional[dict]:
+        if not self.has_current_bar:
+            return None
+        i = self.size
+        return {name: getattr(self, name)[i].item() for name in self.columns}
+
+    def last_bars(self, n: int) -> list:
+        """The last `n` closed bars still in memory, as dicts, oldest first."""
+        start = max(0, self.size - n)
+        return [{name: getattr(self, name)[i].item() for name in self.columns} for i in range(start, self.size)]
+
+    def current_bar_time(self) -> Optional[int]:
+        return int(self.time[self.size]) if self.has_current_bar else None
+
+    #readers
+
+    def get_column(self, name: str) -> np.ndarray:
+        """Returns a view of the closed bars of a column."""
+        return getattr(self, name)[:self.size]
+
+    def get_window(self, name: str, window: int, include_current_bar: bool = True) -> np.ndarray:
+        """
+        Returns a read-only view of the last `window` values of a column.
+
+        The data is not copied, so the view reflects later updates of the
+        current bar and is invalidated when the store grows or drops old bars.
+        """
+        end = self.size + 1 if include_current_bar and self.has_current_bar else self.size
+        view = getattr(self, name)[max(0, end - window):end]
+        view.flags.writeable = False
+        return view
+
+    def to_dataframe(self, include_current_bar: bool = False) -> 'pd.DataFrame':
+        #pandas is only needed here, so it is imported on first use
+        import pandas as pd
+        end = self.size + 1 if include_current_bar and self.has_current_bar else self.size
+        return pd.DataFrame({name: getattr(self, name)[:end].copy() for name in self.columns})
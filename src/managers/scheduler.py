@@ -0,0 +1,145 @@
+"""
+Activation schedulers of AgentManager.
+
+Both hand out the agents due at the earliest pending time as one batch, ordered by
+agent id, so runs are identical whichever scheduler is used:
+
+    time, batch = scheduler.pop_due(current_time)
+
+HeapScheduler keeps one (time, agent_id) heap entry per agent: O(log n) per push
+and pop. CalendarScheduler is a calendar queue over integer times: a ring of
+`horizon` buckets indexed by time, read by a cursor that only moves forward.
+Scheduling an agent within the horizon is a list append and a due batch is taken
+from its bucket in O(1), plus the cursor's walk over empty times (amortised over
+the run) and the sort of the batch into agent id order. Times beyond the horizon,
+and times behind the cursor, wait in an overflow heap at O(log n) each and move
+into the ring as the cursor approaches them.
+"""
+import heapq
+
+class HeapScheduler:
+    def __init__(self):
+        self.queue = []
+
+    def __len__(self):
+        return len(self.queue)
+
+    def push(self, time, agent_id):
+        heapq.heappush(self.queue, (time, agent_id))
+
+    def next_time(self):
+        """Earliest pending activation time, None if nothing is scheduled."""
+        return self.queue[0][0] if self.queue else None
+
+    def pop_due(self, current_time):
+        """(time, agent ids) of the earliest pending time if it is <= `current_time`, else (None, None)."""
+        queue = self.queue
+        if not queue or queue[0][0] > current_time:
+            return None, None
+        time = queue[0][0]
+        batch = []
+        while queue and queue[0][0] == time:
+            batch.append(heapq.heappop(queue)[1])
+        return time, batch
+
+    def entries(self):
+        """Sorted (time, agent_id) pairs of everything scheduled."""
+        return sorted(self.queue)
+
+class CalendarScheduler:
+    def __init__(self, horizon=4096):
+        """
+        Args:
+            horizon (int): Number of buckets, i.e. how far ahead of the cursor (in time
+                units) activations go straight into the ring.
+        """
+        if horizon < 1:
+            raise ValueError("horizon must be a positive integer")
+        self.horizon = horizon
+        #bucket `time % horizon` holds the agent ids due at `time`, for cursor <= time < cursor + horizon
+        self.buckets = [[] for _ in range(horizon)]
+        self.cursor = 0
+        self.ring_count = 0
+        #(time, agent_id) heap of the activations outside the ring
+        self.overflow = []
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def push(self, time, agent_id):
+        if self.cursor <= time < self.cursor + self.horizon:
+            self.buckets[time % self.horizon].append(agent_id)
+            self.ring_count += 1
+        else:
+            heapq.heappush(self.overflow, (time, agent_id))
+        self.count += 1
+
+    def _fill_ring(self):
+        #moves the overflow activations the ring now covers into their buckets
+        overflow = self.overflow
+        end = self.cursor + self.horizon
+        while overflow and overflow[0][0] < end:
+            time, agent_id = heapq.heappop(overflow)
+            self.buckets[time % self.horizon].append(agent_id)
+            self.ring_count += 1
+
+    def next_time(self):
+        """Earliest pending activation time, None if nothing is scheduled."""
+        if not self.count:
+            return None
+        overflow = self.overflow
+        if overflow and overflow[0][0] < self.cursor:
+            return overflow[0][0]
+        if not self.ring_count:
+            #nothing within the horizon: jump to the earliest overflow time
+            self.cursor = overflow[0][0]
+            self._fill_ring()
+            return self.cursor
+        buckets = self.buckets
+        horizon = self.horizon
+        while not buckets[self.cursor % horizon]:
+            self.cursor += 1
+            if overflow:
+                self._fill_ring()
+        return self.cursor
+
+    def pop_due(self, current_time):
+        """(time, agent ids) of the earliest pending time if it is <= `current_time`, else (None, None)."""
+        time = self.next_time()
+        if time is None or time > current_time:
+            return None, None
+        if time < self.cursor:
+            #scheduled behind the cursor; those wait in the overflow heap, already in id order
+            overflow = self.overflow
+            batch = []
+            while overflow and overflow[0][0] == time:
+                batch.append(heapq.heappop(overflow)[1])
+        else:
+            index = time % self.horizon
+            batch = self.buckets[index]
+            self.buckets[index] = []
+            self.ring_count -= len(batch)
+            #same order as the heap pops them
+            batch.sort()
+        self.count -= len(batch)
+        return time, batch
+
+    def entries(self):
+        """Sorted (time, agent_id) pairs of everything scheduled."""
+        horizon = self.horizon
+        entries = list(self.overflow)
+        for offset in range(horizon):
+            time = self.cursor + offset
+            entries.extend((time, agent_id) for agent_id in self.buckets[time % horizon])
+        return sorted(entries)
+
+SCHEDULERS = {
+    'heap': HeapScheduler,
+    'calendar': CalendarScheduler,
+}
+
+def create_scheduler(name='calendar'):
+    if name not in SCHEDULERS:
+        raise ValueError(f"Unknown scheduler: {name} (expected one of {', '.join(SCHEDULERS)})")
+    return SCHEDULERS[name]()
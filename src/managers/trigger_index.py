@@ -0,0 +1,156 @@
+import math
+from sortedcontainers import SortedList
+
+ABOVE = 'above'
+BELOW = 'below'
+
+#metrics a trigger can watch:
+#  price      last transaction price (every fill since the last check counts, so a price
+#             that crosses a level and comes back within one step still fires)
+#  spread     best ask - best bid
+#  volume     volume of the open bar of period `key`
+#  indicator  incremental indicator `key` (see IndicatorManager.add_incremental_indicator)
+METRICS = ('price', 'spread', 'volume', 'indicator')
+
+class Trigger:
+    """
+    One-shot condition of a ConditionActivatedAgent: `metric` (of `symbol`) reaching
+    `level` from below (ABOVE: value >= level) or from above (BELOW: value <= level).
+    """
+    __slots__ = ('agent', 'metric', 'direction', 'level', 'symbol', 'key', 'seq', 'armed')
+
+    def __init__(self, agent, metric, direction, level, symbol=None, key=None):
+        if metric not in METRICS:
+            raise ValueError(f"Unknown trigger metric: {metric}")
+        if direction not in (ABOVE, BELOW):
+            raise ValueError(f"Trigger direction must be '{ABOVE}' or '{BELOW}', got {direction!r}")
+        if metric in ('volume', 'indicator') and key is None:
+            raise ValueError(f"'{metric}' triggers require a key")
+        self.agent = agent
+        self.metric = metric
+        self.direction = direction
+        self.level = level
+        self.symbol = symbol
+        self.key = key
+        self.seq = None
+        self.armed = False
+
+    @property
+    def watch_key(self):
+        return (self.metric, self.symbol, self.key)
+
+    def __repr__(self):
+        return f"Trigger({self.metric}, {self.direction}, {self.level}, agent={self.agent.agent_id})"
+
+class TriggerIndex:
+    """
+    Armed triggers kept in sorted lists by level, one pair (ABOVE / BELOW) per watched
+    (metric, symbol, key).
+
+    Checking a new value (or range of values) of a metric pops exactly the triggers
+    whose level was reached: ABOVE triggers are a prefix of their list and BELOW
+    triggers a suffix, so a check costs O(log n + fired) however many triggers wait.
+    """
+
+    def __init__(self):
+        #watch key -> (above, below); entries are (level, seq), seq -> trigger
+        self.levels = {}
+        self.triggers = {}
+        #next trigger sequence number; a plain int so the index pickles into snapshots
+        self.next_seq = 0
+        #symbol -> [low, high] of fill prices since the last check
+        self.price_ranges = {}
+
+    def __len__(self):
+        return len(self.triggers)
+
+    def add(self, trigger: Trigger):
+        if trigger.armed:
+            return
+        watch_key = trigger.watch_key
+        levels = self.levels.get(watch_key)
+        if levels is None:
+            levels = self.levels[watch_key] = (SortedList(), SortedList())
+        trigger.seq = self.next_seq
+        self.next_seq += 1
+        trigger.armed = True
+        self.triggers[trigger.seq] = trigger
+        levels[0 if trigger.direction == ABOVE else 1].add((trigger.level, trigger.seq))
+
+    def remove(self, trigger: Trigger):
+        if not trigger.armed:
+            return
+        levels = self.levels[trigger.watch_key]
+        levels[0 if trigger.direction == ABOVE else 1].remove((trigger.level, trigger.seq))
+        del self.triggers[trigger.seq]
+        trigger.armed = False
+
+    def observe_price(self, symbol, low, high):
+        """Widens the price range of `symbol` seen since the last check."""
+        price_range = self.price_ranges.get(symbol)
+        if price_range is None:
+            self.price_ranges[symbol] = [low, high]
+        else:
+            if low < price_range[0]:
+                price_range[0] = low
+            if high > price_range[1]:
+                price_range[1] = high
+
+    def _pop(self, levels, low, high, fired):
+        above, below = levels
+        if above:
+            end = above.bisect_right((high, float('inf')))
+            if end:
+                for _, seq in above[:end]:
+                    fired.append(self.triggers.pop(seq))
+                del above[:end]
+        if below:
+            start = below.bisect_left((low, -1))
+            if start < len(below):
+                for _, seq in below[start:]:
+                    fired.append(self.triggers.pop(seq))
+                del below[start:]
+
+    def check(self, market) -> list:
+        """
+        Pops and returns the triggers reached by the current state of `market` (and by
+        the fill prices observed since the last check).
+        """
+        price_ranges, self.price_ranges = self.price_ranges, {}
+        fired = []
+        if not self.triggers:
+            return fired
+
+        for (metric, symbol, key), levels in self.levels.items():
+            if not levels[0] and not levels[1]:
+                continue
+            market_data = market.market_data_by_symbol[market.symbol if symbol is None else symbol]
+
+            if metric == 'price':
+                price = market_data.last_transaction_price
+                price_range = price_ranges.get(symbol)
+                if price_range is not None:
+                    low, high = price_range
+                elif price is not None:
+                    low = high = price
+                else:
+                    continue
+                self._pop(levels, low, high, fired)
+                continue
+
+            if metric == 'spread':
+                if market_data.best_bid is None or market_data.best_ask is None:
+                    continue
+                value = market_data.best_ask - market_data.best_bid
+            elif metric == 'volume':
+                value = market_data.get_current_volume(key)
+            else:
+                indicator_manager = market.indicator_managers[market.symbol if symbol is None else symbol]
+                value = indicator_manager.get_incremental_value(key)
+                if value is None or math.isnan(value):
+                    continue
+            self._pop(levels, value, value, fired)
+
+        for trigger in fired:
+            trigger.armed = False
+        return fired
@@ -0,0 +1,43 @@
+from src.market.order import BUY, SELL, side_code
+
+class BookMirror:
+    """
+    L2 copy of an order book kept up to date from its level change feed.
+
+    Attach it with `order_book.add_level_listener(mirror.apply)`. With `record` set,
+    every change is also kept as (time, side, price, volume), where time comes from
+    `clock` (e.g. `market.get_current_time`), giving the L2 history at diff cost.
+    """
+
+    def __init__(self, clock=None, record=False):
+        self.bids = {}
+        self.asks = {}
+        self.clock = clock
+        self.history = [] if record else None
+
+    @classmethod
+    def attach(cls, order_book, **kwargs):
+        """Mirror of `order_book` as it is now, following its changes from here on."""
+        mirror = cls(**kwargs)
+        for side, levels in ((BUY, mirror.bids), (SELL, mirror.asks)):
+            levels.update(order_book.get_depth(side))
+        order_book.add_level_listener(mirror.apply)
+        return mirror
+
+    def apply(self, side, price, volume):
+        levels = self.bids if side == BUY else self.asks
+        if volume:
+            levels[price] = volume
+        else:
+            levels.pop(price, None)
+        if self.history is not None:
+            self.history.append((self.clock() if self.clock is not None else None, side, price, volume))
+
+    def get_depth(self, side):
+        return dict(self.bids if side_code(side) == BUY else self.asks)
+
+    def top_levels(self, side, n):
+        """Best `n` (price, volume) pairs of `side`; sorts the mirror, so meant for occasional reads."""
+        is_bid = side_code(side) == BUY
+        levels = self.bids if is_bid else self.asks
+        return [(price, levels[price]) for price in sorted(levels, reverse=is_bid)[:n]]
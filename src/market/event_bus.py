@@ -14,7 +14,84 @@ class EventBus:
             if not self.subscribers[event_type]:
                 del self.subscribers[event_type]
 
+    def has_subscribers(self, event_type) -> bool:
+        """Publishers check this to skip building events nobody receives."""
+        return event_type in self.subscribers
+
     def publish(self, event):
         handlers = self.subscribers.get(event.event_type, [])
         for handler in handlers:
             handler(event)
+
+    def attach_sink(self, sink):
+        """Subscribes every handler of `sink` (a `handlers()` -> {event_type: handler} object)."""
+        for event_type, handler in sink.handlers().items():
+            self.subscribe(event_type, handler)
+
+    def detach_sink(self, sink):
+        for event_type, handler in sink.handlers().items():
+            self.unsubscribe(event_type, handler)
+
+def _compile_handlers(handlers):
+    if len(handlers) == 1:
+        return handlers[0]
+    if len(handlers) == 2:
+        first, second = handlers
+
+        def dispatch_two(event):
+            first(event)
+            second(event)
+        return dispatch_two
+
+    handlers = tuple(handlers)
+
+    def dispatch_all(event):
+        for handler in handlers:
+            handler(event)
+    return dispatch_all
+
+class CompiledEventBus(EventBus):
+    """
+    EventBus that resolves the handlers of an event type when subscriptions change
+    instead of on every publish: each type maps to a single callable (the handler
+    itself, or a chain calling the handlers in subscription order).
+
+    Subscribing or unsubscribing while an event is being published takes effect from
+    the next publish.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.dispatch = {}
+
+    def _recompile(self, event_type):
+        handlers = self.subscribers.get(event_type)
+        if handlers:
+            self.dispatch[event_type] = _compile_handlers(handlers)
+        else:
+            self.dispatch.pop(event_type, None)
+
+    def subscribe(self, event_type, handler):
+        super().subscribe(event_type, handler)
+        self._recompile(event_type)
+
+    def unsubscribe(self, event_type, handler):
+        super().unsubscribe(event_type, handler)
+        self._recompile(event_type)
+
+    def publish(self, event):
+        handler = self.dispatch.get(event.event_type)
+        if handler is not None:
+            handler(event)
+
+    #compiled chains are closures; rebuild them instead of pickling them
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['dispatch'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.dispatch = {}
+        for event_type in self.subscribers:
+            self._recompile(event_type)
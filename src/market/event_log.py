@@ -0,0 +1,179 @@
+import json
+import struct
+import zlib
+import numpy as np
+
+from src.market.events import OrderSubmittedEvent, CancelRequestedEvent, TransactionEvent, FillBatchEvent
+from src.market.order import BUY, SELL, LIMIT
+
+#record kinds
+SUBMIT = 0
+CANCEL = 1
+FILL = 2
+
+#one fixed-size record per message; unused fields are 0 (price is NaN for market orders)
+#  SUBMIT: order_id, agent_id, side, order_type, tif, price, quantity, expire_time (GTT/DAY)
+#  CANCEL: order_id
+#  every record also has `symbol`, the index of its symbol in the log's symbol list
+#  FILL:   order_id/agent_id = buy side, other_order_id/other_agent_id = sell side,
+#          side = side of the incoming (aggressor) order, price, quantity
+RECORD_DTYPE = np.dtype([
+    ('kind', 'u1'),
+    ('side', 'u1'),
+    ('order_type', 'u1'),
+    ('tif', 'u1'),
+    ('symbol', '<u2'),
+    ('time', '<i8'),
+    ('order_id', '<i8'),
+    ('agent_id', '<i8'),
+    ('other_order_id', '<i8'),
+    ('other_agent_id', '<i8'),
+    ('price', '<f8'),
+    ('quantity', '<i8'),
+    ('expire_time', '<i8'),
+])
+
+MAGIC = b'ABMEVLOG'
+VERSION = 1
+_CHUNK_HEADER = struct.Struct('<II')  #compressed size, number of records
+
+class EventLog:
+    """
+    Event bus sink writing order submissions, cancel requests and fills as fixed-size
+    binary records (`RECORD_DTYPE`).
+
+    Records are buffered in a chunk of `chunk_size` rows; full chunks are
+    zlib-compressed and appended to the file as [compressed size, record count, data].
+    The file starts with a header holding the record dtype and the symbol list, so
+    logs stay readable if the schema changes. Read logs with `read_event_log` /
+    `load_event_log`.
+    """
+
+    def __init__(self, path: str, chunk_size: int = 65536, compression_level: int = 1, fill_batches: bool = False,
+                 symbols=None):
+        """
+        Args:
+            path (str): Log file (overwritten).
+            chunk_size (int): Records per compressed chunk.
+            compression_level (int): zlib level (1 is fast and already shrinks records ~4x).
+            fill_batches (bool): Log fills from FillBatchEvents instead of TransactionEvents
+                (for markets that publish batches only).
+            symbols (list): Symbols of the market, stored as indices in the records.
+        """
+        self.path = path
+        self.chunk_size = chunk_size
+        self.compression_level = compression_level
+        self.fill_batches = fill_batches
+        self.symbols = list(symbols) if symbols else [None]
+        self.symbol_index = {symbol: index for index, symbol in enumerate(self.symbols)}
+
+        self.chunk = np.zeros(chunk_size, dtype=RECORD_DTYPE)
+        self.count = 0
+        self.records_written = 0
+        self.current_side = BUY  #side of the order being matched, for fill records
+
+        self.file = open(path, 'wb')
+        header = json.dumps({'dtype': np.lib.format.dtype_to_descr(RECORD_DTYPE), 'symbols': self.symbols}).encode()
+        self.file.write(MAGIC + struct.pack('<II', VERSION, len(header)) + header)
+        self.closed = False
+
+    def handlers(self):
+        handlers = {
+            'order_submitted': self.handle_order_submitted,
+            'cancel_requested': self.handle_cancel_requested,
+        }
+        if self.fill_batches:
+            handlers['fill_batch'] = self.handle_fill_batch
+        else:
+            handlers['transaction'] = self.handle_transaction
+        return handlers
+
+    def _append(self, record):
+        self.chunk[self.count] = record
+        self.count += 1
+        if self.count == self.chunk_size:
+            self._write_chunk()
+
+    def handle_order_submitted(self, event: OrderSubmittedEvent):
+        order = event.order
+        self.current_side = order.side_code
+        self._append((SUBMIT, order.side_code, order.type_code, order.tif_code, self.symbol_index[order.symbol],
+                      event.timestamp, order.order_id,
+                      order.agent_id, 0, 0, order.price if order.type_code == LIMIT else np.nan, order.quantity,
+                      order.expire_time if order.expire_time is not None else 0))
+
+    def handle_cancel_requested(self, event: CancelRequestedEvent):
+        self._append((CANCEL, 0, 0, 0, self.symbol_index[event.symbol], event.timestamp, event.order_id, 0, 0, 0, np.nan, 0, 0))
+
+    def handle_transaction(self, event: TransactionEvent):
+        transaction = event.transaction
+        self._append((FILL, self.current_side, 0, 0, self.symbol_index[transaction.symbol], event.timestamp,
+                      transaction.order_buy_id, transaction.buyer_id, transaction.order_sell_id, transaction.seller_id,
+                      transaction.price, transaction.quantity, 0))
+
+    def handle_fill_batch(self, event: FillBatchEvent):
+        order = event.order
+        is_buy = order.side_code == BUY
+        symbol = self.symbol_index[order.symbol]
+        for resting_order, price, quantity in zip(event.resting_orders, event.prices, event.quantities):
+            if is_buy:
+                record = (FILL, BUY, 0, 0, symbol, event.timestamp, order.order_id, order.agent_id,
+                          resting_order.order_id, resting_order.agent_id, price, quantity, 0)
+            else:
+                record = (FILL, SELL, 0, 0, symbol, event.timestamp, resting_order.order_id, resting_order.agent_id,
+                          order.order_id, order.agent_id, price, quantity, 0)
+            self._append(record)
+
+    def _write_chunk(self):
+        if self.count:
+            data = zlib.compress(self.chunk[:self.count].tobytes(), self.compression_level)
+            self.file.write(_CHUNK_HEADER.pack(len(data), self.count))
+            self.file.write(data)
+            self.records_written += self.count
+            self.count = 0
+
+    def flush(self):
+        """Writes the buffered (possibly partial) chunk to disk."""
+        if self.closed:
+            return
+        self._write_chunk()
+        self.file.flush()
+
+    def close(self):
+        if self.closed:
+            return
+        self.flush()
+        self.file.close()
+        self.closed = True
+
+def _read_header(file, path):
+    if file.read(len(MAGIC)) != MAGIC:
+        raise ValueError(f"{path} is not an event log")
+    version, header_size = struct.unpack('<II', file.read(8))
+    if version != VERSION:
+        raise ValueError(f"Unsupported event log version: {version}")
+    header = json.loads(file.read(header_size))
+    dtype = np.lib.format.descr_to_dtype([tuple(field) for field in header['dtype']])
+    return dtype, header['symbols']
+
+def read_event_log_symbols(path: str) -> list:
+    """Symbols of an event log, in the order of the `symbol` record indices."""
+    with open(path, 'rb') as file:
+        return _read_header(file, path)[1]
+
+def read_event_log(path: str):
+    """Yields the records of an event log one decompressed chunk (structured array) at a time."""
+    with open(path, 'rb') as file:
+        dtype, _ = _read_header(file, path)
+
+        while True:
+            header = file.read(_CHUNK_HEADER.size)
+            if len(header) < _CHUNK_HEADER.size:
+                return
+            size, count = _CHUNK_HEADER.unpack(header)
+            yield np.frombuffer(zlib.decompress(file.read(size)), dtype=dtype, count=count)
+
+def load_event_log(path: str) -> np.ndarray:
+    """Reads a whole event log into one structured array."""
+    chunks = list(read_event_log(path))
+    return np.concatenate(chunks) if chunks else np.zeros(0, dtype=RECORD_DTYPE)
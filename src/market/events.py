@@ -2,28 +2,80 @@ from src.market.order import Order
 from src.market.transaction import Transaction
 
 class Event:
+    __slots__ = ('event_type', 'timestamp')
+
     def __init__(self, event_type: str, timestamp: int):
         self.event_type = event_type
         self.timestamp = timestamp
 
 class LimitOrderStoredEvent(Event):
+    __slots__ = ('order',)
+
     def __init__(self, timestamp, order: Order):
         super().__init__(event_type='limit_order_stored', timestamp=timestamp)
         self.order = order
 
 class OrderExecutedEvent(Event):
+    __slots__ = ('order', 'executed_quantity')
+
     def __init__(self, timestamp, order: Order, executed_quantity: int):
         super().__init__(event_type='order_executed', timestamp=timestamp)
         self.order = order
         self.executed_quantity = executed_quantity
 
 class OrderCancelledEvent(Event):
+    __slots__ = ('order',)
+
     def __init__(self, timestamp, order: Order):
         super().__init__(event_type='order_cancelled', timestamp=timestamp)
         self.order = order
 
 class TransactionEvent(Event):
+    __slots__ = ('transaction',)
+
     def __init__(self, timestamp, transaction: Transaction):
         super().__init__(event_type='transaction', timestamp=timestamp)
         self.transaction = transaction
 
+
+class FillBatchEvent(Event):
+    """
+    All fills of one incoming order, published once after matching finishes.
+
+    Fills are stored as parallel lists: fill i executed `quantities[i]` units against
+    `resting_orders[i]` at `prices[i]`.
+    """
+    __slots__ = ('order', 'resting_orders', 'prices', 'quantities', 'total_quantity', 'notional')
+
+    def __init__(self, timestamp, order: Order, resting_orders, prices, quantities, total_quantity: int, notional: float):
+        super().__init__(event_type='fill_batch', timestamp=timestamp)
+        self.order = order
+        self.resting_orders = resting_orders
+        self.prices = prices
+        self.quantities = quantities
+        self.total_quantity = total_quantity
+        self.notional = notional
+
+    @property
+    def last_price(self):
+        return self.prices[-1] if self.prices else None
+
+    def __len__(self):
+        return len(self.quantities)
+
+class OrderSubmittedEvent(Event):
+    """Published by Market before an order is matched (only when an event log is attached)."""
+    __slots__ = ('order',)
+
+    def __init__(self, timestamp, order: Order):
+        super().__init__(event_type='order_submitted', timestamp=timestamp)
+        self.order = order
+
+class CancelRequestedEvent(Event):
+    """Published by Market for every cancel request, effective or not (only when an event log is attached)."""
+    __slots__ = ('order_id', 'symbol')
+
+    def __init__(self, timestamp, order_id, symbol=None):
+        super().__init__(event_type='cancel_requested', timestamp=timestamp)
+        self.order_id = order_id
+        self.symbol = symbol
@@ -1,9 +1,16 @@
 # Market class
-from src.market.event_bus import EventBus
-from src.market.order import Order
+import os
+
+from src.market.event_bus import EventBus, CompiledEventBus
+from src.market.order import Order, DAY, time_in_force_code
 from src.market.order_book import LimitOrderBook
+from src.market.tick_order_book import TickOrderBook
 from src.market.matching_engine import MatchingEngine
-from src.market.events import OrderCancelledEvent, OrderExecutedEvent, LimitOrderStoredEvent, TransactionEvent
+from src.market.timing_wheel import TimingWheel
+from src.market.events import OrderCancelledEvent, OrderExecutedEvent, LimitOrderStoredEvent, TransactionEvent, FillBatchEvent
+from src.market.events import OrderSubmittedEvent, CancelRequestedEvent
+from src.market.event_log import EventLog
+from src.market.symbol_market import SymbolMarket
 
 # Managers
 from src.managers.agent_manager import AgentManager
@@ -13,73 +20,201 @@ from src.managers.market_data_manager import MarketDataManager
 class Market:
     def __init__(self, config):
 
-        self.event_bus = EventBus()
-        self.order_book = LimitOrderBook()
-        self.matching_engine = MatchingEngine(self.event_bus)
-        self.market_data = MarketDataManager(
-            ohlcv_periods=config.get("ohlcv_periods", []),
-            store_tick_data=config.get("store_tick_data", False),
-            max_ticks=config.get("max_ticks", 100000)
+        #compiled dispatch resolves handlers at subscription time instead of per event
+        self.event_bus = CompiledEventBus() if config.get("compiled_dispatch", True) else EventBus()
+        #with a tick size, prices are snapped to integer ticks and the array-indexed book is used
+        self.tick_size = config.get("tick_size")
+        #one book, market data manager and indicator manager per symbol; the first symbol is the
+        #default one, used by orders without a symbol and exposed as order_book / market_data
+        self.symbols = list(config.get("symbols") or [None])
+        self.symbol = self.symbols[0]
+        #pooled: recycle price levels, per-fill transactions and events instead of allocating them
+        self.pooled = config.get("pooled", False)
+        self.order_books = {
+            symbol: TickOrderBook(self.tick_size, pooled=self.pooled) if self.tick_size else LimitOrderBook(pooled=self.pooled)
+            for symbol in self.symbols
+        }
+        #batch mode: one FillBatchEvent (and one tick) per incoming order instead of per-fill events
+        self.batch_fills = config.get("batch_fills", False)
+        self.matching_engine = MatchingEngine(
+            self.event_bus,
+            batch_fills=self.batch_fills,
+            per_fill_events=config.get("per_fill_events", not self.batch_fills),
+            pooled=self.pooled
         )
-        self.indicator_manager = IndicatorManager(self.market_data)
-        self.agent_manager = AgentManager(self, self.market_data, self.indicator_manager)
-        self.event_bus.subscribe('transaction', self.handle_transaction)
+        self.market_data_by_symbol = {symbol: self._create_market_data(config, symbol) for symbol in self.symbols}
+        self.indicator_managers = {symbol: IndicatorManager(self.market_data_by_symbol[symbol]) for symbol in self.symbols}
+        self.symbol_markets = {}
+
+        self.order_book = self.order_books[self.symbol]
+        self.market_data = self.market_data_by_symbol[self.symbol]
+        self.indicator_manager = self.indicator_managers[self.symbol]
+        self.agent_manager = AgentManager(
+            self, self.market_data, self.indicator_manager, scheduler=config.get("scheduler", "calendar")
+        )
+        if self.batch_fills:
+            self.event_bus.subscribe('fill_batch', self.handle_fill_batch)
+        else:
+            self.event_bus.subscribe('transaction', self.handle_transaction)
+            self.event_bus.subscribe('order_executed', self.handle_order_executed)
         self.event_bus.subscribe('limit_order_stored', self.handle_order_stored)
-        self.event_bus.subscribe('order_executed', self.handle_order_executed)
         self.event_bus.subscribe('order_cancelled', self.handle_order_cancelled)
 
+        #optional binary log of submissions, cancel requests and fills (see src/market/replay.py)
+        self.event_log = None
+        if config.get("event_log"):
+            self.event_log = EventLog(
+                config["event_log"],
+                chunk_size=config.get("event_log_chunk_size", 65536),
+                fill_batches=self.batch_fills and not self.matching_engine.per_fill_events,
+                symbols=self.symbols
+            )
+            self.event_bus.attach_sink(self.event_log)
+
+        #resting GTT/DAY orders by expire time; advanced with the simulation clock
+        self.expiry_wheel = TimingWheel()
+        #length of a trading day in time units, for DAY orders
+        self.day_length = config.get("day_length")
+
         self.order_id_counter = 0  # Licznik ID zleceń
         self.time = 0
 
+    def _create_market_data(self, config, symbol):
+        recording_dir = config.get("recording_dir")
+        if recording_dir is not None and len(self.symbols) > 1:
+            recording_dir = os.path.join(recording_dir, str(symbol))
+        return MarketDataManager(
+            ohlcv_periods=config.get("ohlcv_periods", []),
+            store_tick_data=config.get("store_tick_data", False),
+            max_ticks=config.get("max_ticks", 100000),
+            recording_dir=recording_dir,
+            recording_chunk_size=config.get("recording_chunk_size", 65536),
+            max_bars_in_memory=config.get("max_bars_in_memory")
+        )
+
+    def symbol_market(self, symbol) -> SymbolMarket:
+        """Single-symbol view of this market, to build agents that trade `symbol` only."""
+        view = self.symbol_markets.get(symbol)
+        if view is None:
+            if symbol not in self.order_books:
+                raise ValueError(f"Unknown symbol: {symbol}")
+            view = SymbolMarket(self, symbol)
+            self.symbol_markets[symbol] = view
+        return view
+
     def register_agent(self, agent):
         self.agent_manager.register_agent(agent)
 
     def submit_order(self, order: Order):
         timestamp = self.get_current_time()
-        self.matching_engine.execute_order(order, self.order_book, timestamp)
+        if self.event_log is not None:
+            self.event_bus.publish(OrderSubmittedEvent(timestamp, order))
+        self.matching_engine.execute_order(order, self.order_books[order.symbol], timestamp)
 
-    def cancel_order(self, order_id: str):
+    def cancel_order(self, order_id, symbol=None):
+        if symbol is None:
+            symbol = self.symbol
         timestamp = self.get_current_time()
-        self.matching_engine.cancel_order(order_id, self.order_book, timestamp)
+        if self.event_log is not None:
+            self.event_bus.publish(CancelRequestedEvent(timestamp, order_id, symbol))
+        self.matching_engine.cancel_order(order_id, self.order_books[symbol], timestamp)
 
-    def place_order(self, agent_id, order_type, side, quantity, price=None):
+    def place_order(self, agent_id, order_type, side, quantity, price=None, time_in_force='gtc', expire_time=None,
+                    symbol=None):
+        """
+        Creates and submits an order. `time_in_force` is one of 'gtc', 'ioc', 'fok',
+        'gtt' (rests until `expire_time`) or 'day' (rests until the end of the current
+        day of `day_length` time units). Orders without a symbol go to the default one.
+        """
         self.order_id_counter += 1
+        timestamp = self.get_current_time()
+        if time_in_force_code(time_in_force) == DAY:
+            if not self.day_length:
+                raise ValueError("DAY orders require 'day_length' in the market config.")
+            expire_time = (timestamp // self.day_length + 1) * self.day_length
+
         order = Order(
             order_id=self.order_id_counter,
             agent_id=agent_id,
-            timestamp=self.get_current_time(),
+            timestamp=timestamp,
             side=side,
             order_type=order_type,
             quantity=quantity,
-            price=price
+            price=price,
+            tick_size=self.tick_size,
+            time_in_force=time_in_force,
+            expire_time=expire_time,
+            symbol=self.symbol if symbol is None else symbol
         )
         self.submit_order(order)
 
+    def expire_orders(self, current_time: int):
+        """Cancels resting orders whose expire time is <= `current_time`."""
+        wheel = self.expiry_wheel
+        if not wheel.count:
+            wheel.now = current_time
+            return
+        for order_id, symbol in wheel.advance(current_time):
+            #orders filled or cancelled before expiring are simply not found in the book
+            if order_id in self.order_books[symbol].orders_by_id:
+                self.cancel_order(order_id, symbol)
+
+    def detach_event_log(self):
+        """Flushes the event log and stops logging; returns the detached log."""
+        event_log = self.event_log
+        if event_log is not None:
+            #a closed log was already detached by `close`
+            if not event_log.closed:
+                event_log.flush()
+                self.event_bus.detach_sink(event_log)
+            self.event_log = None
+        return event_log
+
+    def attach_event_log(self, event_log):
+        self.event_log = event_log
+        if not event_log.closed:
+            self.event_bus.attach_sink(event_log)
+
+    def close(self):
+        """
+        Writes out and closes the recordings (open bars included) and the event log at
+        the end of a run. The closed log stays in `event_log` for inspection but no
+        longer receives events.
+        """
+        for market_data in self.market_data_by_symbol.values():
+            market_data.close_recording()
+        event_log = self.event_log
+        if event_log is not None and not event_log.closed:
+            self.event_bus.detach_sink(event_log)
+            event_log.close()
+
+    def _add_tick(self, symbol, time, transaction_price, transaction_volume):
+        order_book = self.order_books[symbol]
+        self.market_data_by_symbol[symbol].add_tick(
+            time=time,
+            transaction_price=transaction_price,
+            best_bid=order_book.get_best_bid(),
+            best_ask=order_book.get_best_ask(),
+            transaction_volume=transaction_volume,
+            bid_volume=order_book.get_total_bid_volume(),
+            ask_volume=order_book.get_total_ask_volume()
+        )
+
     def handle_transaction(self, event: TransactionEvent):
         transaction = event.transaction
         self.agent_manager.handle_transaction(transaction)
-        self.market_data.add_tick(
-            time=event.timestamp,
-            transaction_price=transaction.price,
-            best_bid=self.order_book.get_best_bid(),
-            best_ask=self.order_book.get_best_ask(),
-            transaction_volume=transaction.quantity,
-            bid_volume=self.order_book.get_total_bid_volume(),
-            ask_volume=self.order_book.get_total_ask_volume()
-        )
+        self._add_tick(transaction.symbol, event.timestamp, transaction.price, transaction.quantity)
+
+    def handle_fill_batch(self, event: FillBatchEvent):
+        self.agent_manager.handle_fill_batch(event)
+        self._add_tick(event.order.symbol, event.timestamp, event.last_price, event.total_quantity)
 
     def handle_order_stored(self, event: LimitOrderStoredEvent):
         order = event.order
+        if order.expire_time is not None:
+            self.expiry_wheel.schedule(order.expire_time, (order.order_id, order.symbol))
         self.agent_manager.handle_order_stored(order)
-        self.market_data.add_tick(
-            time=event.timestamp,
-            transaction_price=None,  # Brak transakcji
-            best_bid=self.order_book.get_best_bid(),
-            best_ask=self.order_book.get_best_ask(),
-            transaction_volume=0,
-            bid_volume=self.order_book.get_total_bid_volume(),
-            ask_volume=self.order_book.get_total_ask_volume()
-        )
+        self._add_tick(order.symbol, event.timestamp, None, 0)
 
     def handle_order_executed(self, event: OrderExecutedEvent):
         order = event.order
@@ -89,17 +224,14 @@ class Market:
     def handle_order_cancelled(self, event: OrderCancelledEvent):
         order = event.order
         self.agent_manager.handle_order_cancelled(order.order_id)
-        self.market_data.add_tick(
-            time=event.timestamp,
-            transaction_price=None,  # Brak transakcji
-            best_bid=self.order_book.get_best_bid(),
-            best_ask=self.order_book.get_best_ask(),
-            transaction_volume=0,
-            bid_volume=self.order_book.get_total_bid_volume(),
-            ask_volume=self.order_book.get_total_ask_volume()
-        )
+        self._add_tick(order.symbol, event.timestamp, None, 0)
+
+    def flush_recording(self):
+        for market_data in self.market_data_by_symbol.values():
+            market_data.flush_recording()
 
     def step(self, current_time: int):
+        self.expire_orders(current_time)
         self.agent_manager.step(current_time)
 
     def get_current_time(self) -> int:
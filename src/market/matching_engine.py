@@ -1,65 +1,169 @@
-from src.market.events import OrderExecutedEvent, TransactionEvent, OrderCancelledEvent, LimitOrderStoredEvent
+from src.market.events import OrderExecutedEvent, TransactionEvent, OrderCancelledEvent, LimitOrderStoredEvent, FillBatchEvent
 from src.market.transaction import Transaction
 from src.market.event_bus import EventBus
+from src.market.order import BUY, SELL, MARKET, LIMIT, IOC, FOK
 
 class MatchingEngine:
-    def __init__(self, event_bus: EventBus):
+    """
+    Matches incoming orders against an order book and publishes the outcome.
+
+    In pooled mode the per-fill Transactions, TransactionEvents and OrderExecutedEvents
+    are taken from free lists and returned to them once `publish` returns. Such events
+    (and their transaction) belong to the engine: a subscriber may read them during the
+    call but must copy whatever it keeps. Released events have their order cleared, so
+    a kept reference fails loudly instead of showing a later fill.
+    """
+
+    def __init__(self, event_bus: EventBus, batch_fills: bool = False, per_fill_events: bool = True,
+                 pooled: bool = False):
+        """
+        Args:
+            event_bus (EventBus): Bus the engine publishes to.
+            batch_fills (bool): Publish one FillBatchEvent per incoming order instead of
+                a TransactionEvent and two OrderExecutedEvents per fill.
+            per_fill_events (bool): In batch mode, also publish the per-fill events.
+            pooled (bool): Recycle per-fill transactions and events (see the class docstring).
+        """
         self.event_bus = event_bus
+        self.batch_fills = batch_fills
+        self.per_fill_events = per_fill_events
+        self.pooled = pooled
+        self.transaction_pool = []
+        self.transaction_event_pool = []
+        self.executed_event_pool = []
 
     def execute_order(self, order, order_book, timestamp):
-        if order.order_type == 'market':
+        #fill or kill: nothing happens unless the whole quantity can execute now
+        if order.tif_code == FOK and not self.can_fill(order, order_book):
+            return
+
+        if order.type_code == MARKET:
             self.match_order(order, order_book, is_market_order=True, timestamp=timestamp)
 
-        elif order.order_type == 'limit':
+        elif order.type_code == LIMIT:
             self.match_order(order, order_book, is_market_order=False, timestamp=timestamp)
 
-            if order.quantity > 0:
-                if order_book.add_order(order):
+            #IOC and FOK orders never rest in the book
+            if order.quantity > 0 and order.tif_code != IOC and order.tif_code != FOK:
+                if order_book.add_order(order) and self.event_bus.has_subscribers('limit_order_stored'):
                     self.event_bus.publish(LimitOrderStoredEvent(timestamp=timestamp, order=order))
 
         else:
-            raise ValueError(f"Unknown order type: {order.order_type}")
+            raise ValueError(f"Unknown order type: {order.type_code}")
+
+    def can_fill(self, order, order_book):
+        opposite = SELL if order.side_code == BUY else BUY
+        price = order.price if order.type_code == LIMIT else None
+        return order_book.get_volume_up_to(opposite, price, order.quantity) >= order.quantity
 
     def match_order(self, order, order_book, is_market_order, timestamp):
+        """
+        Matches `order` against the opposite side of the book. Every fill is reported to
+        the per-fill publishers (a TransactionEvent and an OrderExecutedEvent for each of
+        the two orders, pooled or not) and, in batch mode, collected into one FillBatchEvent.
+        """
+
+        is_buy = order.side_code == BUY
+        #events nobody subscribes to are not built (checked once per incoming order)
+        event_bus = self.event_bus
+        per_fill = self.per_fill_events or not self.batch_fills
+        publish_transactions = per_fill and event_bus.has_subscribers('transaction')
+        publish_executions = per_fill and event_bus.has_subscribers('order_executed')
+        publish_execution = self._publish_pooled_execution if self.pooled else self._publish_execution
+        batch_fills = self.batch_fills
+        resting_orders = []
+        prices = []
+        quantities = []
+        total_quantity = 0
+        notional = 0.0
 
         while order.quantity > 0:
 
-            best_order = order_book.top_ask() if order.side == 'buy' else order_book.top_bid()
+            best_order = order_book.top_ask() if is_buy else order_book.top_bid()
 
             if best_order is None:
                 break
 
             if not is_market_order:
-                if order.side == 'buy' and order.price < best_order.price:
+                if is_buy and order.price < best_order.price:
                     break
-                if order.side == 'sell' and order.price > best_order.price:
+                if not is_buy and order.price > best_order.price:
                     break
  
             traded_quantity = min(order.quantity, best_order.quantity)
             trade_price = best_order.price
 
-            transaction = Transaction(
-                order_buy_id=order.order_id if order.side == 'buy' else best_order.order_id,
-                order_sell_id=best_order.order_id if order.side == 'buy' else order.order_id,
-                buyer_id=order.agent_id if order.side == 'buy' else best_order.agent_id,
-                seller_id=best_order.agent_id if order.side == 'buy' else order.agent_id,
-                price=trade_price,
-                quantity=traded_quantity,
-                timestamp=order.timestamp
-            )
-
-            self.event_bus.publish(TransactionEvent(timestamp=transaction.timestamp, transaction=transaction))
-
-            if order_book.modify_order(best_order.order_id, best_order.quantity - traded_quantity):
-                self.event_bus.publish(OrderExecutedEvent(timestamp=timestamp, order=best_order, executed_quantity=traded_quantity)) 
-            else:
+            if publish_transactions:
+                self._publish_transaction(order, best_order, is_buy, trade_price, traded_quantity, order.timestamp)
+
+            if not order_book.modify_order(best_order.order_id, best_order.quantity - traded_quantity):
                 raise ValueError(f"Order {best_order.order_id} not found in order book")
-            
+
             #manually modify the order quantity (is't not stored in the order book at this stage)
             order.modify_quantity(order.quantity - traded_quantity)
-            self.event_bus.publish(OrderExecutedEvent(timestamp=timestamp, order=order, executed_quantity=traded_quantity))
+
+            if publish_executions:
+                publish_execution(best_order, traded_quantity, timestamp)
+                publish_execution(order, traded_quantity, timestamp)
+
+            if batch_fills:
+                resting_orders.append(best_order)
+                prices.append(trade_price)
+                quantities.append(traded_quantity)
+                total_quantity += traded_quantity
+                notional += trade_price * traded_quantity
+
+        if quantities and event_bus.has_subscribers('fill_batch'):
+            event_bus.publish(FillBatchEvent(
+                timestamp=timestamp, order=order, resting_orders=resting_orders, prices=prices,
+                quantities=quantities, total_quantity=total_quantity, notional=notional
+            ))
+
+    #per-fill publishers; in pooled mode objects are released when publish returns, so
+    #nested publishes (handlers that trade) simply take other objects from the free lists
+
+    def _publish_transaction(self, order, best_order, is_buy, price, quantity, timestamp):
+        pooled = self.pooled
+        transactions = self.transaction_pool
+        events = self.transaction_event_pool
+        transaction = transactions.pop() if pooled and transactions else Transaction.__new__(Transaction)
+        event = events.pop() if pooled and events else TransactionEvent.__new__(TransactionEvent)
+        Transaction.__init__(
+            transaction,
+            order_buy_id=order.order_id if is_buy else best_order.order_id,
+            order_sell_id=best_order.order_id if is_buy else order.order_id,
+            buyer_id=order.agent_id if is_buy else best_order.agent_id,
+            seller_id=best_order.agent_id if is_buy else order.agent_id,
+            price=price,
+            quantity=quantity,
+            timestamp=timestamp,
+            symbol=order.symbol
+        )
+        TransactionEvent.__init__(event, timestamp=timestamp, transaction=transaction)
+        if not pooled:
+            self.event_bus.publish(event)
+            return
+        try:
+            self.event_bus.publish(event)
+        finally:
+            event.transaction = None
+            transactions.append(transaction)
+            events.append(event)
+
+    def _publish_execution(self, order, executed_quantity, timestamp):
+        self.event_bus.publish(OrderExecutedEvent(timestamp=timestamp, order=order, executed_quantity=executed_quantity))
+
+    def _publish_pooled_execution(self, order, executed_quantity, timestamp):
+        events = self.executed_event_pool
+        event = events.pop() if events else OrderExecutedEvent.__new__(OrderExecutedEvent)
+        OrderExecutedEvent.__init__(event, timestamp=timestamp, order=order, executed_quantity=executed_quantity)
+        try:
+            self.event_bus.publish(event)
+        finally:
+            event.order = None
+            events.append(event)
 
     def cancel_order(self, order_id, order_book, timestamp):
         order = order_book.remove_order(order_id)
-        if order:
+        if order and self.event_bus.has_subscribers('order_cancelled'):
             self.event_bus.publish(OrderCancelledEvent(timestamp=timestamp, order = order))
@@ -1,19 +1,114 @@
+from enum import IntEnum
+
+class Side(IntEnum):
+    BUY = 0
+    SELL = 1
+
+class OrderType(IntEnum):
+    MARKET = 0
+    LIMIT = 1
+
+class TimeInForce(IntEnum):
+    GTC = 0  #good till cancel
+    IOC = 1  #immediate or cancel: the unfilled rest is dropped
+    FOK = 2  #fill or kill: executes in full or not at all
+    GTT = 3  #good till time: rests until `expire_time`
+    DAY = 4  #rests until the end of the trading day
+
+#plain int codes used on hot paths (comparing plain ints is cheaper than enum members)
+BUY = int(Side.BUY)
+SELL = int(Side.SELL)
+MARKET = int(OrderType.MARKET)
+LIMIT = int(OrderType.LIMIT)
+GTC = int(TimeInForce.GTC)
+IOC = int(TimeInForce.IOC)
+FOK = int(TimeInForce.FOK)
+GTT = int(TimeInForce.GTT)
+DAY = int(TimeInForce.DAY)
+
+SIDE_NAMES = ('buy', 'sell')
+ORDER_TYPE_NAMES = ('market', 'limit')
+TIME_IN_FORCE_NAMES = ('gtc', 'ioc', 'fok', 'gtt', 'day')
+
+_SIDE_CODES = {'buy': BUY, 'sell': SELL, BUY: BUY, SELL: SELL}
+_ORDER_TYPE_CODES = {'market': MARKET, 'limit': LIMIT, MARKET: MARKET, LIMIT: LIMIT}
+_TIME_IN_FORCE_CODES = {name: code for code, name in enumerate(TIME_IN_FORCE_NAMES)}
+_TIME_IN_FORCE_CODES.update({code: code for code in range(len(TIME_IN_FORCE_NAMES))})
+
+def side_code(side) -> int:
+    """Converts 'buy'/'sell' or a Side to its int code."""
+    try:
+        return _SIDE_CODES[side]
+    except KeyError:
+        raise ValueError(f"Unknown order side: {side}")
+
+def order_type_code(order_type) -> int:
+    """Converts 'market'/'limit' or an OrderType to its int code."""
+    try:
+        return _ORDER_TYPE_CODES[order_type]
+    except KeyError:
+        raise ValueError(f"Unknown order type: {order_type}")
+
+def time_in_force_code(time_in_force) -> int:
+    """Converts 'gtc'/'ioc'/'fok'/'gtt'/'day' or a TimeInForce to its int code."""
+    try:
+        return _TIME_IN_FORCE_CODES[time_in_force]
+    except KeyError:
+        raise ValueError(f"Unknown time in force: {time_in_force}")
+
 class Order:
-    def __init__(self, order_id, agent_id, timestamp, side, order_type, quantity, price=None):
+    __slots__ = ('order_id', 'agent_id', 'timestamp', 'side_code', 'type_code', 'quantity', 'price', 'price_ticks',
+                 'tif_code', 'expire_time', 'symbol')
+
+    def __init__(self, order_id, agent_id, timestamp, side, order_type, quantity, price=None, tick_size=None,
+                 time_in_force=GTC, expire_time=None, symbol=None):
+        """
+        Creates an order. Limit prices are rounded to 2 decimals, or, when `tick_size` is
+        given, snapped to the nearest multiple of it with the integer tick count kept in
+        `price_ticks`. GTT and DAY orders rest until `expire_time` (for DAY orders the
+        market sets it to the end of the day). `symbol` is None in single-instrument markets.
+        """
         self.order_id = order_id
         self.agent_id = agent_id
         self.timestamp = timestamp
-        self.side = side
-        self.order_type = order_type
+        self.side_code = side_code(side)
+        self.type_code = order_type_code(order_type)
         self.quantity = quantity
-        
-        if order_type == 'limit':
+        self.price_ticks = None
+        self.tif_code = time_in_force_code(time_in_force)
+        self.expire_time = expire_time
+        self.symbol = symbol
+
+        if self.tif_code == GTT and expire_time is None:
+            raise ValueError("Expire time must be provided for GTT orders.")
+
+        if self.type_code == LIMIT:
             if price is None:
                 raise ValueError("Price must be provided for limit orders.")
-            self.price = round(price, 2)
+            if tick_size is not None:
+                self.set_price_ticks(int(round(price / tick_size)), tick_size)
+            else:
+                self.price = round(price, 2)
         else:
             self.price = None
 
+    def set_price_ticks(self, price_ticks, tick_size):
+        self.price_ticks = price_ticks
+        #round away the float noise of ticks * tick_size so equal ticks give equal prices
+        self.price = round(price_ticks * tick_size, 10)
+
+    @property
+    def side(self) -> str:
+        return SIDE_NAMES[self.side_code]
+
+    @property
+    def order_type(self) -> str:
+        return ORDER_TYPE_NAMES[self.type_code]
+
+    @property
+    def time_in_force(self) -> str:
+        return TIME_IN_FORCE_NAMES[self.tif_code]
+
     def modify_quantity(self, new_quantity=None):
         if new_quantity is not None:
             self.quantity = new_quantity
@@ -1,10 +1,37 @@
 from collections import deque, OrderedDict
-from src.market.order import Order
+from src.market.order import Order, BUY, side_code
 
 import bisect
+import numpy as np
 from sortedcontainers import SortedList
 
+def _descending(price):
+    #module-level (not a lambda) so books can be pickled
+    return -price
+
+def fill_top_levels(levels, n, prices=None, volumes=None):
+    """
+    Writes the first `n` of `levels` (PriceLevels, best first) into `prices` / `volumes`,
+    allocating them if not given. Unused entries are NaN / 0. Returns (prices, volumes, count).
+    """
+    if prices is None:
+        prices = np.empty(n, dtype=np.float64)
+    if volumes is None:
+        volumes = np.empty(n, dtype=np.int64)
+    count = 0
+    for level in levels:
+        if count == n:
+            break
+        prices[count] = level.price
+        volumes[count] = level.volume
+        count += 1
+    prices[count:n] = np.nan
+    volumes[count:n] = 0
+    return prices, volumes, count
+
 class PriceLevel:
+    __slots__ = ('price', 'orders', 'volume')
+
     def __init__(self, price):
         self.price = price
         self.orders = OrderedDict()
@@ -44,37 +71,75 @@ class PriceLevel:
     def is_empty(self):
         return len(self.orders) == 0
 
+#emptied price levels kept for reuse by a pooled book
+MAX_FREE_LEVELS = 4096
+
 class LimitOrderBook:
 
-    def __init__(self):
+    def __init__(self, pooled: bool = False):
+        """
+        Args:
+            pooled (bool): Reuse emptied PriceLevels for new prices instead of allocating.
+                Level objects (and `get_orders_at_price` results) must then not be kept
+                after the level empties.
+        """
 
         self.bids = {}  # Price -> PriceLevel for bids
         self.asks = {}  # Price -> PriceLevel for asks
         self.orders_by_id = {}  # Order ID -> Order
 
-        self.sorted_bids = SortedList(key=lambda x: -x)  # Bids prices in descending order
+        self.sorted_bids = SortedList(key=_descending)  # Bids prices in descending order
         self.sorted_asks = SortedList()  # Asks prices in ascending order
 
         self.bids_total_volume = 0  # Total volume for all bid orders
         self.asks_total_volume = 0  # Total volume for all ask orders
 
+        #callbacks (side_code, price, new_volume) on every change of a level's volume
+        self.level_listeners = []
+
+        self.pooled = pooled
+        self.free_levels = []
+
+    def add_level_listener(self, listener):
+        """
+        Registers `listener(side_code, price, volume)`, called with the new total volume of
+        a price level each time it changes (0 when the level is removed).
+        """
+        self.level_listeners.append(listener)
+
+    def remove_level_listener(self, listener):
+        self.level_listeners.remove(listener)
+
+    def _level_changed(self, side, price, volume):
+        for listener in self.level_listeners:
+            listener(side, price, volume)
+
     def add_order(self, order: Order):
 
-        levels = self.bids if order.side == 'buy' else self.asks
-        sorted_prices = self.sorted_bids if order.side == 'buy' else self.sorted_asks
+        levels = self.bids if order.side_code == BUY else self.asks
+        sorted_prices = self.sorted_bids if order.side_code == BUY else self.sorted_asks
 
-        if order.price not in levels:
-            levels[order.price] = PriceLevel(order.price)
+        price_level = levels.get(order.price)
+        if price_level is None:
+            if self.free_levels:
+                price_level = self.free_levels.pop()
+                price_level.price = order.price
+            else:
+                price_level = PriceLevel(order.price)
+            levels[order.price] = price_level
             sorted_prices.add(order.price)
 
-        levels[order.price].add_order(order)
+        price_level.add_order(order)
         self.orders_by_id[order.order_id] = order
 
-        if order.side == 'buy':
+        if order.side_code == BUY:
             self.bids_total_volume += order.quantity
         else:
             self.asks_total_volume += order.quantity
 
+        if self.level_listeners:
+            self._level_changed(order.side_code, order.price, price_level.volume)
+
         return True
 
     def modify_order(self, order_id, new_quantity):
@@ -84,7 +149,7 @@ class LimitOrderBook:
             return
 
         order = self.orders_by_id[order_id]
-        levels = self.bids if order.side == 'buy' else self.asks
+        levels = self.bids if order.side_code == BUY else self.asks
         price_level = levels.get(order.price)
 
         if not price_level:
@@ -93,15 +158,16 @@ class LimitOrderBook:
         old_quantity = order.quantity
         price_level.modify_order(order_id, new_quantity)
 
+        if order.side_code == BUY:
+            self.bids_total_volume += (new_quantity - old_quantity)
+        else:
+            self.asks_total_volume += (new_quantity - old_quantity)
+
         if new_quantity == 0:
-            sorted_prices = self.sorted_bids if order.side == 'buy' else self.sorted_asks
+            sorted_prices = self.sorted_bids if order.side_code == BUY else self.sorted_asks
             self._remove_order_and_cleanup(order, levels, price_level, sorted_prices)
-
-        else:
-            if order.side == 'buy':
-                self.bids_total_volume += (new_quantity - old_quantity)
-            else:
-                self.asks_total_volume += (new_quantity - old_quantity)
+        elif self.level_listeners:
+            self._level_changed(order.side_code, order.price, price_level.volume)
 
         return order
 
@@ -110,7 +176,7 @@ class LimitOrderBook:
         removed_order = price_level.remove_order(order.order_id)
 
         if removed_order:
-            if order.side == 'buy':
+            if order.side_code == BUY:
                 self.bids_total_volume -= removed_order.quantity
             else:
                 self.asks_total_volume -= removed_order.quantity
@@ -118,17 +184,22 @@ class LimitOrderBook:
             if price_level.is_empty():
                 del levels[order.price]
                 sorted_prices.remove(order.price)
+                if self.pooled and len(self.free_levels) < MAX_FREE_LEVELS:
+                    self.free_levels.append(price_level)
 
             del self.orders_by_id[order.order_id]
 
+            if self.level_listeners:
+                self._level_changed(order.side_code, order.price, price_level.volume)
+
     def remove_order(self, order_id):
         
         if order_id not in self.orders_by_id:
             return
 
         order = self.orders_by_id[order_id]
-        levels = self.bids if order.side == 'buy' else self.asks
-        sorted_prices = self.sorted_bids if order.side == 'buy' else self.sorted_asks
+        levels = self.bids if order.side_code == BUY else self.asks
+        sorted_prices = self.sorted_bids if order.side_code == BUY else self.sorted_asks
         price_level = levels.get(order.price)
 
         if price_level:
@@ -159,15 +230,45 @@ class LimitOrderBook:
         return None
 
     def get_orders_at_price(self, price, side):
-        price_levels = self.bids if side == 'buy' else self.asks
+        price_levels = self.bids if side_code(side) == BUY else self.asks
         if price in price_levels:
             return price_levels[price].orders
         return OrderedDict()
 
     def get_depth(self, side):
-        levels = self.bids if side == 'buy' else self.asks
+        levels = self.bids if side_code(side) == BUY else self.asks
         return {price: levels[price].volume for price in levels}
+
+    def get_top_levels(self, side, n, prices=None, volumes=None):
+        """
+        Best `n` levels of `side` as NumPy arrays, best first. Pass preallocated float64
+        `prices` and int64 `volumes` arrays (length >= n) to sample without allocating.
+
+        Returns:
+            tuple: (prices, volumes, count), with NaN prices / 0 volumes past `count`.
+        """
+        is_bid = side_code(side) == BUY
+        levels = self.bids if is_bid else self.asks
+        sorted_prices = self.sorted_bids if is_bid else self.sorted_asks
+        return fill_top_levels((levels[price] for price in sorted_prices.islice(0, n)), n, prices, volumes)
     
+    def get_volume_up_to(self, side, price=None, max_volume=None):
+        """
+        Volume resting on `side` at `price` or better for an incoming order (asks at or
+        below, bids at or above; all levels if price is None). Stops counting once
+        `max_volume` is reached.
+        """
+        is_bid = side_code(side) == BUY
+        levels = self.bids if is_bid else self.asks
+        volume = 0
+        for level_price in (self.sorted_bids if is_bid else self.sorted_asks):
+            if price is not None and (level_price < price if is_bid else level_price > price):
+                break
+            volume += levels[level_price].volume
+            if max_volume is not None and volume >= max_volume:
+                break
+        return volume
+
     def get_total_bid_volume(self):
         return self.bids_total_volume
     
@@ -175,7 +276,7 @@ class LimitOrderBook:
         return self.asks_total_volume
     
     def get_volume_at_price(self, price, side):
-        levels = self.bids if side == 'buy' else self.asks
+        levels = self.bids if side_code(side) == BUY else self.asks
         if price in levels:
             return levels[price].volume
         return 0
@@ -0,0 +1,34 @@
+class SymbolMarket:
+    """
+    View of a multi-instrument Market restricted to one symbol.
+
+    It exposes the same attributes and methods agents use on a Market (order_book,
+    market_data, indicator_manager, place_order, cancel_order, ...) bound to that
+    symbol, so any single-instrument agent can trade any symbol unchanged.
+    """
+
+    def __init__(self, market, symbol):
+        self.market = market
+        self.symbol = symbol
+        self.order_book = market.order_books[symbol]
+        self.market_data = market.market_data_by_symbol[symbol]
+        self.indicator_manager = market.indicator_managers[symbol]
+        self.agent_manager = market.agent_manager
+        self.tick_size = market.tick_size
+
+    def register_agent(self, agent):
+        self.market.register_agent(agent)
+
+    def place_order(self, agent_id, order_type, side, quantity, price=None, time_in_force='gtc', expire_time=None,
+                    symbol=None):
+        self.market.place_order(agent_id, order_type, side, quantity, price, time_in_force, expire_time,
+                                symbol=self.symbol if symbol is None else symbol)
+
+    def cancel_order(self, order_id, symbol=None):
+        self.market.cancel_order(order_id, self.symbol if symbol is None else symbol)
+
+    def get_current_time(self) -> int:
+        return self.market.get_current_time()
+
+    def symbol_market(self, symbol) -> 'SymbolMarket':
+        return self.market.symbol_market(symbol)
@@ -0,0 +1,381 @@
+from collections import OrderedDict
+from sortedcontainers import SortedList
+from src.market.order import Order, BUY, side_code
+from src.market.order_book import PriceLevel, fill_top_levels, MAX_FREE_LEVELS
+
+#ladder slots summarised per block, so scans skip empty stretches a block at a time
+BLOCK_SIZE = 64
+#widest dense window of a ladder side (in ticks); prices outside it are kept sparse
+MAX_DENSE_LEVELS = 1 << 16
+
+class PriceLadder:
+    """
+    Price levels of one side of the book, indexed by integer tick.
+
+    Levels near the action sit in a dense window: index `i` of `levels` holds the
+    level at tick `base + i` (or None). The window grows by doubling up to
+    `max_levels` slots; levels outside it go to `far` (tick -> level), with their
+    ticks kept sorted in `far_ticks`, so a stray order far from the mid-price costs
+    one entry instead of a list spanning the gap. `block_counts` counts the levels
+    of every BLOCK_SIZE slots, so finding the next best level after the best one
+    empties skips empty blocks instead of walking them slot by slot.
+    """
+
+    __slots__ = ('levels', 'block_counts', 'base', 'best', 'count', 'dense_count',
+                 'far', 'far_ticks', 'max_levels', 'is_bid')
+
+    def __init__(self, is_bid, initial_levels=1024, max_levels=MAX_DENSE_LEVELS):
+        size = -(-max(initial_levels, 1) // BLOCK_SIZE) * BLOCK_SIZE
+        self.max_levels = max(size, max_levels)
+        self.levels = [None] * size
+        self.block_counts = [0] * (size // BLOCK_SIZE)
+        self.base = None
+        self.best = None  #best price in ticks
+        self.count = 0  #number of non-empty levels
+        self.dense_count = 0  #of which in the dense window
+        self.far = {}
+        self.far_ticks = SortedList()
+        self.is_bid = is_bid
+
+    def _in_window(self, ticks):
+        """Makes room for `ticks` in the dense window if it fits; returns whether it does."""
+        size = len(self.levels)
+        if self.base is None or self.dense_count == 0:
+            self._rebase(ticks)
+            return True
+        index = ticks - self.base
+        if 0 <= index < size:
+            return True
+        if index < 0:
+            extra = -(-max(size, -index) // BLOCK_SIZE) * BLOCK_SIZE
+            if size + extra > self.max_levels:
+                return False
+            self.levels[0:0] = [None] * extra
+            self.block_counts[0:0] = [0] * (extra // BLOCK_SIZE)
+            self.base -= extra
+        else:
+            extra = -(-max(size, index - size + 1) // BLOCK_SIZE) * BLOCK_SIZE
+            if size + extra > self.max_levels:
+                return False
+            self.levels.extend([None] * extra)
+            self.block_counts.extend([0] * (extra // BLOCK_SIZE))
+        self._absorb_far()
+        return True
+
+    def _rebase(self, ticks):
+        #the dense window is empty: centre it on `ticks` and pull in the sparse levels it now covers
+        self.base = ticks - len(self.levels) // 2
+        self._absorb_far()
+
+    def _absorb_far(self):
+        if not self.far_ticks:
+            return
+        base = self.base
+        for ticks in list(self.far_ticks.irange(base, base + len(self.levels) - 1)):
+            self.far_ticks.remove(ticks)
+            self._set_dense(ticks - base, self.far.pop(ticks))
+
+    def _set_dense(self, index, level):
+        self.levels[index] = level
+        self.block_counts[index // BLOCK_SIZE] += 1
+        self.dense_count += 1
+
+    def _scan(self, index, step):
+        """Index of the first level from `index` in direction `step`, or None."""
+        levels = self.levels
+        block_counts = self.block_counts
+        size = len(levels)
+        while 0 <= index < size:
+            block = index // BLOCK_SIZE
+            #first slot past this block in the scan direction
+            end = block * BLOCK_SIZE - 1 if step < 0 else (block + 1) * BLOCK_SIZE
+            if block_counts[block]:
+                while index != end:
+                    if levels[index] is not None:
+                        return index
+                    index += step
+            else:
+                index = end
+        return None
+
+    def get(self, ticks):
+        if self.base is not None:
+            index = ticks - self.base
+            if 0 <= index < len(self.levels):
+                return self.levels[index]
+        if self.far:
+            return self.far.get(ticks)
+        return None
+
+    def add(self, ticks, level):
+        if self._in_window(ticks):
+            self._set_dense(ticks - self.base, level)
+        else:
+            self.far[ticks] = level
+            self.far_ticks.add(ticks)
+        self.count += 1
+        if self.best is None or (ticks > self.best if self.is_bid else ticks < self.best):
+            self.best = ticks
+
+    def remove(self, ticks):
+        index = ticks - self.base
+        if 0 <= index < len(self.levels):
+            self.levels[index] = None
+            self.block_counts[index // BLOCK_SIZE] -= 1
+            self.dense_count -= 1
+        else:
+            del self.far[ticks]
+            self.far_ticks.remove(ticks)
+            #a sparse best lies beyond the window: the dense candidate is at its near edge
+            index = len(self.levels) if self.is_bid else -1
+        self.count -= 1
+        if ticks != self.best:
+            return
+        if self.count == 0:
+            self.best = None
+            return
+
+        step = -1 if self.is_bid else 1
+        best = None
+        if self.dense_count:
+            best = self._scan(index + step, step) + self.base
+        if self.far_ticks:
+            far_best = self.far_ticks[-1] if self.is_bid else self.far_ticks[0]
+            if best is None or (far_best > best if self.is_bid else far_best < best):
+                best = far_best
+        self.best = best
+
+    def _iter_dense(self):
+        if not self.dense_count:
+            return
+        levels = self.levels
+        step = -1 if self.is_bid else 1
+        index = self._scan(len(levels) - 1 if self.is_bid else 0, step)
+        while index is not None:
+            yield levels[index]
+            index = self._scan(index + step, step)
+
+    def iter_levels(self):
+        """Yields non-empty levels from the best price outwards."""
+        if self.best is None:
+            return
+        far = self.far
+        if not far:
+            yield from self._iter_dense()
+            return
+        low, high = self.base - 1, self.base + len(self.levels)
+        if self.is_bid:
+            better = self.far_ticks.irange(minimum=high, reverse=True)
+            worse = self.far_ticks.irange(maximum=low, reverse=True)
+        else:
+            better = self.far_ticks.irange(maximum=low)
+            worse = self.far_ticks.irange(minimum=high)
+        for ticks in better:
+            yield far[ticks]
+        yield from self._iter_dense()
+        for ticks in worse:
+            yield far[ticks]
+
+class TickOrderBook:
+    """
+    Limit order book working in integer price ticks.
+
+    Orders are keyed by `order.price_ticks`; orders that arrive without it are snapped
+    to the book's tick size. Prices returned by the public methods are floats
+    (ticks * tick_size) so the book can be used wherever `LimitOrderBook` is.
+    """
+
+    def __init__(self, tick_size: float, initial_levels: int = 1024, pooled: bool = False,
+                 max_levels: int = MAX_DENSE_LEVELS):
+        """
+        Args:
+            tick_size (float): Price increment of the book.
+            initial_levels (int): Initial length of each side's dense ladder window.
+            max_levels (int): Widest dense window per side, in ticks; prices beyond it are stored sparsely.
+            pooled (bool): Reuse emptied PriceLevels, as in `LimitOrderBook`.
+        """
+        self.tick_size = tick_size
+        self.bid_ladder = PriceLadder(is_bid=True, initial_levels=initial_levels, max_levels=max_levels)
+        self.ask_ladder = PriceLadder(is_bid=False, initial_levels=initial_levels, max_levels=max_levels)
+        self.orders_by_id = {}  # Order ID -> Order
+
+        self.bids_total_volume = 0
+        self.asks_total_volume = 0
+
+        self.level_listeners = []
+
+        self.pooled = pooled
+        self.free_levels = []
+
+    def add_level_listener(self, listener):
+        """Same as `LimitOrderBook.add_level_listener` (prices are floats)."""
+        self.level_listeners.append(listener)
+
+    def remove_level_listener(self, listener):
+        self.level_listeners.remove(listener)
+
+    def _level_changed(self, side, price, volume):
+        for listener in self.level_listeners:
+            listener(side, price, volume)
+
+    def to_ticks(self, price):
+        return int(round(price / self.tick_size))
+
+    def to_price(self, ticks):
+        return round(ticks * self.tick_size, 10)
+
+    def add_order(self, order: Order):
+
+        if order.price_ticks is None:
+            order.set_price_ticks(self.to_ticks(order.price), self.tick_size)
+
+        ladder = self.bid_ladder if order.side_code == BUY else self.ask_ladder
+        price_level = ladder.get(order.price_ticks)
+        if price_level is None:
+            if self.free_levels:
+                price_level = self.free_levels.pop()
+                price_level.price = order.price
+            else:
+                price_level = PriceLevel(order.price)
+            ladder.add(order.price_ticks, price_level)
+
+        price_level.add_order(order)
+        self.orders_by_id[order.order_id] = order
+
+        if order.side_code == BUY:
+            self.bids_total_volume += order.quantity
+        else:
+            self.asks_total_volume += order.quantity
+
+        if self.level_listeners:
+            self._level_changed(order.side_code, price_level.price, price_level.volume)
+
+        return True
+
+    def modify_order(self, order_id, new_quantity):
+        """Setting quantity to 0 will remove the order from the book."""
+
+        order = self.orders_by_id.get(order_id)
+        if order is None:
+            return
+
+        ladder = self.bid_ladder if order.side_code == BUY else self.ask_ladder
+        price_level = ladder.get(order.price_ticks)
+
+        if not price_level:
+            return
+
+        old_quantity = order.quantity
+        price_level.modify_order(order_id, new_quantity)
+
+        if order.side_code == BUY:
+            self.bids_total_volume += (new_quantity - old_quantity)
+        else:
+            self.asks_total_volume += (new_quantity - old_quantity)
+
+        if new_quantity == 0:
+            self._remove_order_and_cleanup(order, ladder, price_level)
+        elif self.level_listeners:
+            self._level_changed(order.side_code, price_level.price, price_level.volume)
+
+        return order
+
+    def _remove_order_and_cleanup(self, order, ladder, price_level):
+
+        removed_order = price_level.remove_order(order.order_id)
+
+        if removed_order:
+            if order.side_code == BUY:
+                self.bids_total_volume -= removed_order.quantity
+            else:
+                self.asks_total_volume -= removed_order.quantity
+
+            if price_level.is_empty():
+                ladder.remove(order.price_ticks)
+                if self.pooled and len(self.free_levels) < MAX_FREE_LEVELS:
+                    self.free_levels.append(price_level)
+
+            del self.orders_by_id[order.order_id]
+
+            if self.level_listeners:
+                self._level_changed(order.side_code, price_level.price, price_level.volume)
+
+    def remove_order(self, order_id):
+
+        order = self.orders_by_id.get(order_id)
+        if order is None:
+            return
+
+        ladder = self.bid_ladder if order.side_code == BUY else self.ask_ladder
+        price_level = ladder.get(order.price_ticks)
+
+        if price_level:
+            self._remove_order_and_cleanup(order, ladder, price_level)
+
+        return order
+
+    def get_best_bid_ticks(self):
+        return self.bid_ladder.best
+
+    def get_best_ask_ticks(self):
+        return self.ask_ladder.best
+
+    def get_best_bid(self):
+        best = self.bid_ladder.best
+        return self.to_price(best) if best is not None else None
+
+    def get_best_ask(self):
+        best = self.ask_ladder.best
+        return self.to_price(best) if best is not None else None
+
+    def top_bid(self):
+        best = self.bid_ladder.best
+        if best is not None:
+            return self.bid_ladder.get(best).top_order()
+        return None
+
+    def top_ask(self):
+        best = self.ask_ladder.best
+        if best is not None:
+            return self.ask_ladder.get(best).top_order()
+        return None
+
+    def _ladder(self, side):
+        return self.bid_ladder if side_code(side) == BUY else self.ask_ladder
+
+    def get_orders_at_price(self, price, side):
+        price_level = self._ladder(side).get(self.to_ticks(price))
+        if price_level is not None:
+            return price_level.orders
+        return OrderedDict()
+
+    def get_depth(self, side):
+        return {level.price: level.volume for level in self._ladder(side).iter_levels()}
+
+    def get_top_levels(self, side, n, prices=None, volumes=None):
+        """Same as `LimitOrderBook.get_top_levels`."""
+        return fill_top_levels(self._ladder(side).iter_levels(), n, prices, volumes)
+
+    def get_volume_up_to(self, side, price=None, max_volume=None):
+        """Same as `LimitOrderBook.get_volume_up_to`."""
+        is_bid = side_code(side) == BUY
+        volume = 0
+        for level in self._ladder(side).iter_levels():
+            if price is not None and (level.price < price if is_bid else level.price > price):
+                break
+            volume += level.volume
+            if max_volume is not None and volume >= max_volume:
+                break
+        return volume
+
+    def get_total_bid_volume(self):
+        return self.bids_total_volume
+
+    def get_total_ask_volume(self):
+        return self.asks_total_volume
+
+    def get_volume_at_price(self, price, side):
+        price_level = self._ladder(side).get(self.to_ticks(price))
+        if price_level is not None:
+            return price_level.volume
+        return 0
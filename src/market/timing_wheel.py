@@ -0,0 +1,108 @@
+class TimingWheel:
+    """
+    Hierarchical timing wheel for integer deadlines.
+
+    Level L has `2**bits` slots, each covering `2**(bits*L)` time units; an entry
+    sits in the lowest level whose current block also contains its deadline. When
+    the clock enters a new block of a level, that level's slot for the block is
+    cascaded into the levels below. Deadlines past the top level wait in an
+    overflow list until the top level turns over.
+
+    `advance(to)` returns everything due by `to` at a cost proportional to the
+    number of entries returned plus the slots stepped over, independent of how many
+    entries are still waiting.
+    """
+
+    def __init__(self, start_time: int = 0, bits: int = 8, levels: int = 4):
+        self.bits = bits
+        self.mask = (1 << bits) - 1
+        self.levels = levels
+        self.wheels = [[[] for _ in range(1 << bits)] for _ in range(levels)]
+        self.level_counts = [0] * levels
+        self.overflow = []
+        self.due = []  #entries scheduled at or before the current time
+        self.now = start_time
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def schedule(self, deadline: int, item):
+        """Adds `item` to be returned by the first `advance` that reaches `deadline`."""
+        self.count += 1
+        if deadline <= self.now:
+            self.due.append(item)
+        else:
+            self._insert(deadline, item)
+
+    def _insert(self, deadline, item):
+        bits = self.bits
+        now = self.now
+        for level in range(self.levels):
+            shift = bits * (level + 1)
+            if deadline >> shift == now >> shift:
+                self.wheels[level][(deadline >> (bits * level)) & self.mask].append((deadline, item))
+                self.level_counts[level] += 1
+                return
+        self.overflow.append((deadline, item))
+
+    def _take_slot(self, level, index, expired):
+        slot = self.wheels[level][index]
+        if slot:
+            self.level_counts[level] -= len(slot)
+            self.count -= len(slot)
+            expired.extend(item for _, item in slot)
+            slot.clear()
+
+    def _cascade(self):
+        """Called when `now` has just entered a new level-0 block."""
+        bits = self.bits
+        now = self.now
+        #find the highest level whose block also turned over
+        level = 1
+        while level < self.levels and (now >> (bits * level)) & self.mask == 0:
+            level += 1
+
+        if level == self.levels:
+            entries, self.overflow = self.overflow, []
+            for deadline, item in entries:
+                self._insert(deadline, item)
+            level -= 1
+
+        for upper in range(level, 0, -1):
+            slot = self.wheels[upper][(now >> (bits * upper)) & self.mask]
+            if slot:
+                self.level_counts[upper] -= len(slot)
+                entries = slot[:]
+                slot.clear()
+                for deadline, item in entries:
+                    self._insert(deadline, item)
+
+    def advance(self, to: int) -> list:
+        """Moves the clock to `to` and returns the items whose deadline is <= `to`."""
+        expired = []
+        if self.due:
+            self.count -= len(self.due)
+            expired.extend(self.due)
+            self.due = []
+
+        mask = self.mask
+        while self.now < to:
+            if self.count == 0:
+                self.now = to
+                break
+
+            if self.now & mask == mask:
+                #step into the next level-0 block
+                self.now += 1
+                self._cascade()
+                self._take_slot(0, 0, expired)
+                continue
+
+            limit = min(to, self.now | mask)
+            if self.level_counts[0]:
+                for index in range((self.now & mask) + 1, (limit & mask) + 1):
+                    self._take_slot(0, index, expired)
+            self.now = limit
+
+        return expired
@@ -1,5 +1,7 @@
 class Transaction:
-    def __init__(self, order_buy_id, order_sell_id, buyer_id, seller_id, price, quantity, timestamp):
+    __slots__ = ('order_buy_id', 'order_sell_id', 'buyer_id', 'seller_id', 'price', 'quantity', 'timestamp', 'symbol')
+
+    def __init__(self, order_buy_id, order_sell_id, buyer_id, seller_id, price, quantity, timestamp, symbol=None):
 
         self.order_buy_id = order_buy_id
         self.order_sell_id = order_sell_id
@@ -8,6 +10,7 @@ class Transaction:
         self.price = price
         self.quantity = quantity
         self.timestamp = timestamp
+        self.symbol = symbol
 
     def __str__(self) -> str:
         return f'Transaction: {self.quantity} units at {self.price}. Buyer: {self.buyer_id}, Seller: {self.seller_id}'
\ No newline at end of file
@@ -0,0 +1,119 @@
+"""
+Scenario batches that share one warm-up.
+
+The simulation is run up to the end of the warm-up once; every scenario then starts
+from that state in an `os.fork` child (the warmed-up market is shared copy-on-write),
+with its own seed and/or shock applied before the rest of the run. Where `os.fork`
+is not available the scenarios are restored one by one from a snapshot instead.
+
+    simulation = Simulation(config)
+    simulation.run(until=warmup_time)
+    results = run_forked(simulation, [{'seed': 1}, {'seed': 2, 'shock': crash}])
+"""
+import os
+import pickle
+import sys
+import traceback
+from collections import deque
+
+def run_scenario(simulation, scenario: dict, collect=None):
+    """
+    Continues `simulation` under one scenario and returns its result.
+
+    Args:
+        simulation (Simulation): Simulation to continue (modified in place).
+        scenario (dict): Optional keys: 'seed' (reseeds every agent), 'shock' (callable
+            taking the simulation, applied before running) and 'max_time'.
+        collect (callable): Builds the result from the finished simulation
+            (defaults to `simulation.summary()`).
+    """
+    if scenario.get('seed') is not None:
+        simulation.reseed(scenario['seed'])
+    if scenario.get('max_time') is not None:
+        simulation.max_time = scenario['max_time']
+    shock = scenario.get('shock')
+    if shock is not None:
+        shock(simulation)
+
+    simulation.verbose = False
+    simulation.run()
+    return collect(simulation) if collect is not None else simulation.summary()
+
+def _fork_child(simulation, scenario, collect):
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        status = 0
+        try:
+            #the parent's recording files are not the child's to write
+            for market_data in simulation.market.market_data_by_symbol.values():
+                market_data.recorder = None
+            simulation.market.detach_event_log()
+            if simulation.instrumentation is not None:
+                simulation.instrumentation.uninstall()
+                simulation.instrumentation = None
+            payload = ('ok', run_scenario(simulation, scenario, collect))
+        except BaseException:
+            payload = ('error', traceback.format_exc())
+            status = 1
+        try:
+            with os.fdopen(write_fd, 'wb') as pipe:
+                pipe.write(pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL))
+        finally:
+            os._exit(status)
+
+    os.close(write_fd)
+    return pid, read_fd
+
+def _collect_child(pid, read_fd):
+    with os.fdopen(read_fd, 'rb') as pipe:
+        data = pipe.read()
+    _, status = os.waitpid(pid, 0)
+    if not data:
+        raise RuntimeError(f"Scenario process {pid} exited with status {status} without a result")
+    kind, value = pickle.loads(data)
+    if kind == 'error':
+        raise RuntimeError(f"Scenario process {pid} failed:\n{value}")
+    return value
+
+def run_forked(simulation, scenarios: list, max_workers: int = None, collect=None) -> list:
+    """
+    Runs every scenario from the current (warmed-up) state of `simulation`, each in its
+    own forked process, with at most `max_workers` running at once. `simulation`
+    itself is left untouched. Returns the results in scenario order.
+
+    `collect` results are sent back with pickle, so they must be picklable; shocks and
+    `collect` themselves need not be.
+    """
+    if not hasattr(os, 'fork'):
+        snapshot = simulation.snapshot()
+        return [run_scenario(type(simulation).from_snapshot(snapshot), scenario, collect) for scenario in scenarios]
+
+    max_workers = max_workers or os.cpu_count() or 1
+    #nothing buffered may be inherited, or children would write it again
+    simulation.market.flush_recording()
+    if simulation.market.event_log is not None:
+        simulation.market.event_log.flush()
+    sys.stdout.flush()
+    sys.stderr.flush()
+
+    results = [None] * len(scenarios)
+    running = deque()
+    try:
+        for index, scenario in enumerate(scenarios):
+            if len(running) >= max_workers:
+                done, pid, read_fd = running.popleft()
+                results[done] = _collect_child(pid, read_fd)
+            running.append((index, *_fork_child(simulation, scenario, collect)))
+
+        while running:
+            done, pid, read_fd = running.popleft()
+            results[done] = _collect_child(pid, read_fd)
+    finally:
+        #on error, do not leave children behind
+        for _, pid, read_fd in running:
+            os.close(read_fd)
+            os.waitpid(pid, 0)
+
+    return results
@@ -0,0 +1,177 @@
+import csv
+import json
+import time
+
+class Instrumentation:
+    """
+    Counters and timers for the hot paths of a simulation.
+
+    Nothing is measured until `install` is called: it wraps the methods of the live
+    objects (EventBus.publish, Market.submit_order/cancel_order, order book top-of-book
+    lookups, agent activations, MarketDataManager.add_tick, AgentManager.step) on the
+    instances only, so a run without instrumentation executes the original code
+    untouched. `uninstall` puts the original methods back.
+
+    Timers are inclusive: time in `add_tick` is also counted in the activation of the
+    agent whose order caused the tick.
+    """
+
+    def __init__(self, report_path: str = None, report_format: str = None, report_every: float = None):
+        """
+        Args:
+            report_path (str): File the report is written to (at the end of the run, and
+                periodically if `report_every` is set). No file is written if None.
+            report_format (str): 'json' or 'csv' (default: from the file extension, else json).
+            report_every (float): Also write the report every this many wall-clock seconds.
+        """
+        if report_format is None:
+            report_format = 'csv' if report_path and report_path.endswith('.csv') else 'json'
+        if report_format not in ('json', 'csv'):
+            raise ValueError(f"Unknown report format: {report_format}")
+        self.report_path = report_path
+        self.report_format = report_format
+        self.report_every = report_every
+
+        self.counters = {}
+        self.event_counts = {}
+        self.timers = {}  #name -> [calls, total seconds]
+        self.heap_size = [0, 0, 0]  #samples, sum, max
+        self.last_heap_size = 0
+        self.sim_time = 0
+
+        self.started = None
+        self.last_report = None
+        self.patched = []  #(object, attribute name)
+
+    @classmethod
+    def from_config(cls, config):
+        """Builds an Instrumentation from the 'instrumentation' config value (True or a dict), or returns None."""
+        if not config:
+            return None
+        if config is True:
+            return cls()
+        if not config.get('enabled', True):
+            return None
+        return cls(report_path=config.get('report_path'), report_format=config.get('format'),
+                   report_every=config.get('report_every'))
+
+    def _patch(self, obj, name, wrapper):
+        setattr(obj, name, wrapper)
+        self.patched.append((obj, name))
+
+    def _timed(self, name, func):
+        timer = self.timers.setdefault(name, [0, 0.0])
+        perf_counter = time.perf_counter
+
+        def timed(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                timer[0] += 1
+                timer[1] += perf_counter() - start
+        return timed
+
+    def _counted(self, name, func):
+        counters = self.counters
+        counters.setdefault(name, 0)
+
+        def counted(*args, **kwargs):
+            counters[name] += 1
+            return func(*args, **kwargs)
+        return counted
+
+    def install(self, simulation):
+        market = simulation.market
+        agent_manager = market.agent_manager
+
+        publish = market.event_bus.publish
+        event_counts = self.event_counts
+
+        def counted_publish(event):
+            event_type = event.event_type
+            event_counts[event_type] = event_counts.get(event_type, 0) + 1
+            publish(event)
+        self._patch(market.event_bus, 'publish', counted_publish)
+
+        self._patch(market, 'submit_order', self._counted('orders_submitted', self._timed('submit_order', market.submit_order)))
+        self._patch(market, 'cancel_order', self._counted('cancels_requested', market.cancel_order))
+        #the matching loop looks up the opposite best order once per iteration
+        for order_book in market.order_books.values():
+            self._patch(order_book, 'top_ask', self._counted('match_loop_iterations', order_book.top_ask))
+            self._patch(order_book, 'top_bid', self._counted('match_loop_iterations', order_book.top_bid))
+        for market_data in market.market_data_by_symbol.values():
+            self._patch(market_data, 'add_tick', self._timed('add_tick', market_data.add_tick))
+
+        for agent in agent_manager.agents.values():
+            self._patch(agent, 'activate', self._timed(f'activate.{agent.__class__.__name__}', agent.activate))
+
+        step = agent_manager.step
+        timed_step = self._timed('step', step)
+        heap_size = self.heap_size
+        scheduler = agent_manager.scheduler
+
+        def instrumented_step(current_time):
+            size = len(scheduler)
+            heap_size[0] += 1
+            heap_size[1] += size
+            if size > heap_size[2]:
+                heap_size[2] = size
+            self.last_heap_size = size
+            self.sim_time = current_time
+            timed_step(current_time)
+            if self.report_every is not None and time.perf_counter() - self.last_report >= self.report_every:
+                self.write_report()
+        self._patch(agent_manager, 'step', instrumented_step)
+
+        if self.started is None:
+            self.started = self.last_report = time.perf_counter()
+
+    def uninstall(self):
+        for obj, name in reversed(self.patched):
+            delattr(obj, name)
+        self.patched = []
+
+    def report(self) -> dict:
+        wall_time = time.perf_counter() - self.started if self.started is not None else 0.0
+        per_second = (lambda count: count / wall_time) if wall_time > 0 else (lambda count: 0.0)
+        samples, total, largest = self.heap_size
+        return {
+            'wall_time': wall_time,
+            'sim_time': self.sim_time,
+            'counters': dict(self.counters),
+            'rates': {
+                'orders_per_second': per_second(self.counters.get('orders_submitted', 0)),
+                'events_per_second': per_second(sum(self.event_counts.values())),
+                'sim_time_per_second': per_second(self.sim_time),
+            },
+            'events': dict(self.event_counts),
+            'timers': {
+                name: {'calls': calls, 'total': seconds, 'mean': seconds / calls if calls else 0.0}
+                for name, (calls, seconds) in self.timers.items()
+            },
+            'heap_size': {'last': self.last_heap_size, 'max': largest, 'mean': total / samples if samples else 0.0},
+        }
+
+    def write_report(self, path: str = None):
+        path = path or self.report_path
+        self.last_report = time.perf_counter()
+        if path is None:
+            return
+        report = self.report()
+        with open(path, 'w', newline='') as file:
+            if self.report_format == 'json':
+                json.dump(report, file, indent=2)
+                return
+            writer = csv.writer(file)
+            writer.writerow(['section', 'name', 'field', 'value'])
+            for section, values in report.items():
+                if not isinstance(values, dict):
+                    writer.writerow([section, '', '', values])
+                    continue
+                for name, value in values.items():
+                    if isinstance(value, dict):
+                        for field, field_value in value.items():
+                            writer.writerow([section, name, field, field_value])
+                    else:
+                        writer.writerow([section, name, '', value])
@@ -0,0 +1,189 @@
+"""
+Multi-instrument runs split into independent symbol groups run in parallel.
+
+Symbols are grouped so that every agent's symbols fall into one group (symbols
+linked by a multi-symbol agent end up together). Groups share no agents and no
+books, so each is simulated as its own Simulation. Groups are spread over worker
+processes that advance in lockstep: every worker runs its groups up to the end of
+the current epoch of `sync_interval` time units and waits on a barrier before the
+next one, so all groups share one clock.
+
+    results = run_parallel_symbols(config, max_workers=8, sync_interval=100)
+
+Each group gets its own seed derived from the config seed, so results are
+reproducible but differ from running the whole universe in one Simulation.
+"""
+import copy
+import multiprocessing
+import os
+import traceback
+from queue import Empty
+from threading import BrokenBarrierError
+
+import numpy as np
+
+def agent_symbols(agent_config: dict, default_symbol) -> list:
+    """Symbols an agent config trades: its "symbols" and "symbol", or the default one."""
+    symbols = list(agent_config.get("symbols") or [])
+    if agent_config.get("symbol") is not None and agent_config["symbol"] not in symbols:
+        symbols.insert(0, agent_config["symbol"])
+    return symbols or [default_symbol]
+
+def symbol_groups(config: dict) -> list:
+    """
+    Partitions the market's symbols into groups that no agent trades across.
+
+    Returns:
+        list: Groups (lists of symbols in market order), ordered by their first symbol.
+    """
+    symbols = list(config["market"].get("symbols") or [None])
+    parent = {symbol: symbol for symbol in symbols}
+
+    def find(symbol):
+        while parent[symbol] != symbol:
+            parent[symbol] = parent[parent[symbol]]
+            symbol = parent[symbol]
+        return symbol
+
+    for agent_config in config["agents"]:
+        traded = agent_symbols(agent_config, symbols[0])
+        for symbol in traded:
+            if symbol not in parent:
+                raise ValueError(f"Agent {agent_config.get('id')} trades unknown symbol: {symbol}")
+        root = find(traded[0])
+        for symbol in traded[1:]:
+            parent[find(symbol)] = root
+
+    groups = {}
+    for symbol in symbols:
+        groups.setdefault(find(symbol), []).append(symbol)
+    return list(groups.values())
+
+def split_config(config: dict, group: list, seed=None) -> dict:
+    """
+    Config of the Simulation running one symbol group: the group's symbols and the
+    agents trading them, with `seed`. Recordings and event logs go to per-group
+    paths; instrumentation is dropped.
+    """
+    group_config = copy.deepcopy(config)
+    default_symbol = (config["market"].get("symbols") or [None])[0]
+    members = set(group)
+    group_config["agents"] = [
+        agent_config for agent_config in group_config["agents"]
+        if agent_symbols(agent_config, default_symbol)[0] in members
+    ]
+    for agent_config in group_config["agents"]:
+        #the group's first symbol is the new default, so bind agents to theirs explicitly
+        if not agent_config.get("symbols"):
+            agent_config["symbol"] = agent_symbols(agent_config, default_symbol)[0]
+
+    market_config = group_config["market"]
+    market_config["symbols"] = list(group)
+    if market_config.get("recording_dir") is not None and len(group) == 1:
+        #same layout as the unsplit market: one subdirectory per symbol
+        market_config["recording_dir"] = os.path.join(market_config["recording_dir"], str(group[0]))
+    if market_config.get("event_log"):
+        root, ext = os.path.splitext(market_config["event_log"])
+        market_config["event_log"] = f"{root}.{'-'.join(str(symbol) for symbol in group)}{ext}"
+
+    group_config.pop("instrumentation", None)
+    group_config["seed"] = seed
+    group_config["verbose"] = False
+    return group_config
+
+def _run_epochs(simulations, max_time, sync_interval, barrier=None):
+    current_time = 0
+    while current_time < max_time:
+        current_time = min(current_time + sync_interval, max_time)
+        for simulation in simulations:
+            simulation.run(until=current_time)
+        if barrier is not None:
+            barrier.wait()
+
+def _worker(jobs, max_time, sync_interval, barrier, queue, collect):
+    from src.simulation.simulation import Simulation
+
+    try:
+        simulations = [Simulation(group_config) for _, group_config in jobs]
+        _run_epochs(simulations, max_time, sync_interval, barrier)
+        for (index, _), simulation in zip(jobs, simulations):
+            queue.put((index, 'ok', collect(simulation) if collect is not None else simulation.summary()))
+    except BrokenBarrierError:
+        #another worker failed and reported it
+        pass
+    except BaseException:
+        barrier.abort()
+        queue.put((None, 'error', traceback.format_exc()))
+
+def _assign(jobs, workers):
+    """Spreads jobs over workers, largest (by number of agents) first to the least loaded."""
+    buckets = [[] for _ in range(workers)]
+    loads = [0] * workers
+    for job in sorted(jobs, key=lambda job: -len(job[1]["agents"])):
+        worker = loads.index(min(loads))
+        buckets[worker].append(job)
+        loads[worker] += max(len(job[1]["agents"]), 1)
+    return buckets
+
+def run_parallel_symbols(config: dict, max_workers: int = None, sync_interval: int = 100, collect=None) -> list:
+    """
+    Runs every independent symbol group of a multi-instrument config.
+
+    Args:
+        config (dict): Simulation config with "symbols" in its market config.
+        max_workers (int): Worker processes (default: CPU count, at most one per group).
+            With one worker the groups run in the current process.
+        sync_interval (int): Time units between clock synchronizations of the workers.
+        collect (callable): Builds a group's result from its finished Simulation
+            (defaults to `simulation.summary()`); results must be picklable.
+
+    Returns:
+        list: {'symbols', 'seed', 'result'} per group, in `symbol_groups` order.
+    """
+    groups = symbol_groups(config)
+    seeds = np.random.SeedSequence(config.get("seed")).generate_state(len(groups), dtype=np.uint32).tolist()
+    jobs = [(index, split_config(config, group, seed)) for index, (group, seed) in enumerate(zip(groups, seeds))]
+    max_time = config.get("max_time", 100)
+    workers = min(max_workers or os.cpu_count() or 1, len(jobs))
+
+    results = [None] * len(jobs)
+    if workers <= 1:
+        from src.simulation.simulation import Simulation
+
+        simulations = [Simulation(group_config) for _, group_config in jobs]
+        _run_epochs(simulations, max_time, sync_interval)
+        for index, simulation in enumerate(simulations):
+            results[index] = collect(simulation) if collect is not None else simulation.summary()
+    else:
+        context = multiprocessing.get_context('fork' if hasattr(os, 'fork') else None)
+        barrier = context.Barrier(workers)
+        queue = context.Queue()
+        processes = [
+            context.Process(target=_worker, args=(bucket, max_time, sync_interval, barrier, queue, collect), daemon=True)
+            for bucket in _assign(jobs, workers)
+        ]
+        for process in processes:
+            process.start()
+        try:
+            pending = len(jobs)
+            while pending:
+                try:
+                    index, kind, value = queue.get(timeout=1)
+                except Empty:
+                    if not any(process.is_alive() for process in processes):
+                        raise RuntimeError("Symbol group workers exited without reporting results")
+                    continue
+                if kind == 'error':
+                    raise RuntimeError(f"Symbol group worker failed:\n{value}")
+                results[index] = value
+                pending -= 1
+        finally:
+            for process in processes:
+                if pending:
+                    process.terminate()
+                process.join()
+
+    return [
+        {'symbols': group, 'seed': seed, 'result': result}
+        for group, seed, result in zip(groups, seeds, results)
+    ]
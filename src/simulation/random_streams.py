@@ -0,0 +1,70 @@
+import numpy as np
+from typing import Optional
+
+class RandomStream:
+    """
+    Scalar random values served from blocks pre-drawn from one NumPy Generator.
+
+    Drawing a single value from NumPy costs about as much as drawing a thousand, so
+    values are generated `block_size` at a time and refilled when a block runs out.
+    Bulk draws (for cohorts) go straight to `generator`.
+    """
+
+    def __init__(self, generator: np.random.Generator, block_size: int = 1024):
+        self.generator = generator
+        self.block_size = block_size
+        self._uniform = None
+        self._uniform_pos = block_size
+        self._exponential = None
+        self._exponential_pos = block_size
+
+    def random(self) -> float:
+        """Uniform float in [0, 1)."""
+        if self._uniform_pos >= self.block_size:
+            self._uniform = self.generator.random(self.block_size).tolist()
+            self._uniform_pos = 0
+        value = self._uniform[self._uniform_pos]
+        self._uniform_pos += 1
+        return value
+
+    def uniform(self, low: float, high: float) -> float:
+        return low + (high - low) * self.random()
+
+    def randint(self, low: int, high: int) -> int:
+        """Integer in [low, high], both ends included (like `random.randint`)."""
+        return low + int(self.random() * (high - low + 1))
+
+    def choice(self, sequence):
+        return sequence[int(self.random() * len(sequence))]
+
+    def exponential(self, scale: float) -> float:
+        if self._exponential_pos >= self.block_size:
+            self._exponential = self.generator.standard_exponential(self.block_size).tolist()
+            self._exponential_pos = 0
+        value = self._exponential[self._exponential_pos]
+        self._exponential_pos += 1
+        return value * scale
+
+class RandomService:
+    """
+    Source of independent random streams for one simulation run.
+
+    Every stream is spawned from a single SeedSequence, so a run is reproducible from
+    the seed alone, provided streams are requested in the same order.
+    """
+
+    def __init__(self, seed: Optional[int] = None, block_size: int = 1024):
+        self.seed_sequence = np.random.SeedSequence(seed)
+        self.block_size = block_size
+
+    @property
+    def seed(self):
+        return self.seed_sequence.entropy
+
+    def spawn_stream(self) -> RandomStream:
+        child = self.seed_sequence.spawn(1)[0]
+        return RandomStream(np.random.default_rng(child), self.block_size)
+
+def default_stream() -> RandomStream:
+    """Unseeded stream for agents created outside a Simulation."""
+    return RandomStream(np.random.default_rng())
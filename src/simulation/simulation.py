@@ -1,14 +1,24 @@
+import pickle
+import numpy as np
+
 from src.market.market import Market
+from src.simulation.random_streams import RandomService
+from src.simulation.instrumentation import Instrumentation
 
 from src.agents.agents.zero_intelligence_agent import ZeroIntelligenceAgent
 from src.agents.agents.fundamentalist_agent import FundamentalistAgent
 from src.agents.agents.chartist_agent import ChartistAgent
+from src.agents.agents.fundamentalist_cohort import FundamentalistCohort
+from src.agents.agents.stop_loss_agent import StopLossAgent
 
 class Simulation:
     def __init__(self, config):
         self.config = config
         self.current_time = 0
 
+        #every agent gets its own stream spawned from the run seed, in config order
+        self.rng = RandomService(config.get("seed"), block_size=config.get("rng_block_size", 1024))
+
         self.market = Market(config["market"])
         
         for agent_config in config["agents"]:
@@ -17,66 +27,327 @@ class Simulation:
 
         self.time_step = config.get("time_step", 1)
         self.max_time = config.get("max_time", 100)
+        self.verbose = config.get("verbose", True)
+        #set once the run has reached max_time (or run out of activations) and been wrapped up
+        self.finished = False
+
+        #counters and timers on the hot paths; None (and no overhead) unless configured
+        self.instrumentation = Instrumentation.from_config(config.get("instrumentation"))
+        if self.instrumentation is not None:
+            self.instrumentation.install(self)
 
     def create_agent(self, agent_config):
+        #in a multi-instrument market, "symbol" binds a single-symbol agent to one symbol
+        #(default: the first one); zero-intelligence agents can trade several via "symbols"
+        market = self.market
+        if agent_config.get("symbol") is not None:
+            market = self.market.symbol_market(agent_config["symbol"])
 
         if agent_config["type"] == "zero_intelligence":
             return ZeroIntelligenceAgent(
                 agent_id=agent_config["id"],
                 initial_cash=agent_config["cash"],
-                market=self.market,
+                market=market,
                 max_order_size=agent_config["max_order_size"],
                 limit_order_rate=agent_config["limit_order_rate"],
                 market_order_rate=agent_config["market_order_rate"],
                 cancellation_rate=agent_config["cancellation_rate"],
-                activation_rate=agent_config["activation_rate"]
+                activation_rate=agent_config["activation_rate"],
+                rng=self.rng.spawn_stream(),
+                order_lifetime=agent_config.get("order_lifetime"),
+                symbols=agent_config.get("symbols")
             )
         
         if agent_config["type"] == "fundamentalist":
             return FundamentalistAgent(
                 agent_id=agent_config["id"],
                 initial_cash=agent_config["cash"],
-                market=self.market,
+                market=market,
                 fundamental_value=agent_config["fundamental_value"],
                 activation_rate=agent_config["activation_rate"],
-                max_order_size=agent_config["max_order_size"]
+                max_order_size=agent_config["max_order_size"],
+                rng=self.rng.spawn_stream()
             )
+        elif agent_config["type"] == "fundamentalist_cohort":
+            return self.create_fundamentalist_cohort(agent_config, market)
         elif agent_config["type"] == "chartist":
             return ChartistAgent(
                 agent_id=agent_config["id"],
                 initial_cash=agent_config["cash"],
-                market=self.market,
+                market=market,
                 activation_rate=agent_config["activation_rate"],
                 max_order_size=agent_config["max_order_size"],
-                window=agent_config["window"]
+                window=agent_config["window"],
+                rng=self.rng.spawn_stream()
+            )
+        elif agent_config["type"] == "stop_loss":
+            return StopLossAgent(
+                agent_id=agent_config["id"],
+                initial_cash=agent_config["cash"],
+                market=market,
+                stop_price=agent_config["stop_price"],
+                quantity=agent_config["quantity"],
+                take_profit=agent_config.get("take_profit"),
+                holdings=agent_config.get("holdings"),
+                rng=self.rng.spawn_stream()
             )
 
         else:
                 raise ValueError(f"Unknown agent type: {agent_config['type']}")
 
-    def run(self):
-        while self.market.agent_manager.time_queue:
-            next_time = self.market.agent_manager.time_queue[0][0]
-            if next_time > self.max_time:
+    def create_fundamentalist_cohort(self, agent_config, market=None):
+        """
+        Builds a FundamentalistCohort. Members can be given explicitly (member_ids,
+        fundamental_values, activation_rates) or drawn from distributions (size,
+        first_member_id, fundamental_mean/std, activation_rate_min/max).
+        """
+        size = agent_config.get("size")
+        member_ids = agent_config.get("member_ids")
+        if member_ids is None:
+            first_member_id = agent_config.get("first_member_id", agent_config["id"] + 1)
+            member_ids = range(first_member_id, first_member_id + size)
+        size = len(member_ids)
+        rng = self.rng.spawn_stream()
+
+        fundamental_values = agent_config.get("fundamental_values")
+        if fundamental_values is None:
+            fundamental_values = rng.generator.normal(agent_config["fundamental_mean"], agent_config["fundamental_std"], size)
+
+        activation_rates = agent_config.get("activation_rates")
+        if activation_rates is None:
+            activation_rates = rng.generator.uniform(agent_config["activation_rate_min"], agent_config["activation_rate_max"], size)
+
+        return FundamentalistCohort(
+            agent_id=agent_config["id"],
+            member_ids=member_ids,
+            initial_cash=agent_config["cash"],
+            market=market if market is not None else self.market,
+            fundamental_values=fundamental_values,
+            activation_rates=activation_rates,
+            max_order_size=agent_config["max_order_size"],
+            rng=rng
+        )
+
+    def _steps(self, until=None):
+        """Advances the run one activation time at a time, yielding each time after its step."""
+        end_time = self.max_time if until is None else min(until, self.max_time)
+        while True:
+            next_time = self.market.agent_manager.scheduler.next_time()
+            if next_time is None or next_time > end_time:
                 break
 
             self.current_time = next_time
             self.market.time = self.current_time
 
-            if self.current_time % 1000 == 0:
+            if self.verbose and self.current_time % 1000 == 0:
                 print(f"Time: {self.current_time} ({self.current_time / self.max_time:.2%})")
 
+            self.market.expire_orders(self.current_time)
             self.market.agent_manager.step(self.current_time)
+            yield next_time
+
+    def _flush(self):
+        self.market.flush_recording()
+        if self.market.event_log is not None:
+            self.market.event_log.flush()
+
+    def _finish_run(self):
+        if self.finished:
+            return
+        self.finished = True
+        self.close()
+        if self.instrumentation is not None:
+            self.instrumentation.write_report()
+        if self.verbose:
+            print("END OF SIMULATION")
+
+    def close(self):
+        """Closes the market's recordings and event log; called once the run finishes."""
+        self.market.close()
 
-        print("END OF SIMULATION")
+    def _end_steps(self):
+        """Wraps the run up once nothing is left before max_time; a paused run is only flushed."""
+        next_time = self.market.agent_manager.scheduler.next_time()
+        if next_time is None or next_time > self.max_time:
+            self._finish_run()
+        else:
+            self._flush()
+
+    def run(self, until=None):
+        """
+        Runs the simulation up to `max_time`, or only up to `until` when given. A run
+        stopped at `until` can be resumed by calling `run` again (or snapshotted first).
+        """
+        for _ in self._steps(until):
+            pass
+        self._end_steps()
+
+    def iter_run(self, until=None, every='step', symbol=None):
+        """
+        Runs like `run`, yielding a market snapshot after every step (`every='step'`) or
+        each time a bar of period `every` closes.
+
+        The run only advances while the next snapshot is requested, so the consumer can
+        pause, stop early (break or `close()`) and resume with another `iter_run` or
+        `run` call. Snapshots are dicts with time, best_bid, best_ask, mid_price,
+        last_price, bid_volume, ask_volume and 'bars': {period: [bars closed since the
+        previous snapshot]}.
+
+        Args:
+            until (int): Stop after this time (default: `max_time`).
+            every: 'step' or an OHLCV period of the market.
+            symbol: Symbol to report in a multi-instrument market (default: the first).
+        """
+        market_data = self.market.market_data if symbol is None else self.market.market_data_by_symbol[symbol]
+        if every != 'step' and every not in market_data.ohlcv_periods:
+            raise ValueError(f"'every' must be 'step' or one of the OHLCV periods {sorted(market_data.ohlcv_periods)}")
+        stores = market_data.ohlcv_data
+        bar_counts = {period: len(store) + store.dropped for period, store in stores.items()}
+        try:
+            for current_time in self._steps(until):
+                if every != 'step':
+                    store = stores[every]
+                    if len(store) + store.dropped == bar_counts[every]:
+                        continue
+                yield self._market_snapshot(current_time, market_data, bar_counts)
+        finally:
+            self._end_steps()
+
+    @staticmethod
+    def _market_snapshot(current_time, market_data, bar_counts):
+        bars = {}
+        for period, store in market_data.ohlcv_data.items():
+            total = len(store) + store.dropped
+            closed = total - bar_counts[period]
+            if closed:
+                bars[period] = store.last_bars(closed)
+                bar_counts[period] = total
+        return {
+            'time': current_time,
+            'best_bid': market_data.best_bid,
+            'best_ask': market_data.best_ask,
+            'mid_price': market_data.mid_price,
+            'last_price': market_data.last_transaction_price,
+            'bid_volume': market_data.bid_volume,
+            'ask_volume': market_data.ask_volume,
+            'bars': bars,
+        }
+
+    def snapshot(self) -> bytes:
+        """
+        Serializes the full state of the run: order book, agents and their random streams,
+        the activation queue, indicators and rolling market data.
+
+        On-disk recordings, event logs and instrumentation are not part of the snapshot;
+        a restored run does not record or measure.
+        """
+        market_data = list(self.market.market_data_by_symbol.values())
+        recorders = [data.recorder for data in market_data]
+        self.market.flush_recording()
+        for data in market_data:
+            data.recorder = None
+        event_log = self.market.detach_event_log()
+        instrumentation = self.instrumentation
+        if instrumentation is not None:
+            instrumentation.uninstall()
+        self.instrumentation = None
+        try:
+            return pickle.dumps(self.__dict__, protocol=pickle.HIGHEST_PROTOCOL)
+        finally:
+            for data, recorder in zip(market_data, recorders):
+                data.recorder = recorder
+            if event_log is not None:
+                self.market.attach_event_log(event_log)
+            if instrumentation is not None:
+                self.instrumentation = instrumentation
+                instrumentation.install(self)
+
+    def restore(self, snapshot: bytes):
+        """Replaces the state of this simulation with one taken by `snapshot`."""
+        self.__dict__.update(pickle.loads(snapshot))
+
+    @classmethod
+    def from_snapshot(cls, snapshot: bytes):
+        simulation = cls.__new__(cls)
+        simulation.restore(snapshot)
+        return simulation
+
+    def reseed(self, seed):
+        """
+        Gives every agent a fresh random stream spawned from `seed` (in registration
+        order), so runs continued from the same state diverge reproducibly.
+        """
+        self.rng = RandomService(seed, block_size=self.rng.block_size)
+        for agent in self.market.agent_manager.agents.values():
+            agent.rng = self.rng.spawn_stream()
 
     def get_agent_stats(self):
         stats = []
-        for agent_id, agent in self.market.agent_manager.agents.items():
+        for agent in self.market.agent_manager.iter_portfolios():
             stats.append({
-                "agent_id": agent_id,
+                "agent_id": agent.agent_id,
                 "cash": agent.cash,
                 "holdings": agent.holdings,
                 "total_value": agent.get_total_value(self.market.market_data.mid_price)
             })
         return stats
+
+    @staticmethod
+    def _ohlcv_summary(market_data):
+        ohlcv = {}
+        for period in sorted(market_data.ohlcv_periods):
+            store = market_data.ohlcv_data[period]
+            closes = store.get_column('close')
+            returns = np.diff(np.log(closes)) if len(closes) > 1 and (closes > 0).all() else np.zeros(0)
+            ohlcv[str(period)] = {
+                'bars': len(store) + store.dropped,
+                'last_close': float(closes[-1]) if len(closes) else None,
+                'high': float(store.get_column('high').max()) if len(closes) else None,
+                'low': float(store.get_column('low').min()) if len(closes) else None,
+                'volume': int(store.get_column('volume').sum()),
+                'mean_return': float(returns.mean()) if len(returns) else None,
+                'volatility': float(returns.std()) if len(returns) > 1 else None,
+            }
+        return ohlcv
+
+    def summary(self):
+        """
+        Compact, JSON-serializable description of the run: OHLCV statistics per period
+        and profit and loss per agent type (valued at the last prices). Multi-instrument
+        runs also report the last price and OHLCV statistics of every symbol.
+        """
+        prices = {}
+        for symbol, market_data in self.market.market_data_by_symbol.items():
+            prices[symbol] = market_data.get_last_transaction_price() or market_data.mid_price or 0.0
+        price = prices[self.market.symbol]
+
+        pnl = {}
+        for agent in self.market.agent_manager.iter_portfolios():
+            agent_type = getattr(agent, 'agent_type', agent.__class__.__name__)
+            pnl.setdefault(agent_type, []).append(agent.get_portfolio_value(prices) - agent.initial_cash)
+        pnl = {
+            agent_type: {
+                'agents': len(values),
+                'total': float(np.sum(values)),
+                'mean': float(np.mean(values)),
+                'min': float(np.min(values)),
+                'max': float(np.max(values)),
+            }
+            for agent_type, values in pnl.items()
+        }
+
+        summary = {
+            'time': int(self.current_time),
+            'last_price': float(price),
+            'ohlcv': self._ohlcv_summary(self.market.market_data),
+            'pnl': pnl,
+        }
+        if len(self.market.symbols) > 1:
+            summary['symbols'] = {
+                str(symbol): {
+                    'last_price': float(prices[symbol]),
+                    'ohlcv': self._ohlcv_summary(market_data),
+                }
+                for symbol, market_data in self.market.market_data_by_symbol.items()
+            }
+        return summary
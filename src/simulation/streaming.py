@@ -0,0 +1,116 @@
+"""
+Pushes the snapshots of `Simulation.iter_run` to asyncio subscribers.
+
+Every subscriber gets its own bounded queue. With the default 'block' overflow
+policy the simulation waits for the slowest subscriber (backpressure); a
+'drop_oldest' subscriber, e.g. a dashboard that only needs the latest state,
+never holds the run back and loses its oldest snapshots instead.
+
+    broadcaster = SnapshotBroadcaster(simulation, every=1000)
+    subscription = broadcaster.subscribe(maxsize=16)
+    task = asyncio.create_task(broadcaster.run())
+    async for snapshot in subscription:
+        if stopping_rule(snapshot):
+            broadcaster.stop()
+
+A stopped broadcaster leaves the simulation at the last published step; it can be
+resumed by running the broadcaster (or the simulation) again.
+"""
+import asyncio
+
+_END = object()
+
+class Subscription:
+    """Async iterator over the snapshots published to one subscriber."""
+
+    def __init__(self, broadcaster, maxsize: int = 0, overflow: str = 'block'):
+        if overflow not in ('block', 'drop_oldest'):
+            raise ValueError(f"overflow must be 'block' or 'drop_oldest', got {overflow!r}")
+        if overflow == 'drop_oldest' and maxsize <= 0:
+            raise ValueError("'drop_oldest' subscriptions need a positive maxsize")
+        self.broadcaster = broadcaster
+        self.queue = asyncio.Queue(maxsize)
+        self.overflow = overflow
+        self.dropped = 0
+        self.ended = False
+        self.closed = False
+
+    async def put(self, snapshot):
+        if self.overflow == 'drop_oldest' and self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        await self.queue.put(snapshot)
+
+    def end(self):
+        #a full queue means the consumer is not waiting on it, so a flag is enough
+        if self.queue.full():
+            self.ended = True
+        else:
+            self.queue.put_nowait(_END)
+
+    def close(self):
+        """Unsubscribes; a producer waiting on this queue is released."""
+        self.closed = True
+        self.broadcaster.unsubscribe(self)
+        while not self.queue.empty():
+            self.queue.get_nowait()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.closed or (self.ended and self.queue.empty()):
+            raise StopAsyncIteration
+        snapshot = await self.queue.get()
+        if snapshot is _END:
+            raise StopAsyncIteration
+        return snapshot
+
+class SnapshotBroadcaster:
+    def __init__(self, simulation, every='step', symbol=None):
+        """
+        Args:
+            simulation (Simulation): Simulation to run.
+            every: 'step' or an OHLCV period, as in `Simulation.iter_run`.
+            symbol: Symbol to report in a multi-instrument market.
+        """
+        self.simulation = simulation
+        self.every = every
+        self.symbol = symbol
+        self.subscriptions = []
+        self.published = 0
+        self.stopped = False
+
+    def subscribe(self, maxsize: int = 0, overflow: str = 'block') -> Subscription:
+        """New subscription; `maxsize` bounds its queue (0 is unbounded)."""
+        subscription = Subscription(self, maxsize, overflow)
+        self.subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        if subscription in self.subscriptions:
+            self.subscriptions.remove(subscription)
+
+    def stop(self):
+        """Stops the run after the snapshot being published."""
+        self.stopped = True
+
+    async def run(self, until=None) -> int:
+        """Runs the simulation, publishing every snapshot; returns how many were published."""
+        self.stopped = False
+        snapshots = self.simulation.iter_run(until, every=self.every, symbol=self.symbol)
+        try:
+            for snapshot in snapshots:
+                for subscription in list(self.subscriptions):
+                    if not subscription.closed:
+                        await subscription.put(snapshot)
+                self.published += 1
+                #let subscribers run even when no queue is full
+                await asyncio.sleep(0)
+                if self.stopped:
+                    break
+        finally:
+            snapshots.close()
+            for subscription in self.subscriptions:
+                subscription.end()
+        return self.published
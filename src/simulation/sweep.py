@@ -0,0 +1,230 @@
+"""
+Parameter sweeps over Simulation configs, run in parallel worker processes.
+
+Parameters are addressed with dotted paths into the config. A path segment can
+select list items by index (`agents[0]`) or by agent type (`agents[type=chartist]`,
+which applies to every matching agent), e.g.:
+
+    {"agents[type=fundamentalist].activation_rate": [0.01, 0.05],
+     "market.ohlcv_periods": [[100], [1000]]}
+
+Command line:
+
+    python -m src.simulation.sweep --config base.json --grid grid.json --workers 8 --checkpoint runs.jsonl
+"""
+import argparse
+import copy
+import itertools
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+_SEGMENT = re.compile(r'^([^\[\]]+)(?:\[([^\]]+)\])?$')
+
+def _select(node, selector):
+    if '=' in selector:
+        key, value = selector.split('=', 1)
+        return [item for item in node if str(item.get(key)) == value]
+    return [node[int(selector)]]
+
+def set_config_value(config: dict, path: str, value):
+    """Sets `value` at a dotted `path` in `config` (in place)."""
+    nodes = [config]
+    segments = path.split('.')
+    for depth, segment in enumerate(segments):
+        match = _SEGMENT.match(segment)
+        if match is None:
+            raise ValueError(f"Invalid config path segment: {segment}")
+        key, selector = match.groups()
+        last = depth == len(segments) - 1
+
+        if selector is None and last:
+            for node in nodes:
+                node[key] = copy.deepcopy(value)
+            return
+
+        if last:
+            raise ValueError(f"Path {path} must end with a key, not a list selector")
+
+        next_nodes = []
+        for node in nodes:
+            child = node[key]
+            next_nodes.extend(_select(child, selector) if selector is not None else [child])
+        if not next_nodes:
+            raise ValueError(f"Path {path} does not match anything in the config")
+        nodes = next_nodes
+
+def expand_grid(grid: dict) -> list:
+    """Cartesian product of a {path: [values]} grid as a list of {path: value} dicts."""
+    paths = list(grid)
+    return [dict(zip(paths, values)) for values in itertools.product(*(grid[path] for path in paths))]
+
+def make_sampler(space: dict):
+    """
+    Builds a sampler from a {path: spec} space. A spec is a list (uniform choice),
+    {"uniform": [low, high]}, {"loguniform": [low, high]} or {"randint": [low, high]}.
+    """
+    def sample(rng: np.random.Generator) -> dict:
+        params = {}
+        for path, spec in space.items():
+            if isinstance(spec, list):
+                params[path] = spec[int(rng.integers(len(spec)))]
+            elif 'uniform' in spec:
+                params[path] = float(rng.uniform(*spec['uniform']))
+            elif 'loguniform' in spec:
+                low, high = spec['loguniform']
+                params[path] = float(np.exp(rng.uniform(np.log(low), np.log(high))))
+            elif 'randint' in spec:
+                low, high = spec['randint']
+                params[path] = int(rng.integers(low, high + 1))
+            else:
+                raise ValueError(f"Unknown sampling spec for {path}: {spec}")
+        return params
+    return sample
+
+def run_single(run_id: int, base_config: dict, params: dict, seed: int) -> dict:
+    """Runs one simulation in the current process and returns its summary."""
+    from src.simulation.simulation import Simulation
+
+    config = copy.deepcopy(base_config)
+    for path, value in params.items():
+        set_config_value(config, path, value)
+    config['seed'] = seed
+    config['verbose'] = False
+
+    start = time.perf_counter()
+    simulation = Simulation(config)
+    simulation.run()
+    return {
+        'run_id': run_id,
+        'params': params,
+        'seed': seed,
+        'runtime': time.perf_counter() - start,
+        'summary': simulation.summary(),
+    }
+
+def load_checkpoint(path: str) -> dict:
+    """Reads completed runs from a JSONL checkpoint file: {run_id: result}. Failed runs are left out."""
+    completed = {}
+    if path and os.path.exists(path):
+        with open(path) as file:
+            for line in file:
+                line = line.strip()
+                if line:
+                    result = json.loads(line)
+                    if 'error' not in result:
+                        completed[result['run_id']] = result
+    return completed
+
+def check_checkpoint(completed: dict, runs: list):
+    """Raises ValueError if a checkpointed run was made with other params or another seed than `runs`."""
+    stale = []
+    for run_id, params, run_seed in runs:
+        result = completed.get(run_id)
+        #compare in JSON form, as the checkpoint stores it
+        if result is not None and (result['params'] != json.loads(json.dumps(params)) or result['seed'] != run_seed):
+            stale.append(run_id)
+    if stale:
+        raise ValueError(f"Checkpoint runs {stale} were made with different params or seeds; "
+                         f"the grid, samples or sweep seed changed since the checkpoint was written")
+
+def build_runs(grid=None, sampler=None, num_samples=None, seed=0) -> list:
+    """Returns (run_id, params, run_seed) for every run of the sweep."""
+    if grid is not None:
+        param_sets = expand_grid(grid)
+    elif sampler is not None:
+        if num_samples is None:
+            raise ValueError("num_samples is required when sampling")
+        sampling_rng = np.random.default_rng(np.random.SeedSequence(seed).spawn(1)[0])
+        param_sets = [sampler(sampling_rng) for _ in range(num_samples)]
+    else:
+        param_sets = [{}]
+
+    run_seeds = np.random.SeedSequence(seed).generate_state(len(param_sets), dtype=np.uint32).tolist()
+    return [(run_id, params, run_seed) for run_id, (params, run_seed) in enumerate(zip(param_sets, run_seeds))]
+
+def run_sweep(base_config: dict, grid: dict = None, sampler=None, num_samples: int = None, seed: int = 0,
+              max_workers: int = None, checkpoint_path: str = None):
+    """
+    Runs a parameter sweep and yields each run's result as soon as it finishes.
+
+    Args:
+        base_config (dict): Simulation config shared by all runs.
+        grid (dict): {path: [values]} grid; every combination is one run.
+        sampler (callable): Alternative to `grid`, called with a Generator to draw a params dict.
+        num_samples (int): Number of runs drawn with `sampler`.
+        seed (int): Sweep seed; per-run seeds are derived from it.
+        max_workers (int): Worker processes (defaults to the number of CPUs).
+        checkpoint_path (str): JSONL file where finished runs are appended. Runs already
+            present in it are skipped, so an interrupted sweep can be resumed; ValueError is
+            raised if they were made with other params or seeds. Failed runs are recorded
+            too but run again on resume.
+
+    Yields:
+        dict: {'run_id', 'params', 'seed', 'runtime', 'summary'} per run, or
+        {'run_id', 'params', 'seed', 'error'} for a run that raised.
+
+    Closing the generator early cancels the runs that have not started yet.
+    """
+    runs = build_runs(grid, sampler, num_samples, seed)
+    completed = load_checkpoint(checkpoint_path)
+    check_checkpoint(completed, runs)
+    pending = [run for run in runs if run[0] not in completed]
+    if not pending:
+        return
+
+    checkpoint = open(checkpoint_path, 'a') if checkpoint_path else None
+    executor = ProcessPoolExecutor(max_workers=max_workers or os.cpu_count())
+    try:
+        futures = {executor.submit(run_single, run_id, base_config, params, run_seed): (run_id, params, run_seed)
+                   for run_id, params, run_seed in pending}
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception as error:
+                run_id, params, run_seed = futures[future]
+                result = {'run_id': run_id, 'params': params, 'seed': run_seed,
+                          'error': f"{type(error).__name__}: {error}"}
+            if checkpoint is not None:
+                checkpoint.write(json.dumps(result) + '\n')
+                checkpoint.flush()
+            yield result
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+        if checkpoint is not None:
+            checkpoint.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a parameter sweep of simulations in parallel.")
+    parser.add_argument('--config', required=True, help="JSON file with the base simulation config")
+    parser.add_argument('--grid', help="JSON file with a {path: [values]} grid")
+    parser.add_argument('--space', help="JSON file with a {path: spec} sampling space (use with --samples)")
+    parser.add_argument('--samples', type=int, help="Number of runs drawn from --space")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--checkpoint', help="JSONL file for finished runs; existing runs are skipped")
+    args = parser.parse_args(argv)
+
+    with open(args.config) as file:
+        base_config = json.load(file)
+    grid = None
+    sampler = None
+    if args.grid:
+        with open(args.grid) as file:
+            grid = json.load(file)
+    elif args.space:
+        with open(args.space) as file:
+            sampler = make_sampler(json.load(file))
+
+    for result in run_sweep(base_config, grid=grid, sampler=sampler, num_samples=args.samples, seed=args.seed,
+                            max_workers=args.workers, checkpoint_path=args.checkpoint):
+        sys.stdout.write(json.dumps(result) + '\n')
+        sys.stdout.flush()
+
+if __name__ == '__main__':
+    main()
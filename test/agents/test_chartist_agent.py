@@ -0,0 +1,25 @@
+import unittest
+import pandas as pd
+
+from src.agents.agents.chartist_agent import ChartistAgent
+from src.market.market import Market
+
+class TestChartistAgent(unittest.TestCase):
+    def test_ema_covers_last_window_closes(self):
+        market = Market({"ohlcv_periods": [1000]})
+        agent = ChartistAgent(1, 0, market, activation_rate=0.1, max_order_size=1, window=5)
+        for time in range(0, 12500, 50):
+            market.market_data.add_tick(time, 100.0 + (time // 700) % 9, 99.0, 101.0, 1, 10, 10)
+
+            closes = market.market_data.get_close_window(period=1000, window=5)
+            expected = pd.Series(closes).ewm(span=5, adjust=False).mean().iloc[-1]
+            value = market.indicator_manager.get_incremental_value(agent.ema_key, include_current_bar=True)
+            self.assertAlmostEqual(value, expected)
+
+    def test_missing_period_raises(self):
+        market = Market({"ohlcv_periods": [10]})
+        with self.assertRaises(ValueError):
+            ChartistAgent(1, 0, market, activation_rate=0.1, max_order_size=1, window=5)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+import numpy as np
+
+from src.agents.agents.fundamentalist_cohort import FundamentalistCohort
+from src.market.market import Market
+
+class TestFundamentalistCohort(unittest.TestCase):
+    def setUp(self):
+        np.random.seed(3)
+        self.market = Market({"ohlcv_periods": [10]})
+        self.cohort = FundamentalistCohort(
+            agent_id=1, member_ids=[10, 11, 12, 13], initial_cash=100.0, market=self.market,
+            fundamental_values=[120.0, 80.0, 100.0, 130.0], activation_rates=0.5, max_order_size=1
+        )
+        self.market.register_agent(self.cohort)
+
+    def test_next_activation_is_earliest_member(self):
+        self.assertEqual(self.cohort.next_activation_time, self.cohort.next_activation_times.min())
+        self.assertEqual(self.market.agent_manager.time_queue, [(self.cohort.next_activation_time, 1)])
+
+    def test_vectorized_decisions(self):
+        self.cohort.activate_members(np.arange(4), current_time=0)
+        book = self.market.order_book
+        #mid price defaults to 100: members 10 and 13 buy, 11 sells into 10's bid, 12 does nothing
+        self.assertEqual(book.get_total_bid_volume(), 1)
+        self.assertEqual(book.get_total_ask_volume(), 0)
+        self.assertEqual([order.agent_id for order in book.orders_by_id.values()], [13])
+        self.assertEqual(self.cohort.holdings.tolist(), [1, -1, 0, 0])
+
+    def test_only_due_members_are_rescheduled(self):
+        self.cohort.next_activation_times[:] = [5, 7, 5, 9]
+        self.market.time = 5
+        self.cohort.activate(5)
+        times = self.cohort.next_activation_times
+        self.assertEqual(times[1], 7)
+        self.assertEqual(times[3], 9)
+        self.assertTrue(times[0] >= 5 and times[2] >= 5)
+        self.assertEqual(self.cohort.next_activation_time, times.min())
+
+    def test_member_portfolios(self):
+        self.market.place_order(agent_id=99, order_type='limit', side='sell', quantity=2, price=100.0)
+        self.cohort.activate_members(np.array([0]), current_time=0)
+
+        member = self.market.agent_manager.get_agent(10)
+        self.assertEqual(member.agent_id, 10)
+        self.assertEqual(member.holdings, 1)
+        self.assertAlmostEqual(member.cash, 0.0)
+        self.assertEqual(self.cohort.holdings.tolist(), [1, 0, 0, 0])
+        portfolios = {agent.agent_id for agent in self.market.agent_manager.iter_portfolios()}
+        self.assertEqual(portfolios, {10, 11, 12, 13})
@@ -0,0 +1,38 @@
+import unittest
+import numpy as np
+
+from src.agents.pending_orders import PendingOrders
+from src.simulation.random_streams import RandomStream
+
+class TestPendingOrders(unittest.TestCase):
+    def test_add_remove_keeps_ids_consistent(self):
+        pending = PendingOrders()
+        for order_id in range(10):
+            pending[order_id] = f"order {order_id}"
+        del pending[3]
+        self.assertEqual(pending.pop(9), "order 9")
+        self.assertIsNone(pending.pop(9))
+        del pending[0]
+
+        self.assertEqual(len(pending), 7)
+        self.assertNotIn(3, pending)
+        self.assertEqual(sorted(pending.order_ids), sorted(pending.keys()))
+        for order_id, index in pending.positions.items():
+            self.assertEqual(pending.order_ids[index], order_id)
+
+    def test_replacing_an_order_does_not_duplicate_its_id(self):
+        pending = PendingOrders()
+        pending[1] = "a"
+        pending[1] = "b"
+        self.assertEqual(len(pending), 1)
+        self.assertEqual(pending[1], "b")
+
+    def test_random_order_id_is_uniform(self):
+        pending = PendingOrders()
+        for order_id in range(4):
+            pending[order_id] = order_id
+        rng = RandomStream(np.random.default_rng(0), block_size=64)
+        draws = [pending.random_order_id(rng) for _ in range(4000)]
+        counts = np.bincount(draws, minlength=4)
+        self.assertTrue(all(800 < count < 1200 for count in counts))
+        self.assertFalse(PendingOrders())
@@ -0,0 +1,51 @@
+import unittest
+
+from src.agents.agents.stop_loss_agent import StopLossAgent
+from src.market.market import Market
+from src.simulation.simulation import Simulation
+from test.simulation.test_random_streams import make_config
+
+class TestStopLossAgent(unittest.TestCase):
+    def setUp(self):
+        self.market = Market({"ohlcv_periods": [10]})
+
+    def trade(self, price):
+        self.market.place_order(90, 'limit', 'sell', 1, price)
+        self.market.place_order(91, 'market', 'buy', 1)
+
+    def test_stop_cascade(self):
+        #bids the stop-loss sells will hit, each fill reaching the next stop
+        for price in (97.0, 94.0, 91.0):
+            self.market.place_order(92, 'limit', 'buy', 5, price)
+        agents = [StopLossAgent(i, 0.0, self.market, stop_price=stop, quantity=5) for i, stop in ((1, 98.0), (2, 97.0), (3, 94.0), (4, 80.0))]
+        for agent in agents:
+            self.market.register_agent(agent)
+
+        self.trade(98.0)
+        self.market.agent_manager.step(1)
+
+        self.assertEqual([agent.exited for agent in agents], [True, True, True, False])
+        self.assertEqual([agent.holdings for agent in agents], [0, 0, 0, 5])
+        self.assertEqual(self.market.market_data.get_last_transaction_price(), 91.0)
+
+    def test_take_profit(self):
+        agent = StopLossAgent(1, 0.0, self.market, stop_price=90.0, quantity=2, take_profit=110.0)
+        self.market.register_agent(agent)
+        self.market.place_order(92, 'limit', 'buy', 5, 100.0)
+        self.trade(112.0)
+        self.market.agent_manager.step(1)
+        self.assertTrue(agent.exited)
+        self.assertEqual(len(self.market.agent_manager.trigger_index), 0)
+
+    def test_in_simulation(self):
+        config = make_config(3)
+        config["agents"].append({"id": 5, "type": "stop_loss", "cash": 0, "stop_price": 1000.0, "quantity": 1})
+        simulation = Simulation(config)
+        simulation.verbose = False
+        simulation.run()
+        agent = simulation.market.agent_manager.agents[5]
+        self.assertTrue(agent.exited)
+        self.assertEqual(agent.triggers, [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,29 @@
+import unittest
+
+from benchmarks.import_time import measure_import, check_budget, CORE_MODULES
+
+class TestImportTime(unittest.TestCase):
+    def test_core_imports_without_analysis_packages(self):
+        for module in CORE_MODULES:
+            result = measure_import(module, repeats=1)
+            self.assertEqual(result['heavy_imports'], [], module)
+
+    def test_check_budget(self):
+        results = {
+            'fast': {'median': 0.1, 'heavy_imports': []},
+            'slow': {'median': 0.9, 'heavy_imports': []},
+            'heavy': {'median': 0.1, 'heavy_imports': ['pandas']},
+        }
+        problems = check_budget(results, budget=0.5)
+        self.assertEqual(len(problems), 2)
+        self.assertTrue(problems[0].startswith('slow'))
+        self.assertTrue(problems[1].startswith('heavy'))
+
+    def test_dataframe_still_available(self):
+        from src.managers.ohlcv_store import OHLCVStore
+        store = OHLCVStore()
+        store.append(0, 1.0, 2.0, 0.5, 1.5, 10)
+        self.assertEqual(store.to_dataframe()['close'].tolist(), [1.5])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,33 @@
+import unittest
+
+from benchmarks.run import compare, measure, iter_cases, QUICK_MAX_AGENTS
+from benchmarks.workloads import book_add, deep_sweep
+
+def results(**medians):
+    return {'results': {name: {'median': median} for name, median in medians.items()}}
+
+class TestBenchmarkRunner(unittest.TestCase):
+    def test_compare_flags_regressions(self):
+        report = compare(results(a=1.2, b=0.5, c=1.05), results(a=1.0, b=1.0, c=1.0, d=1.0), threshold=0.1)
+        self.assertEqual([entry['name'] for entry in report['regressions']], ['a'])
+        self.assertEqual([entry['name'] for entry in report['improvements']], ['b'])
+        self.assertEqual([entry['name'] for entry in report['unchanged']], ['c'])
+        self.assertEqual(report['missing'], ['d'])
+
+    def test_measure(self):
+        result = measure(book_add, {'orders': 100, 'depth': 10}, repeats=2)
+        self.assertEqual(result['ops'], 100)
+        self.assertLessEqual(result['min'], result['median'])
+
+    def test_deep_sweep_fills_every_level(self):
+        setup, run, fills = deep_sweep(levels=20, orders_per_level=2)
+        engine, order_book, order = setup()
+        run((engine, order_book, order))
+        self.assertEqual(fills, 40)
+        self.assertEqual(order.quantity, 0)
+        self.assertIsNone(order_book.get_best_ask())
+
+    def test_quick_cases_skip_largest_runs(self):
+        cases = list(iter_cases(only=['simulation_run'], quick=True))
+        self.assertTrue(cases)
+        self.assertTrue(all(params['agents'] <= QUICK_MAX_AGENTS for _, _, params in cases))
@@ -0,0 +1,155 @@
+import copy
+import unittest
+import numpy as np
+import pandas as pd
+
+from src.indicators.incremental import IncrementalEMA, IncrementalRSI, RollingMean, RollingStd, IncrementalVWAP, WindowedEMA
+from src.indicators.rsi import calculate_rsi
+from src.managers.indicator_manager import IndicatorManager
+from src.managers.market_data_manager import MarketDataManager
+
+class TestIncrementalIndicators(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        self.closes = 100 + np.cumsum(rng.normal(0, 1, 60))
+        self.volumes = rng.integers(1, 50, 60)
+
+    def feed(self, indicator):
+        for close, volume in zip(self.closes, self.volumes):
+            indicator.update(float(close), int(volume))
+        return indicator
+
+    def test_ema_matches_pandas(self):
+        ema = self.feed(IncrementalEMA(10))
+        expected = pd.Series(self.closes).ewm(span=10, adjust=False).mean().iloc[-1]
+        self.assertAlmostEqual(ema.value, expected)
+
+    def test_ema_peek_does_not_change_state(self):
+        ema = self.feed(IncrementalEMA(10))
+        value = ema.value
+        peeked = ema.peek(200.0)
+        self.assertEqual(ema.value, value)
+        self.assertAlmostEqual(peeked, value + ema.alpha * (200.0 - value))
+
+    def test_rsi_sma_matches_batch(self):
+        rsi = self.feed(IncrementalRSI(14, method='sma'))
+        self.assertAlmostEqual(rsi.value, calculate_rsi(self.closes, 14))
+
+    def test_rsi_wilder(self):
+        rsi = self.feed(IncrementalRSI(14))
+        delta = np.diff(self.closes)
+        gains, losses = np.clip(delta, 0, None), np.clip(-delta, 0, None)
+        avg_gain, avg_loss = gains[:14].mean(), losses[:14].mean()
+        for gain, loss in zip(gains[14:], losses[14:]):
+            avg_gain = (avg_gain * 13 + gain) / 14
+            avg_loss = (avg_loss * 13 + loss) / 14
+        self.assertAlmostEqual(rsi.value, 100 - 100 / (1 + avg_gain / avg_loss))
+
+    def test_rsi_not_ready(self):
+        rsi = IncrementalRSI(14)
+        for close in self.closes[:14]:
+            rsi.update(float(close))
+        self.assertIsNone(rsi.value)
+
+    def test_rsi_flat_market_is_nan(self):
+        flat = [100.0] * 20
+        for method in ('wilder', 'sma'):
+            rsi = IncrementalRSI(14, method=method)
+            for close in flat:
+                rsi.update(close)
+            self.assertTrue(np.isnan(rsi.value), method)
+            self.assertTrue(np.isnan(rsi.peek(100.0)), method)
+            self.assertTrue(np.isnan(calculate_rsi(flat, 14)))
+
+    def test_rolling_mean_and_std(self):
+        mean = self.feed(RollingMean(20))
+        std = self.feed(RollingStd(20))
+        self.assertAlmostEqual(mean.value, self.closes[-20:].mean())
+        self.assertAlmostEqual(std.value, self.closes[-20:].std(ddof=1))
+
+    def test_vwap(self):
+        vwap = self.feed(IncrementalVWAP(15))
+        expected = np.dot(self.closes[-15:], self.volumes[-15:]) / self.volumes[-15:].sum()
+        self.assertAlmostEqual(vwap.value, expected)
+
+    def test_windowed_ema_matches_pandas_on_window(self):
+        for window in (1, 5, 10):
+            ema = WindowedEMA(window)
+            for i, close in enumerate(self.closes):
+                ema.update(float(close))
+                expected = pd.Series(self.closes[max(0, i + 1 - window):i + 1]).ewm(span=window, adjust=False).mean()
+                self.assertAlmostEqual(ema.value, expected.iloc[-1])
+
+    def test_peek_matches_update(self):
+        indicators = [IncrementalEMA(10), WindowedEMA(10), IncrementalRSI(14), IncrementalRSI(14, method='sma'),
+                      RollingMean(20), RollingStd(20), IncrementalVWAP(15)]
+        for indicator in indicators:
+            for close, volume in zip(self.closes, self.volumes):
+                updated = copy.deepcopy(indicator)
+                updated.update(float(close) + 3.0, int(volume))
+                peeked = indicator.peek(float(close) + 3.0, int(volume))
+                if updated.value is None:
+                    self.assertIsNone(peeked, type(indicator).__name__)
+                else:
+                    self.assertAlmostEqual(peeked, updated.value, msg=type(indicator).__name__)
+                indicator.update(float(close), int(volume))
+
+class TestIndicatorManager(unittest.TestCase):
+    def setUp(self):
+        self.market_data = MarketDataManager(ohlcv_periods=[10], store_tick_data=False)
+        self.indicator_manager = IndicatorManager(self.market_data)
+
+    def add_ticks(self, start, end):
+        for i in range(start, end):
+            self.market_data.add_tick(
+                time=i, transaction_price=100.0 + i % 7, best_bid=99.0, best_ask=101.0,
+                transaction_volume=1, bid_volume=20, ask_volume=15
+            )
+
+    def test_incremental_indicators_are_shared(self):
+        key_one = self.indicator_manager.add_incremental_indicator('ema', period=10, window=5)
+        key_two = self.indicator_manager.add_incremental_indicator('ema', period=10, window=5)
+        self.assertEqual(key_one, key_two)
+        self.assertEqual(len(self.indicator_manager.incremental_indicators), 1)
+        self.assertEqual(len(self.market_data.bar_listeners[10]), 1)
+
+    def test_incremental_indicator_updates_on_bar_close(self):
+        key = self.indicator_manager.add_incremental_indicator('sma', period=10, window=3)
+        self.add_ticks(0, 45)
+        closes = self.market_data.ohlcv_data[10].get_column('close')
+        self.assertEqual(len(closes), 4)
+        self.assertAlmostEqual(self.indicator_manager.get_incremental_value(key), closes[-3:].mean())
+
+    def test_late_registration_warms_up(self):
+        self.add_ticks(0, 45)
+        key = self.indicator_manager.add_incremental_indicator('ema', period=10, window=3)
+        closes = self.market_data.ohlcv_data[10].get_column('close')
+        expected = pd.Series(closes).ewm(span=3, adjust=False).mean().iloc[-1]
+        self.assertAlmostEqual(self.indicator_manager.get_incremental_value(key), expected)
+
+    def test_unknown_period_raises(self):
+        with self.assertRaises(ValueError):
+            self.indicator_manager.add_incremental_indicator('ema', period=1000, window=5)
+
+    def test_current_bar_uses_open_bar_volume(self):
+        key = self.indicator_manager.add_incremental_indicator('vwap', period=10, window=3)
+        self.add_ticks(0, 45)
+        closes = self.market_data.ohlcv_data[10].get_column('close')
+        current = self.market_data.get_current_close(10)
+        volume = self.market_data.get_current_volume(10)
+        expected = (closes[-2:].sum() * 10 + current * volume) / (20 + volume)
+        self.assertAlmostEqual(self.indicator_manager.get_incremental_value(key, include_current_bar=True), expected)
+
+    def test_function_indicators_are_deduplicated(self):
+        calls = []
+        def mean(values, window):
+            calls.append(window)
+            return float(np.mean(values))
+
+        self.add_ticks(0, 45)
+        for i in range(5):
+            self.indicator_manager.add_indicator(f'mean_{i}', mean, window=3, period=10)
+        calls.clear()
+        self.indicator_manager.update_indicators()
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(self.indicator_manager.get_indicator('mean_0'), self.indicator_manager.get_indicator('mean_4'))
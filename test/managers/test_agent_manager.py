@@ -0,0 +1,77 @@
+import unittest
+
+from src.agents.base_agent import BaseAgent
+from src.market.market import Market
+
+class PassiveAgent(BaseAgent):
+    def activate(self, current_time):
+        pass
+
+class TestAgentManagerSettlement(unittest.TestCase):
+    def setUp(self):
+        self.market = Market({"ohlcv_periods": [10], "batch_fills": True})
+        self.agents = {}
+        for agent_id in (1, 2, 3):
+            agent = PassiveAgent(agent_id, 1000.0, self.market, self.market.indicator_manager)
+            self.agents[agent_id] = agent
+            self.market.register_agent(agent)
+
+    def test_fill_batch_settlement(self):
+        self.market.place_order(agent_id=1, order_type='limit', side='sell', quantity=3, price=100.0)
+        self.market.place_order(agent_id=2, order_type='limit', side='sell', quantity=3, price=101.0)
+        self.market.place_order(agent_id=3, order_type='market', side='buy', quantity=5)
+
+        self.assertAlmostEqual(self.agents[3].cash, 1000.0 - 300.0 - 202.0)
+        self.assertEqual(self.agents[3].holdings, 5)
+        self.assertAlmostEqual(self.agents[1].cash, 1300.0)
+        self.assertEqual(self.agents[1].holdings, -3)
+        self.assertEqual(len(self.agents[1].pending_limit_orders), 0)
+        self.assertAlmostEqual(self.agents[2].cash, 1202.0)
+        self.assertEqual(len(self.agents[2].pending_limit_orders), 1)
+
+        bar = self.market.market_data.get_current_bar(10)
+        self.assertEqual(bar['volume'], 5)
+        self.assertEqual(bar['close'], 101.0)
+
+class TestPendingOrderTracking(unittest.TestCase):
+    def setUp(self):
+        self.market = Market({"ohlcv_periods": [10]})
+        self.agents = {}
+        for agent_id in (1, 2):
+            agent = PassiveAgent(agent_id, 1000.0, self.market, self.market.indicator_manager)
+            self.agents[agent_id] = agent
+            self.market.register_agent(agent)
+        self.agent_manager = self.market.agent_manager
+
+    def test_filled_orders_leave_pending(self):
+        self.market.place_order(agent_id=1, order_type='limit', side='sell', quantity=3, price=100.0)
+        self.market.place_order(agent_id=1, order_type='limit', side='sell', quantity=3, price=101.0)
+        self.market.place_order(agent_id=2, order_type='market', side='buy', quantity=4)
+
+        self.assertEqual(list(self.agents[1].pending_limit_orders), [2])
+        self.assertEqual(self.agents[1].pending_limit_orders[2].quantity, 2)
+        self.assertEqual(list(self.agent_manager.order_owners), [2])
+
+    def test_cancelled_orders_leave_pending(self):
+        self.market.place_order(agent_id=1, order_type='limit', side='buy', quantity=3, price=99.0)
+        self.assertIs(self.agent_manager.order_owners[1], self.agents[1])
+        self.market.cancel_order(1)
+        self.assertEqual(len(self.agents[1].pending_limit_orders), 0)
+        self.assertEqual(self.agent_manager.order_owners, {})
+
+    def test_pending_orders_match_the_book_after_a_run(self):
+        from src.simulation.simulation import Simulation
+        from test.simulation.test_random_streams import make_config
+
+        for batch_fills in (False, True):
+            config = make_config(2)
+            config["verbose"] = False
+            config["market"]["batch_fills"] = batch_fills
+            simulation = Simulation(config)
+            simulation.run()
+
+            resting = set(simulation.market.order_book.orders_by_id)
+            pending = [order_id for agent in simulation.market.agent_manager.iter_portfolios()
+                       for order_id in agent.pending_limit_orders]
+            self.assertEqual(sorted(pending), sorted(resting))
+            self.assertEqual(set(simulation.market.agent_manager.order_owners), resting)
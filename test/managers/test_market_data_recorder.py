@@ -0,0 +1,93 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+
+from src.managers.market_data_manager import MarketDataManager
+from src.managers.market_data_recorder import open_recording
+from src.managers.ohlcv_store import OHLCVStore
+
+class TestMarketDataRecorder(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.directory = os.path.join(self.tmp.name, 'recording')
+        self.market_data = MarketDataManager(
+            ohlcv_periods=[10], store_tick_data=True, max_ticks=16,
+            recording_dir=self.directory, recording_chunk_size=8, max_bars_in_memory=4
+        )
+
+    def tearDown(self):
+        self.market_data.close_recording()
+        self.tmp.cleanup()
+
+    def add_ticks(self, n):
+        for i in range(n):
+            self.market_data.add_tick(
+                time=i, transaction_price=100.0 + i, best_bid=99.0 + i, best_ask=101.0 + i,
+                transaction_volume=1, bid_volume=20, ask_volume=15
+            )
+
+    def test_full_history_is_recorded(self):
+        self.add_ticks(205)
+        self.market_data.close_recording()
+
+        recording = open_recording(self.directory)
+        ticks = recording['ticks']
+        self.assertIsInstance(ticks, np.memmap)
+        self.assertEqual(ticks.dtype, MarketDataManager.tick_dtype)
+        self.assertEqual(len(ticks), 205)
+        self.assertEqual(list(ticks['time']), list(range(205)))
+
+        #20 closed bars and the one open at time 200
+        bars = recording['ohlcv'][10]
+        self.assertEqual(len(bars), 21)
+        self.assertEqual(list(bars['time']), list(range(0, 210, 10)))
+        self.assertEqual(list(bars['close']), [109.0 + 10 * i for i in range(20)] + [304.0])
+        self.assertTrue(recording['partial_last'][10])
+
+    def test_memory_stays_bounded(self):
+        self.add_ticks(1000)
+        store = self.market_data.ohlcv_data[10]
+        self.assertEqual(self.market_data.tick_count, 16)
+        self.assertLessEqual(len(store), 2 * 4 + 1)
+        self.assertEqual(len(store) + store.dropped, 99)
+        self.assertEqual(store.get_column('close')[-1], 989.0 + 100.0)
+
+    def test_flush_makes_partial_chunks_visible(self):
+        self.add_ticks(13)
+        self.market_data.flush_recording()
+        self.assertEqual(len(open_recording(self.directory)['ticks']), 13)
+
+    def test_open_bar_is_recorded(self):
+        self.add_ticks(25)
+        self.market_data.close_recording()
+        store = self.market_data.ohlcv_data[10]
+        self.assertTrue(store.has_current_bar)
+        bars = open_recording(self.directory)['ohlcv'][10]
+        self.assertEqual(len(bars), len(store) + store.dropped + 1)
+        i = store.size
+        self.assertEqual(bars[-1]['time'], store.time[i])
+        self.assertEqual(bars[-1]['close'], store.close[i])
+        self.assertEqual(bars[-1]['volume'], store.volume[i])
+
+    def test_open_bar_can_be_left_out(self):
+        self.add_ticks(25)
+        self.market_data.close_recording(include_open_bar=False)
+        store = self.market_data.ohlcv_data[10]
+        recording = open_recording(self.directory)
+        self.assertEqual(len(recording['ohlcv'][10]), len(store) + store.dropped)
+        self.assertFalse(recording['partial_last'][10])
+
+    def test_recording_after_close_raises(self):
+        self.add_ticks(5)
+        self.market_data.close_recording()
+        with self.assertRaises(ValueError):
+            self.add_ticks(1)
+
+class TestOHLCVStoreHotWindow(unittest.TestCase):
+    def test_drops_old_bars(self):
+        store = OHLCVStore(max_bars=3)
+        for i in range(50):
+            store.start_bar(i, float(i), 1)
+        self.assertEqual(len(store) + store.dropped, 49)
+        self.assertEqual(list(store.get_window('close', 3)), [47.0, 48.0, 49.0])
@@ -0,0 +1,111 @@
+import copy
+import functools
+import unittest
+import numpy as np
+
+from src.managers.scheduler import HeapScheduler, CalendarScheduler, create_scheduler
+from src.simulation.simulation import Simulation
+from test.simulation.test_random_streams import make_config
+
+class SchedulerContract:
+    scheduler_class = None
+
+    def setUp(self):
+        self.scheduler = self.scheduler_class()
+
+    def test_batches_by_time_in_agent_id_order(self):
+        for time, agent_id in [(5, 3), (2, 9), (5, 1), (2, 4), (7, 2), (5, 2)]:
+            self.scheduler.push(time, agent_id)
+        self.assertEqual(len(self.scheduler), 6)
+        self.assertEqual(self.scheduler.next_time(), 2)
+
+        self.assertEqual(self.scheduler.pop_due(1), (None, None))
+        self.assertEqual(self.scheduler.pop_due(6), (2, [4, 9]))
+        self.assertEqual(self.scheduler.pop_due(6), (5, [1, 2, 3]))
+        self.assertEqual(self.scheduler.pop_due(6), (None, None))
+        self.assertEqual(self.scheduler.entries(), [(7, 2)])
+        self.assertEqual(len(self.scheduler), 1)
+
+    def test_empty(self):
+        self.assertEqual(len(self.scheduler), 0)
+        self.assertIsNone(self.scheduler.next_time())
+        self.assertEqual(self.scheduler.pop_due(10), (None, None))
+
+    def test_matches_heap_on_random_schedule(self):
+        rng = np.random.default_rng(0)
+        heap = HeapScheduler()
+        for agent_id, time in enumerate(rng.integers(0, 50, 1000).tolist()):
+            heap.push(time, agent_id)
+            self.scheduler.push(time, agent_id)
+        for current_time in range(0, 60, 7):
+            while True:
+                expected = heap.pop_due(current_time)
+                self.assertEqual(self.scheduler.pop_due(current_time), expected)
+                if expected[1] is None:
+                    break
+        self.assertEqual(len(self.scheduler), 0)
+
+    def test_matches_heap_with_rescheduling(self):
+        rng = np.random.default_rng(1)
+        heap = HeapScheduler()
+        for agent_id, time in enumerate(rng.integers(0, 30, 200).tolist()):
+            heap.push(time, agent_id)
+            self.scheduler.push(time, agent_id)
+        for current_time in range(0, 3000, 3):
+            while True:
+                due_time, batch = heap.pop_due(current_time)
+                self.assertEqual(self.scheduler.pop_due(current_time), (due_time, batch))
+                if batch is None:
+                    break
+                for agent_id in batch:
+                    #mostly near, sometimes far ahead, sometimes behind the time just popped
+                    draw = rng.random()
+                    delay = int(rng.integers(1, 20)) if draw < 0.8 else int(rng.integers(20, 500)) if draw < 0.95 else -5
+                    heap.push(due_time + delay, agent_id)
+                    self.scheduler.push(due_time + delay, agent_id)
+            self.assertEqual(self.scheduler.next_time(), heap.next_time())
+            self.assertEqual(len(self.scheduler), len(heap))
+        self.assertEqual(self.scheduler.entries(), heap.entries())
+
+class TestHeapScheduler(SchedulerContract, unittest.TestCase):
+    scheduler_class = HeapScheduler
+
+class TestCalendarScheduler(SchedulerContract, unittest.TestCase):
+    scheduler_class = CalendarScheduler
+
+    def test_far_times_wait_outside_the_ring(self):
+        scheduler = CalendarScheduler(horizon=16)
+        scheduler.push(3, 1)
+        scheduler.push(1000, 2)
+        self.assertEqual(scheduler.ring_count, 1)
+        self.assertEqual(scheduler.pop_due(2000), (3, [1]))
+        self.assertEqual(scheduler.next_time(), 1000)
+        self.assertEqual(scheduler.cursor, 1000)
+        self.assertEqual(scheduler.pop_due(2000), (1000, [2]))
+        self.assertIsNone(scheduler.next_time())
+
+    def test_unknown_scheduler(self):
+        with self.assertRaises(ValueError):
+            create_scheduler('wheel')
+
+class TestSmallCalendarScheduler(SchedulerContract, unittest.TestCase):
+    scheduler_class = functools.partial(CalendarScheduler, horizon=8)
+
+class TestSchedulerSimulation(unittest.TestCase):
+    def run_with(self, scheduler):
+        config = make_config(11)
+        config["market"] = dict(config["market"], scheduler=scheduler)
+        simulation = Simulation(copy.deepcopy(config))
+        simulation.run()
+        return simulation
+
+    def test_runs_are_identical(self):
+        heap = self.run_with('heap')
+        calendar = self.run_with('calendar')
+        self.assertIsInstance(calendar.market.agent_manager.scheduler, CalendarScheduler)
+        self.assertTrue(np.array_equal(heap.market.market_data.tick_data, calendar.market.market_data.tick_data))
+        self.assertEqual(heap.market.agent_manager.time_queue, calendar.market.agent_manager.time_queue)
+        self.assertEqual(heap.summary(), calendar.summary())
+
+if __name__ == '__main__':
+    unittest.main()
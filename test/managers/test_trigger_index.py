@@ -0,0 +1,123 @@
+import pickle
+import unittest
+
+from src.agents.agent_condition_activated import ConditionActivatedAgent
+from src.managers.trigger_index import Trigger, TriggerIndex, ABOVE, BELOW
+from src.market.market import Market
+
+class RecordingAgent(ConditionActivatedAgent):
+    def __init__(self, agent_id, market):
+        super().__init__(agent_id, 1000.0, market)
+        self.fired = []
+
+    def on_trigger(self, trigger, current_time):
+        self.fired.append((trigger.metric, trigger.level, current_time))
+
+class TestTriggerIndex(unittest.TestCase):
+    def setUp(self):
+        self.market = Market({"ohlcv_periods": [10]})
+        self.index = TriggerIndex()
+        self.agent = RecordingAgent(1, self.market)
+
+    def add(self, metric, direction, level, key=None):
+        trigger = Trigger(self.agent, metric, direction, level, key=key)
+        self.index.add(trigger)
+        return trigger
+
+    def trade(self, price, quantity=1):
+        self.market.place_order(2, 'limit', 'sell', quantity, price)
+        self.market.place_order(3, 'market', 'buy', quantity)
+
+    def test_only_reached_levels_fire(self):
+        for level in range(90, 111):
+            self.add('price', BELOW, float(level))
+            self.add('price', ABOVE, float(level))
+        self.trade(100.0)
+        self.index.observe_price(None, 100.0, 100.0)
+
+        fired = self.index.check(self.market)
+        self.assertEqual(sorted(t.level for t in fired if t.direction == BELOW), [float(l) for l in range(100, 111)])
+        self.assertEqual(sorted(t.level for t in fired if t.direction == ABOVE), [float(l) for l in range(90, 101)])
+        self.assertEqual(len(self.index), 20)
+        self.assertTrue(all(not trigger.armed for trigger in fired))
+
+    def test_price_range_between_checks(self):
+        self.add('price', BELOW, 95.0)
+        self.trade(100.0)
+        self.index.observe_price(None, 94.0, 100.0)
+        self.assertEqual(len(self.index.check(self.market)), 1)
+
+    def test_remove(self):
+        trigger = self.add('price', ABOVE, 50.0)
+        self.index.remove(trigger)
+        self.trade(100.0)
+        self.assertEqual(self.index.check(self.market), [])
+        self.assertEqual(len(self.index), 0)
+
+    def test_spread_and_volume(self):
+        self.add('spread', ABOVE, 5.0)
+        self.add('volume', ABOVE, 10, key=10)
+        self.market.place_order(2, 'limit', 'buy', 1, 100.0)
+        self.market.place_order(2, 'limit', 'sell', 1, 102.0)
+        self.assertEqual(self.index.check(self.market), [])
+
+        self.market.place_order(2, 'limit', 'sell', 20, 110.0)
+        self.market.place_order(3, 'market', 'buy', 12)
+        fired = self.index.check(self.market)
+        self.assertEqual(sorted(trigger.metric for trigger in fired), ['spread', 'volume'])
+
+    def test_flat_rsi_fires_nothing(self):
+        key = self.market.indicator_manager.add_incremental_indicator('rsi', period=10, window=3)
+        self.add('indicator', ABOVE, 50.0, key=key)
+        self.add('indicator', BELOW, 50.0, key=key)
+        for i in range(50):
+            self.market.market_data.add_tick(time=i, transaction_price=100.0, best_bid=99.0, best_ask=101.0,
+                                             transaction_volume=1, bid_volume=1, ask_volume=1)
+        self.assertEqual(self.index.check(self.market), [])
+        self.assertEqual(len(self.index), 2)
+
+    def test_pickled_index_keeps_numbering(self):
+        self.add('price', BELOW, 95.0)
+        self.add('price', BELOW, 96.0)
+        restored = pickle.loads(pickle.dumps(self.index))
+        trigger = Trigger(self.agent, 'price', ABOVE, 105.0)
+        restored.add(trigger)
+        self.assertEqual(trigger.seq, 2)
+        self.assertEqual(len(restored), 3)
+
+    def test_invalid_trigger(self):
+        with self.assertRaises(ValueError):
+            Trigger(self.agent, 'price', 'sideways', 1.0)
+        with self.assertRaises(ValueError):
+            Trigger(self.agent, 'volume', ABOVE, 1.0)
+
+    def test_large_population_pops_only_reached(self):
+        for i in range(100000):
+            self.add('price', BELOW, 50.0 + (i % 1000) * 0.1)
+        self.trade(140.0)
+        fired = self.index.check(self.market)
+        self.assertEqual(len(fired), 100 * 100)
+        self.assertEqual(len(self.index), 90000)
+
+class TestConditionAgents(unittest.TestCase):
+    def test_agent_manager_wakes_triggered_agents(self):
+        market = Market({"ohlcv_periods": [10]})
+        waiting = RecordingAgent(1, market)
+        waiting.add_trigger('price', BELOW, 90.0)
+        reached = RecordingAgent(2, market)
+        reached.add_trigger('price', BELOW, 99.0)
+        market.register_agent(waiting)
+        market.register_agent(reached)
+        self.assertEqual(market.agent_manager.condition_agents, [])
+
+        market.place_order(3, 'limit', 'sell', 1, 98.0)
+        market.place_order(4, 'market', 'buy', 1)
+        market.agent_manager.step(5)
+
+        self.assertEqual(reached.fired, [('price', 99.0, 5)])
+        self.assertEqual(reached.triggers, [])
+        self.assertEqual(waiting.fired, [])
+        self.assertEqual(len(waiting.triggers), 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import random
+import unittest
+import numpy as np
+
+from src.market.book_mirror import BookMirror
+from src.market.event_bus import EventBus
+from src.market.matching_engine import MatchingEngine
+from src.market.order import Order, BUY
+from src.market.order_book import LimitOrderBook
+from src.market.tick_order_book import TickOrderBook
+
+class TestTopLevels(unittest.TestCase):
+    def make_book(self):
+        return LimitOrderBook()
+
+    def setUp(self):
+        self.book = self.make_book()
+        for order_id, (side, price, quantity) in enumerate([
+                ('buy', 99.0, 5), ('buy', 98.0, 3), ('buy', 99.0, 2), ('buy', 97.0, 1),
+                ('sell', 101.0, 4), ('sell', 102.0, 6)], start=1):
+            self.book.add_order(Order(order_id, 1, 0, side, 'limit', quantity, price, tick_size=0.01))
+
+    def test_top_levels(self):
+        prices, volumes, count = self.book.get_top_levels('buy', 2)
+        self.assertEqual(count, 2)
+        self.assertEqual(prices.tolist(), [99.0, 98.0])
+        self.assertEqual(volumes.tolist(), [7, 3])
+
+    def test_preallocated_and_padding(self):
+        prices = np.zeros(5)
+        volumes = np.zeros(5, dtype=np.int64)
+        result = self.book.get_top_levels('sell', 5, prices, volumes)
+        self.assertIs(result[0], prices)
+        self.assertEqual(result[2], 2)
+        self.assertEqual(prices[:2].tolist(), [101.0, 102.0])
+        self.assertTrue(np.isnan(prices[2:]).all())
+        self.assertEqual(volumes.tolist(), [4, 6, 0, 0, 0])
+
+class TestTopLevelsTickBook(TestTopLevels):
+    def make_book(self):
+        return TickOrderBook(0.01)
+
+class TestLevelFeed(unittest.TestCase):
+    def make_book(self):
+        return LimitOrderBook()
+
+    def test_mirror_follows_book(self):
+        book = self.make_book()
+        mirror = BookMirror.attach(book, record=True)
+        engine = MatchingEngine(EventBus())
+        rng = random.Random(3)
+        live = []
+        for order_id in range(1, 2000):
+            action = rng.random()
+            if action < 0.6:
+                side = rng.choice(['buy', 'sell'])
+                price = round(100 + rng.uniform(-2, 2) + (-0.5 if side == 'buy' else 0.5), 2)
+                engine.execute_order(Order(order_id, 1, 0, side, 'limit', rng.randint(1, 9), price, tick_size=0.01), book, 0)
+                live.append(order_id)
+            elif action < 0.8:
+                engine.execute_order(Order(order_id, 1, 0, rng.choice(['buy', 'sell']), 'market', rng.randint(1, 15)), book, 0)
+            elif live:
+                engine.cancel_order(live.pop(rng.randrange(len(live))), book, 0)
+            self.assertEqual(mirror.get_depth('buy'), book.get_depth('buy'))
+            self.assertEqual(mirror.get_depth('sell'), book.get_depth('sell'))
+
+        self.assertTrue(mirror.history)
+        prices, volumes, count = book.get_top_levels('sell', 3)
+        self.assertEqual(mirror.top_levels('sell', 3), list(zip(prices[:count].tolist(), volumes[:count].tolist())))
+
+    def test_changes(self):
+        book = self.make_book()
+        changes = []
+        book.add_level_listener(lambda *change: changes.append(change))
+        book.add_order(Order(1, 1, 0, 'buy', 'limit', 5, 99.0, tick_size=0.01))
+        book.add_order(Order(2, 1, 0, 'buy', 'limit', 3, 99.0, tick_size=0.01))
+        book.modify_order(1, 2)
+        book.remove_order(2)
+        book.modify_order(1, 0)
+        self.assertEqual(changes, [(BUY, 99.0, 5), (BUY, 99.0, 8), (BUY, 99.0, 5), (BUY, 99.0, 2), (BUY, 99.0, 0)])
+
+class TestLevelFeedTickBook(TestLevelFeed):
+    def make_book(self):
+        return TickOrderBook(0.01)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,11 @@
+import pickle
 import unittest
 
-from src.market.event_bus import EventBus
+from src.market.event_bus import EventBus, CompiledEventBus
 from src.market.events import Event
+from src.market.matching_engine import MatchingEngine
+from src.market.order import Order
+from src.market.order_book import LimitOrderBook
 
 class TestEventBus(unittest.TestCase):
     def setUp(self):
@@ -71,3 +75,51 @@ class TestEventBus(unittest.TestCase):
         self.assertEqual(len(self.events_handled), 2)
         self.assertEqual(self.events_handled[0], ('handler_one', event_one))
         self.assertEqual(self.events_handled[1], ('handler_two', event_two))
+
+class TestCompiledEventBus(TestEventBus):
+    def setUp(self):
+        self.event_bus = CompiledEventBus()
+        self.events_handled = []
+
+    def test_dispatch_table(self):
+        handler_one = lambda event: self.events_handled.append(1)
+        handler_two = lambda event: self.events_handled.append(2)
+        self.event_bus.subscribe('test_event', handler_one)
+        self.assertIs(self.event_bus.dispatch['test_event'], handler_one)
+
+        self.event_bus.subscribe('test_event', handler_two)
+        self.event_bus.unsubscribe('test_event', handler_one)
+        self.assertIs(self.event_bus.dispatch['test_event'], handler_two)
+        self.event_bus.unsubscribe('test_event', handler_two)
+        self.assertNotIn('test_event', self.event_bus.dispatch)
+        self.assertFalse(self.event_bus.has_subscribers('test_event'))
+
+    def test_many_handlers_in_order(self):
+        for i in range(5):
+            self.event_bus.subscribe('test_event', lambda event, i=i: self.events_handled.append(i))
+        self.event_bus.publish(Event(event_type='test_event', timestamp=1))
+        self.assertEqual(self.events_handled, [0, 1, 2, 3, 4])
+
+    def test_pickle(self):
+        self.event_bus.subscribe('test_event', print)
+        self.event_bus.subscribe('test_event', repr)
+        restored = pickle.loads(pickle.dumps(self.event_bus))
+        self.assertEqual(restored.subscribers, {'test_event': [print, repr]})
+        self.assertIn('test_event', restored.dispatch)
+
+class TestSubscriberElision(unittest.TestCase):
+    def test_events_without_subscribers_are_not_built(self):
+        event_bus = CompiledEventBus()
+        published = []
+        event_bus.publish = published.append
+        event_bus.subscribe('order_cancelled', print)
+        engine = MatchingEngine(event_bus)
+        book = LimitOrderBook()
+
+        engine.execute_order(Order(1, 1, 0, 'sell', 'limit', 5, 100.0), book, 0)
+        engine.execute_order(Order(2, 2, 0, 'buy', 'market', 2), book, 0)
+        self.assertEqual(published, [])
+        self.assertEqual(book.get_total_ask_volume(), 3)
+
+        engine.cancel_order(1, book, 0)
+        self.assertEqual([event.event_type for event in published], ['order_cancelled'])
@@ -0,0 +1,118 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+
+from src.market.event_bus import EventBus
+from src.market.event_log import EventLog, load_event_log, read_event_log, RECORD_DTYPE, SUBMIT, CANCEL, FILL
+from src.market.events import OrderSubmittedEvent, CancelRequestedEvent
+from src.market.matching_engine import MatchingEngine
+from src.market.order import Order, BUY, SELL, LIMIT, MARKET
+from src.market.order_book import LimitOrderBook
+from src.market.replay import replay
+from src.simulation.simulation import Simulation
+from test.simulation.test_random_streams import make_config
+
+class TestEventLog(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'events.bin')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_records_round_trip_in_chunks(self):
+        bus = EventBus()
+        log = EventLog(self.path, chunk_size=2)
+        bus.attach_sink(log)
+        engine = MatchingEngine(bus)
+        book = LimitOrderBook()
+
+        orders = [Order(1, 10, 0, 'sell', 'limit', 5, 101.0), Order(2, 11, 1, 'buy', 'limit', 3, 100.0),
+                  Order(3, 12, 2, 'buy', 'market', 4)]
+        for order in orders:
+            bus.publish(OrderSubmittedEvent(order.timestamp, order))
+            engine.execute_order(order, book, order.timestamp)
+        bus.publish(CancelRequestedEvent(3, 2))
+        engine.cancel_order(2, book, 3)
+        log.close()
+
+        self.assertEqual(len(list(read_event_log(self.path))), 3)
+        records = load_event_log(self.path)
+        self.assertEqual(records['kind'].tolist(), [SUBMIT, SUBMIT, SUBMIT, FILL, CANCEL])
+        self.assertTrue(np.isnan(records['price'][2]))
+        fill = records[3]
+        self.assertEqual((fill['side'], fill['order_id'], fill['other_order_id'], fill['agent_id'], fill['other_agent_id']),
+                         (BUY, 3, 1, 12, 10))
+        self.assertEqual((fill['price'], fill['quantity']), (101.0, 4))
+
+    def test_rejects_other_files(self):
+        with open(self.path, 'wb') as file:
+            file.write(b'not a log')
+        with self.assertRaises(ValueError):
+            load_event_log(self.path)
+
+    def run_logged_simulation(self, **market):
+        config = make_config(11)
+        config['verbose'] = False
+        config['market'].update(event_log=self.path, event_log_chunk_size=256, **market)
+        simulation = Simulation(config)
+        simulation.run()
+        #a finished run closes its log
+        self.assertTrue(simulation.market.event_log.closed)
+        return simulation
+
+    def assert_replay_matches(self, simulation):
+        records = load_event_log(self.path)
+        stats = replay(self.path)
+        book = simulation.market.order_book
+        self.assertEqual(stats['submitted'], int((records['kind'] == SUBMIT).sum()))
+        self.assertEqual(stats['fills'], stats['logged_fills'])
+        self.assertEqual(stats['fill_quantity'], int(records['quantity'][records['kind'] == FILL].sum()))
+        self.assertEqual(stats['order_book'].get_depth('buy'), book.get_depth('buy'))
+        self.assertEqual(stats['order_book'].get_depth('sell'), book.get_depth('sell'))
+
+    def test_simulation_log_replays_to_the_same_book(self):
+        simulation = self.run_logged_simulation()
+        records = load_event_log(self.path)
+        self.assertGreater(int((records['kind'] == FILL).sum()), 0)
+        self.assertGreater(int((records['kind'] == CANCEL).sum()), 0)
+        self.assert_replay_matches(simulation)
+
+    def test_finished_run_can_be_snapshotted(self):
+        simulation = self.run_logged_simulation()
+        restored = Simulation.from_snapshot(simulation.snapshot())
+        self.assertIs(simulation.market.event_log.closed, True)
+        self.assertIsNone(restored.market.event_log)
+        self.assert_replay_matches(simulation)
+
+    def test_batch_mode_log_replays_to_the_same_book(self):
+        self.assert_replay_matches(self.run_logged_simulation(batch_fills=True))
+
+    def test_snapshot_leaves_log_attached(self):
+        config = make_config(11)
+        config['verbose'] = False
+        config['market']['event_log'] = self.path
+        simulation = Simulation(config)
+        simulation.run(until=200)
+        Simulation.from_snapshot(simulation.snapshot())
+        simulation.run()
+        self.assertGreater(len(load_event_log(self.path)), 0)
+
+class TestReplay(unittest.TestCase):
+    def test_replay_structured_array(self):
+        flow = np.zeros(4, dtype=RECORD_DTYPE)
+        flow[0] = (SUBMIT, SELL, LIMIT, 0, 0, 0, 1, 1, 0, 0, 100.0, 10, 0)
+        flow[1] = (SUBMIT, SELL, LIMIT, 0, 0, 1, 2, 2, 0, 0, 101.0, 5, 0)
+        flow[2] = (SUBMIT, BUY, MARKET, 0, 0, 2, 3, 3, 0, 0, np.nan, 12, 0)
+        flow[3] = (CANCEL, 0, 0, 0, 0, 3, 2, 0, 0, 0, np.nan, 0, 0)
+
+        stats = replay(flow, chunk_size=3)
+        self.assertEqual((stats['submitted'], stats['cancelled'], stats['fills'], stats['fill_quantity']), (3, 1, 2, 12))
+        self.assertIsNone(stats['order_book'].get_best_ask())
+
+    def test_replay_with_tick_size(self):
+        flow = np.zeros(1, dtype=RECORD_DTYPE)
+        flow[0] = (SUBMIT, BUY, LIMIT, 0, 0, 0, 1, 1, 0, 0, 100.004, 1, 0)
+        stats = replay(flow, tick_size=0.01)
+        self.assertEqual(stats['order_book'].get_best_bid_ticks(), 10000)
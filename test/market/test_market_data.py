@@ -1,5 +1,7 @@
 import unittest
+import numpy as np
 from src.managers.market_data_manager import MarketDataManager
+from src.managers.ohlcv_store import OHLCVStore
 
 class TestMarketData(unittest.TestCase):
 
@@ -49,6 +51,22 @@ class TestMarketData(unittest.TestCase):
         tick = self.market_data.tick_data[0]
         self.assertEqual(tick['time'], 5)
 
+    def test_tick_buffer_wraps_without_shifting(self):
+        for i in range(250):
+            self.market_data.add_tick(
+                time=i, transaction_price=100.0 + i, best_bid=99.0 + i, best_ask=101.0 + i,
+                transaction_volume=10, bid_volume=20, ask_volume=15
+            )
+        self.assertEqual(self.market_data.tick_head, 50)
+        self.assertEqual(list(self.market_data.tick_data['time']), list(range(150, 250)))
+
+        recent_ticks = self.market_data.get_recent_ticks(30)
+        self.assertEqual(list(recent_ticks['time']), list(range(220, 250)))
+        self.assertTrue(np.shares_memory(recent_ticks, self.market_data.tick_buffer))
+
+        wrapped_ticks = self.market_data.get_recent_ticks(60)
+        self.assertEqual(list(wrapped_ticks['time']), list(range(190, 250)))
+
     def test_update_ohlcv(self):
         self.market_data.add_tick(
             time=1, transaction_price=100.5, best_bid=100.0, best_ask=101.0,
@@ -95,3 +113,53 @@ class TestMarketData(unittest.TestCase):
         )
         with self.assertRaises(ValueError):
             market_data_no_ticks.get_recent_ticks(1)
+
+    def test_closed_bars_are_appended_to_store(self):
+        for i in range(25):
+            self.market_data.add_tick(
+                time=i, transaction_price=100.0 + i, best_bid=99.0 + i, best_ask=101.0 + i,
+                transaction_volume=1, bid_volume=20, ask_volume=15
+            )
+        store = self.market_data.ohlcv_data[10]
+        self.assertEqual(len(store), 2)
+        self.assertEqual(list(store.get_column('time')), [0, 10])
+        self.assertEqual(list(store.get_column('open')), [100.0, 110.0])
+        self.assertEqual(list(store.get_column('close')), [109.0, 119.0])
+        self.assertEqual(list(store.get_column('volume')), [10, 10])
+        self.assertEqual(len(self.market_data.get_ohlcv(10)), 3)
+
+    def test_get_close_window_includes_current_bar(self):
+        for i in range(25):
+            self.market_data.add_tick(
+                time=i, transaction_price=100.0 + i, best_bid=99.0 + i, best_ask=101.0 + i,
+                transaction_volume=1, bid_volume=20, ask_volume=15
+            )
+        closes = self.market_data.get_close_window(10, 2)
+        self.assertEqual(list(closes), [119.0, 124.0])
+        self.assertEqual(list(self.market_data.get_close_window(10, 50)), [109.0, 119.0, 124.0])
+        self.assertTrue(np.shares_memory(closes, self.market_data.ohlcv_data[10].close))
+        with self.assertRaises(ValueError):
+            closes[0] = 0.0
+
+    def test_get_close_window_empty(self):
+        self.assertEqual(len(self.market_data.get_close_window(10, 5)), 0)
+        self.assertTrue(self.market_data.get_price_history(10, 5).empty)
+
+class TestOHLCVStore(unittest.TestCase):
+
+    def test_append_grows_capacity(self):
+        store = OHLCVStore(initial_capacity=2)
+        for i in range(5):
+            store.append(i * 10, 1.0 + i, 2.0 + i, 0.5 + i, 1.5 + i, i)
+        self.assertEqual(len(store), 5)
+        self.assertGreaterEqual(store.capacity, 5)
+        self.assertEqual(list(store.get_column('time')), [0, 10, 20, 30, 40])
+        self.assertEqual(list(store.get_column('high')), [2.0, 3.0, 4.0, 5.0, 6.0])
+
+    def test_to_dataframe(self):
+        store = OHLCVStore()
+        store.append(0, 1.0, 2.0, 0.5, 1.5, 3)
+        df = store.to_dataframe()
+        self.assertEqual(list(df.columns), list(OHLCVStore.columns))
+        self.assertEqual(df.iloc[0]['close'], 1.5)
+        self.assertEqual(df.iloc[0]['volume'], 3)
@@ -4,7 +4,7 @@ from src.market.matching_engine import MatchingEngine
 from src.market.order_book import LimitOrderBook
 from src.market.order import Order
 from src.market.transaction import Transaction
-from src.market.events import TransactionEvent, OrderExecutedEvent, OrderCancelledEvent, LimitOrderStoredEvent
+from src.market.events import TransactionEvent, OrderExecutedEvent, OrderCancelledEvent, LimitOrderStoredEvent, FillBatchEvent
 
 
 class TestMatchingEngine(unittest.TestCase):
@@ -157,3 +157,67 @@ class TestMatchingEngine(unittest.TestCase):
         self.assertEqual(event3.timestamp, 1234567890)
         self.assertEqual(event3.order, buy_order)
         self.assertEqual(event3.executed_quantity, 10)
+
+
+class TestMatchingEngineBatched(unittest.TestCase):
+    def setUp(self):
+        self.event_bus = MagicMock()
+        self.matching_engine = MatchingEngine(self.event_bus, batch_fills=True, per_fill_events=False)
+        self.order_book = LimitOrderBook()
+
+    def add_asks(self):
+        self.sell_one = Order(1, 3, 1234567880, 'sell', 'limit', 4, price=100.0)
+        self.sell_two = Order(2, 5, 1234567881, 'sell', 'limit', 4, price=100.5)
+        self.sell_three = Order(3, 6, 1234567882, 'sell', 'limit', 4, price=101.0)
+        for order in (self.sell_one, self.sell_two, self.sell_three):
+            self.order_book.add_order(order)
+
+    def test_sweep_publishes_single_batch(self):
+        self.add_asks()
+        buy_order = Order(10, 4, 1234567890, 'buy', 'market', 10)
+        self.matching_engine.execute_order(buy_order, self.order_book, timestamp=1234567890)
+
+        calls = self.event_bus.publish.call_args_list
+        self.assertEqual(len(calls), 1)
+        event = calls[0][0][0]
+        self.assertIsInstance(event, FillBatchEvent)
+        self.assertEqual(event.timestamp, 1234567890)
+        self.assertIs(event.order, buy_order)
+        self.assertEqual(event.resting_orders, [self.sell_one, self.sell_two, self.sell_three])
+        self.assertEqual(event.prices, [100.0, 100.5, 101.0])
+        self.assertEqual(event.quantities, [4, 4, 2])
+        self.assertEqual(event.total_quantity, 10)
+        self.assertAlmostEqual(event.notional, 400.0 + 402.0 + 202.0)
+        self.assertEqual(event.last_price, 101.0)
+        self.assertEqual(self.order_book.get_total_ask_volume(), 2)
+
+    def test_limit_remainder_is_stored_after_batch(self):
+        self.add_asks()
+        buy_order = Order(10, 4, 1234567890, 'buy', 'limit', 10, price=100.5)
+        self.matching_engine.execute_order(buy_order, self.order_book, timestamp=1234567890)
+
+        calls = self.event_bus.publish.call_args_list
+        self.assertEqual(len(calls), 2)
+        self.assertIsInstance(calls[0][0][0], FillBatchEvent)
+        self.assertEqual(calls[0][0][0].total_quantity, 8)
+        self.assertIsInstance(calls[1][0][0], LimitOrderStoredEvent)
+        self.assertEqual(buy_order.quantity, 2)
+
+    def test_no_fill_no_batch(self):
+        buy_order = Order(10, 4, 1234567890, 'buy', 'market', 10)
+        self.matching_engine.execute_order(buy_order, self.order_book, timestamp=1234567890)
+        self.event_bus.publish.assert_not_called()
+
+    def test_per_fill_events_opt_in(self):
+        self.matching_engine.per_fill_events = True
+        self.add_asks()
+        buy_order = Order(10, 4, 1234567890, 'buy', 'market', 6)
+        self.matching_engine.execute_order(buy_order, self.order_book, timestamp=1234567890)
+
+        events = [call[0][0] for call in self.event_bus.publish.call_args_list]
+        self.assertEqual([type(event) for event in events], [
+            TransactionEvent, OrderExecutedEvent, OrderExecutedEvent,
+            TransactionEvent, OrderExecutedEvent, OrderExecutedEvent,
+            FillBatchEvent
+        ])
+        self.assertEqual(events[3].transaction.quantity, 2)
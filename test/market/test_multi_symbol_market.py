@@ -0,0 +1,78 @@
+import os
+import tempfile
+import unittest
+
+from src.market.market import Market
+from src.market.event_log import load_event_log, read_event_log_symbols, SUBMIT
+from src.market.replay import replay
+from src.agents.agents.zero_intelligence_agent import ZeroIntelligenceAgent
+
+class TestMultiSymbolMarket(unittest.TestCase):
+    def setUp(self):
+        self.market = Market({"symbols": ["AAA", "BBB"], "store_tick_data": True})
+
+    def test_default_symbol(self):
+        self.assertEqual(self.market.symbol, "AAA")
+        self.assertIs(self.market.order_book, self.market.order_books["AAA"])
+        self.market.place_order(1, 'limit', 'buy', 5, 100.0)
+        self.assertEqual(self.market.order_books["AAA"].get_best_bid(), 100.0)
+        self.assertIsNone(self.market.order_books["BBB"].get_best_bid())
+
+    def test_books_are_independent(self):
+        self.market.place_order(1, 'limit', 'sell', 5, 100.0, symbol="BBB")
+        self.market.place_order(2, 'market', 'buy', 5, symbol="AAA")
+        self.assertEqual(self.market.order_books["BBB"].get_best_ask(), 100.0)
+
+        self.market.place_order(2, 'market', 'buy', 2, symbol="BBB")
+        self.assertEqual(self.market.market_data_by_symbol["BBB"].get_last_transaction_price(), 100.0)
+        self.assertIsNone(self.market.market_data_by_symbol["AAA"].get_last_transaction_price())
+
+    def test_cancel_in_symbol(self):
+        self.market.place_order(1, 'limit', 'buy', 5, 99.0, symbol="BBB")
+        self.market.cancel_order(self.market.order_id_counter, "BBB")
+        self.assertIsNone(self.market.order_books["BBB"].get_best_bid())
+
+    def test_symbol_market_view(self):
+        view = self.market.symbol_market("BBB")
+        self.assertIs(view, self.market.symbol_market("BBB"))
+        view.place_order(1, 'limit', 'sell', 3, 101.0)
+        self.assertEqual(view.order_book.get_best_ask(), 101.0)
+        self.assertIsNone(self.market.order_book.get_best_ask())
+        with self.assertRaises(ValueError):
+            self.market.symbol_market("CCC")
+
+    def test_positions_settled_per_symbol(self):
+        buyer = ZeroIntelligenceAgent(1, 1000.0, self.market, 5, 1.0, 0.0, 0.0, 0.1, symbols=["AAA", "BBB"])
+        seller = ZeroIntelligenceAgent(2, 1000.0, self.market.symbol_market("BBB"), 5, 1.0, 0.0, 0.0, 0.1)
+        self.market.register_agent(buyer)
+        self.market.register_agent(seller)
+
+        self.market.place_order(2, 'limit', 'sell', 4, 10.0, symbol="BBB")
+        self.market.place_order(1, 'market', 'buy', 4, symbol="BBB")
+
+        self.assertEqual(buyer.positions, {"BBB": 4})
+        self.assertEqual(buyer.holdings, 0)
+        self.assertEqual(seller.holdings, -4)
+        self.assertEqual(buyer.get_portfolio_value({"BBB": 12.0}), 1000.0 - 40.0 + 48.0)
+        self.assertEqual(seller.get_portfolio_value({"BBB": 12.0}), 1000.0 + 40.0 - 48.0)
+
+    def test_event_log_records_symbols(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'events.bin')
+            market = Market({"symbols": ["AAA", "BBB"], "event_log": path})
+            market.place_order(1, 'limit', 'sell', 5, 100.0, symbol="BBB")
+            market.place_order(2, 'limit', 'buy', 5, 90.0, symbol="AAA")
+            market.place_order(3, 'market', 'buy', 2, symbol="BBB")
+            market.event_log.close()
+
+            self.assertEqual(read_event_log_symbols(path), ["AAA", "BBB"])
+            records = load_event_log(path)
+            self.assertEqual(records[records['kind'] == SUBMIT]['symbol'].tolist(), [1, 0, 1])
+
+            stats = replay(path)
+            self.assertEqual(stats['order_books'][0].get_best_bid(), 90.0)
+            self.assertEqual(stats['order_books'][1].get_best_ask(), 100.0)
+            self.assertEqual(stats['fill_quantity'], 2)
+
+if __name__ == '__main__':
+    unittest.main()
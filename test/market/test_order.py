@@ -1,5 +1,5 @@
 import unittest
-from src.market.order import Order
+from src.market.order import Order, Side, OrderType, BUY, SELL, LIMIT, MARKET
 
 class TestOrder(unittest.TestCase):
 
@@ -46,3 +46,23 @@ class TestOrder(unittest.TestCase):
         order = Order(order_id=6, agent_id=105, timestamp=1633062000.0, 
                       side='buy', order_type='market', quantity=10)
         self.assertEqual(str(order), 'Order 6 (buy 10 units) from agent 105')
+
+    def test_int_codes(self):
+        order = Order(order_id=7, agent_id=106, timestamp=0, side='sell', order_type='limit', quantity=1, price=1.0)
+        self.assertEqual(order.side_code, SELL)
+        self.assertEqual(order.type_code, LIMIT)
+
+    def test_enum_arguments(self):
+        order = Order(order_id=8, agent_id=107, timestamp=0, side=Side.BUY, order_type=OrderType.MARKET, quantity=1)
+        self.assertEqual(order.side, 'buy')
+        self.assertEqual(order.order_type, 'market')
+        self.assertEqual(order.side_code, BUY)
+        self.assertEqual(order.type_code, MARKET)
+
+    def test_unknown_side(self):
+        with self.assertRaises(ValueError):
+            Order(order_id=9, agent_id=108, timestamp=0, side='hold', order_type='market', quantity=1)
+
+    def test_slots(self):
+        order = Order(order_id=10, agent_id=109, timestamp=0, side='buy', order_type='market', quantity=1)
+        self.assertFalse(hasattr(order, '__dict__'))
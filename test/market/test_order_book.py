@@ -108,3 +108,12 @@ class TestLimitOrderBook(unittest.TestCase):
     def test_modify_nonexistent_order(self):
         result = self.order_book.modify_order(999, 5)
         self.assertIsNone(result)
+
+    def test_modify_to_zero_updates_total_volume(self):
+        order = Order(1, 2, 1234567890, 'sell', 'limit', 10, 100.5)
+        self.order_book.add_order(order)
+        self.order_book.modify_order(order.order_id, 0)
+
+        self.assertNotIn(order.order_id, self.order_book.orders_by_id)
+        self.assertEqual(self.order_book.get_total_ask_volume(), 0)
+        self.assertIsNone(self.order_book.get_best_ask())
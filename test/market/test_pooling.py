@@ -0,0 +1,79 @@
+import unittest
+import numpy as np
+
+from src.market.event_bus import CompiledEventBus
+from src.market.matching_engine import MatchingEngine
+from src.market.order import Order
+from src.market.order_book import LimitOrderBook
+from src.market.tick_order_book import TickOrderBook
+from src.simulation.simulation import Simulation
+from test.simulation.test_random_streams import make_config
+
+class TestPooledMatchingEngine(unittest.TestCase):
+    def run_flow(self, pooled, batch_fills=False):
+        event_bus = CompiledEventBus()
+        seen = []
+        events = []
+        event_bus.subscribe('transaction', lambda event: (seen.append((event.transaction.price, event.transaction.quantity)),
+                                                          events.append(event)))
+        event_bus.subscribe('order_executed', lambda event: seen.append((event.order.order_id, event.executed_quantity)))
+        engine = MatchingEngine(event_bus, batch_fills=batch_fills, pooled=pooled)
+        book = LimitOrderBook(pooled=pooled)
+        for order_id in range(1, 6):
+            engine.execute_order(Order(order_id, 1, 0, 'sell', 'limit', 2, 100.0 + order_id), book, 0)
+        engine.execute_order(Order(10, 2, 0, 'buy', 'market', 7), book, 0)
+        engine.execute_order(Order(11, 2, 0, 'buy', 'market', 3), book, 0)
+        return seen, events, engine
+
+    def test_same_fills(self):
+        for batch_fills in (False, True):
+            self.assertEqual(self.run_flow(False, batch_fills)[0], self.run_flow(True, batch_fills)[0])
+
+    def test_events_are_recycled_and_cleared(self):
+        _, events, engine = self.run_flow(True)
+        self.assertEqual(len(events), 6)
+        self.assertEqual(len({id(event) for event in events}), 1)
+        self.assertIsNone(events[0].transaction)
+        self.assertEqual(len(engine.transaction_pool), 1)
+        self.assertTrue(all(event.order is None for event in engine.executed_event_pool))
+
+class TestPooledBooks(unittest.TestCase):
+    def check_level_reuse(self, book):
+        book.add_order(Order(1, 1, 0, 'buy', 'limit', 5, 99.0, tick_size=0.01))
+        level = book.get_orders_at_price(99.0, 'buy')
+        book.remove_order(1)
+        self.assertEqual(len(book.free_levels), 1)
+
+        book.add_order(Order(2, 1, 0, 'sell', 'limit', 3, 101.0, tick_size=0.01))
+        self.assertEqual(len(book.free_levels), 0)
+        self.assertIs(book.get_orders_at_price(101.0, 'sell'), level)
+        self.assertEqual(book.get_best_ask(), 101.0)
+        self.assertEqual(book.get_volume_at_price(101.0, 'sell'), 3)
+        self.assertIsNone(book.get_best_bid())
+
+    def test_sorted_book(self):
+        self.check_level_reuse(LimitOrderBook(pooled=True))
+
+    def test_tick_book(self):
+        self.check_level_reuse(TickOrderBook(0.01, pooled=True))
+
+    def test_unpooled_book_keeps_nothing(self):
+        book = LimitOrderBook()
+        book.add_order(Order(1, 1, 0, 'buy', 'limit', 5, 99.0))
+        book.remove_order(1)
+        self.assertEqual(book.free_levels, [])
+
+class TestPooledSimulation(unittest.TestCase):
+    def test_same_run(self):
+        ticks = []
+        for pooled in (False, True):
+            config = make_config(5)
+            config["market"]["pooled"] = pooled
+            config["verbose"] = False
+            simulation = Simulation(config)
+            simulation.run()
+            ticks.append(simulation.market.market_data.tick_data)
+        self.assertTrue(np.array_equal(ticks[0], ticks[1]))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+import time
+import unittest
+import numpy as np
+from src.market.order import Order
+from src.market.tick_order_book import TickOrderBook
+from src.market.order_book import LimitOrderBook
+from src.market.matching_engine import MatchingEngine
+from src.market.event_bus import EventBus
+
+class TestTickOrderBook(unittest.TestCase):
+    def setUp(self):
+        self.order_book = TickOrderBook(tick_size=0.05, initial_levels=4)
+
+    def test_order_price_is_snapped_to_ticks(self):
+        order = Order(1, 2, 0, 'buy', 'limit', 10, 100.52, tick_size=0.05)
+        self.assertEqual(order.price_ticks, 2010)
+        self.assertEqual(order.price, 100.5)
+
+    def test_near_duplicate_prices_share_a_level(self):
+        self.order_book.add_order(Order(1, 2, 0, 'buy', 'limit', 10, 100.0 + 1e-9, tick_size=0.05))
+        self.order_book.add_order(Order(2, 2, 0, 'buy', 'limit', 5, 99.99999, tick_size=0.05))
+        self.assertEqual(self.order_book.get_depth('buy'), {100.0: 15})
+
+    def test_orders_without_ticks_are_snapped(self):
+        order = Order(1, 2, 0, 'sell', 'limit', 10, 100.52)
+        self.order_book.add_order(order)
+        self.assertEqual(order.price_ticks, 2010)
+        self.assertEqual(self.order_book.get_best_ask(), 100.5)
+
+    def test_best_bid_ask_tracking(self):
+        for i, price in enumerate([100.0, 101.0, 99.0, 120.0, 80.0]):
+            self.order_book.add_order(Order(i, 2, 0, 'buy', 'limit', 1, price, tick_size=0.05))
+        for i, price in enumerate([130.0, 125.0, 140.0]):
+            self.order_book.add_order(Order(10 + i, 2, 0, 'sell', 'limit', 1, price, tick_size=0.05))
+
+        self.assertEqual(self.order_book.get_best_bid(), 120.0)
+        self.assertEqual(self.order_book.get_best_ask(), 125.0)
+
+        self.order_book.remove_order(3)
+        self.assertEqual(self.order_book.get_best_bid(), 101.0)
+        self.order_book.modify_order(1, 0)
+        self.assertEqual(self.order_book.get_best_bid(), 100.0)
+        self.order_book.remove_order(11)
+        self.assertEqual(self.order_book.get_best_ask(), 130.0)
+
+        self.assertEqual(list(self.order_book.get_depth('buy')), [100.0, 99.0, 80.0])
+        for order_id in (0, 2, 4):
+            self.order_book.remove_order(order_id)
+        self.assertIsNone(self.order_book.get_best_bid())
+        self.assertIsNone(self.order_book.top_bid())
+
+    def test_volumes(self):
+        order = Order(1, 2, 0, 'buy', 'limit', 10, 100.0, tick_size=0.05)
+        self.order_book.add_order(order)
+        self.order_book.modify_order(1, 4)
+        self.assertEqual(self.order_book.get_total_bid_volume(), 4)
+        self.assertEqual(self.order_book.get_volume_at_price(100.0, 'buy'), 4)
+        self.assertEqual(self.order_book.remove_order(1), order)
+        self.assertEqual(self.order_book.get_total_bid_volume(), 0)
+        self.assertIsNone(self.order_book.remove_order(1))
+
+    def test_matching(self):
+        matching_engine = MatchingEngine(EventBus())
+        sell_one = Order(1, 3, 0, 'sell', 'limit', 5, 100.0, tick_size=0.05)
+        sell_two = Order(2, 3, 0, 'sell', 'limit', 5, 100.05, tick_size=0.05)
+        self.order_book.add_order(sell_one)
+        self.order_book.add_order(sell_two)
+
+        buy = Order(3, 4, 1, 'buy', 'limit', 7, 100.05, tick_size=0.05)
+        matching_engine.execute_order(buy, self.order_book, timestamp=1)
+        self.assertEqual(buy.quantity, 0)
+        self.assertEqual(self.order_book.get_best_ask(), 100.05)
+        self.assertEqual(self.order_book.get_total_ask_volume(), 3)
+
+    def test_far_orders_are_kept_sparse(self):
+        book = TickOrderBook(tick_size=0.01)
+        book.add_order(Order(1, 2, 0, 'sell', 'limit', 1, 100.0, tick_size=0.01))
+        book.add_order(Order(2, 2, 0, 'sell', 'limit', 1, 100000.0, tick_size=0.01))
+        self.assertLessEqual(len(book.ask_ladder.levels), book.ask_ladder.max_levels)
+        self.assertEqual(list(book.ask_ladder.far), [10000000])
+
+        start = time.perf_counter()
+        MatchingEngine(EventBus()).execute_order(Order(3, 4, 1, 'buy', 'market', 1), book, timestamp=1)
+        self.assertLess(time.perf_counter() - start, 0.05)
+        self.assertEqual(book.get_best_ask(), 100000.0)
+        self.assertEqual(book.get_depth('sell'), {100000.0: 1})
+
+    def test_matches_sorted_book_with_small_window(self):
+        rng = np.random.default_rng(5)
+        book = TickOrderBook(tick_size=0.05, initial_levels=4, max_levels=128)
+        reference = LimitOrderBook()
+        live = []
+        for order_id in range(3000):
+            if live and rng.random() < 0.45:
+                victim = live.pop(int(rng.integers(len(live))))
+                book.remove_order(victim)
+                reference.remove_order(victim)
+            else:
+                side = 'buy' if rng.random() < 0.5 else 'sell'
+                #mostly near 100 with occasional far-away quotes and drifts of the centre
+                centre = 100.0 + 20.0 * np.sin(order_id / 300)
+                price = round(centre + rng.normal(0, 1 if rng.random() < 0.9 else 40), 2)
+                for target in (book, reference):
+                    target.add_order(Order(order_id, 2, 0, side, 'limit', 1, price, tick_size=0.05))
+                live.append(order_id)
+            for side in ('buy', 'sell'):
+                prices, volumes, count = book.get_top_levels(side, 50)
+                expected_prices, expected_volumes, expected_count = reference.get_top_levels(side, 50)
+                self.assertEqual(count, expected_count)
+                self.assertEqual(prices[:count].tolist(), expected_prices[:count].tolist())
+                self.assertEqual(volumes.tolist(), expected_volumes.tolist())
+            self.assertEqual(book.get_best_bid(), reference.get_best_bid())
+            self.assertEqual(book.get_best_ask(), reference.get_best_ask())
+
+if __name__ == '__main__':
+    unittest.main()
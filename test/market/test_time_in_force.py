@@ -0,0 +1,129 @@
+import unittest
+
+from src.agents.base_agent import BaseAgent
+from src.market.market import Market
+from src.market.order import Order, IOC, FOK, GTT
+
+class PassiveAgent(BaseAgent):
+    def activate(self, current_time):
+        pass
+
+class TestTimeInForce(unittest.TestCase):
+    def setUp(self):
+        self.market = Market({"ohlcv_periods": [10], "day_length": 100})
+        self.agent = PassiveAgent(1, 0.0, self.market, self.market.indicator_manager)
+        self.market.register_agent(self.agent)
+        self.book = self.market.order_book
+        self.market.place_order(agent_id=2, order_type='limit', side='sell', quantity=3, price=100.0)
+        self.market.place_order(agent_id=2, order_type='limit', side='sell', quantity=3, price=101.0)
+
+    def test_order_codes(self):
+        order = Order(1, 1, 0, 'buy', 'limit', 1, 100.0, time_in_force='ioc')
+        self.assertEqual((order.tif_code, order.time_in_force), (IOC, 'ioc'))
+        self.assertEqual(Order(1, 1, 0, 'buy', 'limit', 1, 100.0, time_in_force='fok').tif_code, FOK)
+        with self.assertRaises(ValueError):
+            Order(1, 1, 0, 'buy', 'limit', 1, 100.0, time_in_force='gtt')
+        with self.assertRaises(ValueError):
+            Order(1, 1, 0, 'buy', 'limit', 1, 100.0, time_in_force='forever')
+
+    def test_ioc_drops_the_rest(self):
+        self.market.place_order(agent_id=1, order_type='limit', side='buy', quantity=5, price=100.0, time_in_force='ioc')
+        self.assertEqual(self.agent.holdings, 3)
+        self.assertIsNone(self.book.get_best_bid())
+        self.assertEqual(self.book.get_best_ask(), 101.0)
+
+    def test_fok_is_killed_when_not_fillable(self):
+        self.market.place_order(agent_id=1, order_type='limit', side='buy', quantity=5, price=100.0, time_in_force='fok')
+        self.assertEqual(self.agent.holdings, 0)
+        self.assertEqual(self.book.get_total_ask_volume(), 6)
+        self.assertIsNone(self.book.get_best_bid())
+
+    def test_fok_fills_in_full(self):
+        self.market.place_order(agent_id=1, order_type='limit', side='buy', quantity=5, price=101.0, time_in_force='fok')
+        self.assertEqual(self.agent.holdings, 5)
+        self.assertEqual(self.book.get_total_ask_volume(), 1)
+
+    def test_fok_code_orders(self):
+        def fok_order(order_id, quantity):
+            return Order(order_id, 1, 0, 'buy', 'limit', quantity, 101.0, tick_size=self.market.tick_size,
+                         time_in_force=FOK, symbol=self.market.symbol)
+
+        #7 cannot be filled from the 6 on offer: rejected, the book is untouched
+        self.market.submit_order(fok_order(100, 7))
+        self.assertEqual(self.agent.holdings, 0)
+        self.assertEqual(self.book.get_total_ask_volume(), 6)
+        self.assertIsNone(self.book.get_best_bid())
+
+        self.market.submit_order(fok_order(101, 6))
+        self.assertEqual(self.agent.holdings, 6)
+        self.assertEqual(self.book.get_total_ask_volume(), 0)
+        self.assertIsNone(self.book.get_best_bid())
+
+    def test_fok_market_order(self):
+        self.market.place_order(agent_id=1, order_type='market', side='buy', quantity=7, time_in_force='fok')
+        self.assertEqual(self.agent.holdings, 0)
+        self.market.place_order(agent_id=1, order_type='market', side='buy', quantity=6, time_in_force='fok')
+        self.assertEqual(self.agent.holdings, 6)
+
+    def test_gtt_orders_expire(self):
+        self.market.time = 10
+        self.market.place_order(agent_id=1, order_type='limit', side='buy', quantity=2, price=99.0,
+                                time_in_force='gtt', expire_time=50)
+        order_id = self.market.order_id_counter
+        self.assertIn(order_id, self.agent.pending_limit_orders)
+
+        self.market.expire_orders(49)
+        self.assertEqual(self.book.get_best_bid(), 99.0)
+        self.market.expire_orders(50)
+        self.assertIsNone(self.book.get_best_bid())
+        self.assertNotIn(order_id, self.agent.pending_limit_orders)
+        self.assertNotIn(order_id, self.market.agent_manager.order_owners)
+
+    def test_filled_gtt_order_is_skipped_at_expiry(self):
+        self.market.place_order(agent_id=1, order_type='limit', side='buy', quantity=2, price=99.0,
+                                time_in_force='gtt', expire_time=50)
+        self.market.place_order(agent_id=2, order_type='market', side='sell', quantity=2)
+        self.market.expire_orders(60)
+        self.assertEqual(self.agent.holdings, 2)
+
+    def test_day_orders_expire_at_the_end_of_the_day(self):
+        self.market.time = 130
+        self.market.place_order(agent_id=1, order_type='limit', side='buy', quantity=1, price=99.0, time_in_force='day')
+        order = self.book.orders_by_id[self.market.order_id_counter]
+        self.assertEqual(order.expire_time, 200)
+        self.market.expire_orders(199)
+        self.assertEqual(self.book.get_best_bid(), 99.0)
+        self.market.expire_orders(200)
+        self.assertIsNone(self.book.get_best_bid())
+
+    def test_day_orders_need_a_day_length(self):
+        market = Market({"ohlcv_periods": [10]})
+        with self.assertRaises(ValueError):
+            market.place_order(agent_id=1, order_type='limit', side='buy', quantity=1, price=99.0, time_in_force='day')
+
+class TestOrderLifetime(unittest.TestCase):
+    def test_zero_intelligence_orders_expire(self):
+        from src.simulation.simulation import Simulation
+        from test.simulation.test_random_streams import make_config
+
+        config = make_config(4)
+        config["verbose"] = False
+        config["max_time"] = 3000
+        config["agents"][0]["order_lifetime"] = 50
+        config["agents"][0]["cancellation_rate"] = 0.0
+        simulation = Simulation(config)
+        simulation.run()
+
+        book = simulation.market.order_book
+        zero_intelligence_orders = [order for order in book.orders_by_id.values() if order.agent_id == 1]
+        self.assertTrue(all(order.tif_code == GTT and order.expire_time > simulation.current_time
+                            for order in zero_intelligence_orders))
+
+class TestTimeInForceTickBook(TestTimeInForce):
+    def setUp(self):
+        self.market = Market({"ohlcv_periods": [10], "day_length": 100, "tick_size": 0.01})
+        self.agent = PassiveAgent(1, 0.0, self.market, self.market.indicator_manager)
+        self.market.register_agent(self.agent)
+        self.book = self.market.order_book
+        self.market.place_order(agent_id=2, order_type='limit', side='sell', quantity=3, price=100.0)
+        self.market.place_order(agent_id=2, order_type='limit', side='sell', quantity=3, price=101.0)
@@ -0,0 +1,40 @@
+import random
+import unittest
+
+from src.market.timing_wheel import TimingWheel
+
+class TestTimingWheel(unittest.TestCase):
+    def test_matches_brute_force(self):
+        rng = random.Random(0)
+        wheel = TimingWheel(bits=3, levels=3)  #small wheel so cascades and overflow are exercised
+        pending = {}
+        now = 0
+        for item in range(3000):
+            deadline = now + rng.choice([0, 1, 5, 40, 300, 2000])  + rng.randint(0, 9)
+            wheel.schedule(deadline, item)
+            pending[item] = deadline
+            if rng.random() < 0.3:
+                now += rng.choice([1, 3, 17, 600])
+                expired = wheel.advance(now)
+                expected = {i for i, d in pending.items() if d <= now}
+                self.assertEqual(set(expired), expected)
+                self.assertEqual(len(expired), len(expected))
+                for i in expired:
+                    del pending[i]
+                self.assertEqual(len(wheel), len(pending))
+
+        expired = wheel.advance(now + 10 ** 6)
+        self.assertEqual(set(expired), set(pending))
+        self.assertEqual(len(wheel), 0)
+
+    def test_past_deadlines_expire_on_next_advance(self):
+        wheel = TimingWheel(start_time=100)
+        wheel.schedule(50, 'late')
+        wheel.schedule(100, 'now')
+        self.assertEqual(sorted(wheel.advance(100)), ['late', 'now'])
+
+    def test_deadline_is_inclusive(self):
+        wheel = TimingWheel()
+        wheel.schedule(256, 'a')
+        self.assertEqual(wheel.advance(255), [])
+        self.assertEqual(wheel.advance(256), ['a'])
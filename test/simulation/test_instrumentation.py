@@ -0,0 +1,76 @@
+import csv
+import json
+import os
+import tempfile
+import unittest
+import numpy as np
+
+from src.simulation.instrumentation import Instrumentation
+from src.simulation.simulation import Simulation
+from test.simulation.test_random_streams import make_config
+
+def make_simulation(instrumentation):
+    config = make_config(5)
+    config["verbose"] = False
+    config["instrumentation"] = instrumentation
+    return Simulation(config)
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_disabled_by_default(self):
+        self.assertIsNone(make_simulation(None).instrumentation)
+        self.assertIsNone(make_simulation({"enabled": False}).instrumentation)
+
+    def test_json_report(self):
+        path = os.path.join(self.directory.name, "report.json")
+        simulation = make_simulation({"report_path": path})
+        simulation.run()
+
+        with open(path) as file:
+            report = json.load(file)
+        self.assertGreater(report["counters"]["orders_submitted"], 0)
+        self.assertGreater(report["counters"]["match_loop_iterations"], 0)
+        self.assertGreater(report["events"]["limit_order_stored"], 0)
+        self.assertEqual(report["events"]["transaction"], report["timers"]["add_tick"]["calls"]
+                         - report["events"]["limit_order_stored"] - report["events"].get("order_cancelled", 0))
+        self.assertIn("activate.ChartistAgent", report["timers"])
+        self.assertIn("activate.FundamentalistCohort", report["timers"])
+        self.assertGreater(report["timers"]["add_tick"]["calls"], 0)
+        self.assertGreater(report["heap_size"]["max"], 0)
+        self.assertEqual(report["sim_time"], simulation.current_time)
+
+    def test_csv_report(self):
+        path = os.path.join(self.directory.name, "report.csv")
+        make_simulation({"report_path": path}).run()
+        with open(path) as file:
+            rows = list(csv.DictReader(file))
+        self.assertIn(("rates", "orders_per_second"), {(row["section"], row["name"]) for row in rows})
+
+    def test_measured_run_is_unchanged(self):
+        plain = make_simulation(None)
+        plain.run()
+        measured = make_simulation(True)
+        measured.run()
+        self.assertTrue(np.array_equal(plain.market.market_data.tick_data, measured.market.market_data.tick_data))
+
+    def test_uninstall_restores_methods(self):
+        simulation = make_simulation(True)
+        simulation.instrumentation.uninstall()
+        self.assertNotIn("publish", vars(simulation.market.event_bus))
+        self.assertNotIn("step", vars(simulation.market.agent_manager))
+
+    def test_snapshot_of_measured_run(self):
+        simulation = make_simulation(True)
+        simulation.run(until=300)
+        restored = Simulation.from_snapshot(simulation.snapshot())
+        self.assertIsNone(restored.instrumentation)
+        self.assertIn("publish", vars(simulation.market.event_bus))
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            Instrumentation(report_format="xml")
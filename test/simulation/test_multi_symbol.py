@@ -0,0 +1,69 @@
+import unittest
+
+from src.simulation.simulation import Simulation
+from src.simulation.multi_symbol import symbol_groups, split_config, run_parallel_symbols
+
+def zi_config(agent_id, **kwargs):
+    config = {"id": agent_id, "type": "zero_intelligence", "cash": 0, "max_order_size": 5, "limit_order_rate": 0.7,
+              "market_order_rate": 0.2, "cancellation_rate": 0.1, "activation_rate": 0.4}
+    config.update(kwargs)
+    return config
+
+def make_config(seed=1):
+    return {
+        "market": {"symbols": ["AAA", "BBB", "CCC", "DDD"], "ohlcv_periods": [1000], "store_tick_data": True},
+        "agents": [
+            zi_config(1),
+            zi_config(2, symbol="BBB"),
+            zi_config(3, symbols=["CCC", "DDD"]),
+            {"id": 4, "type": "chartist", "cash": 0, "activation_rate": 0.1, "max_order_size": 5, "window": 5,
+             "symbol": "DDD"},
+        ],
+        "max_time": 300,
+        "seed": seed,
+        "verbose": False
+    }
+
+class TestMultiSymbolSimulation(unittest.TestCase):
+    def test_agents_trade_their_symbols(self):
+        simulation = Simulation(make_config())
+        simulation.run()
+        for symbol in ("AAA", "BBB", "CCC", "DDD"):
+            self.assertGreater(len(simulation.market.market_data_by_symbol[symbol].tick_data), 0)
+
+        summary = simulation.summary()
+        self.assertEqual(set(summary['symbols']), {"AAA", "BBB", "CCC", "DDD"})
+        agents = simulation.market.agent_manager.agents
+        self.assertEqual(agents[2].symbol, "BBB")
+        self.assertTrue(set(agents[3].positions) <= {"CCC", "DDD"})
+        #the symbol drawn per activation is not kept as the agent's market
+        self.assertIs(agents[3].market, simulation.market)
+
+    def test_symbols_with_a_home_symbol(self):
+        config = make_config()
+        config["agents"] = [zi_config(1, symbol="AAA", symbols=["AAA", "BBB"])]
+        simulation = Simulation(config)
+        simulation.run()
+        agent = simulation.market.agent_manager.agents[1]
+        self.assertEqual([view.symbol for view in agent.symbol_markets], ["AAA", "BBB"])
+        self.assertTrue(set(agent.positions) <= {"AAA", "BBB"})
+        for symbol in ("AAA", "BBB"):
+            self.assertGreater(len(simulation.market.market_data_by_symbol[symbol].tick_data), 0)
+
+    def test_symbol_groups(self):
+        self.assertEqual(symbol_groups(make_config()), [["AAA"], ["BBB"], ["CCC", "DDD"]])
+
+    def test_split_config(self):
+        config = split_config(make_config(), ["CCC", "DDD"], seed=5)
+        self.assertEqual(config["market"]["symbols"], ["CCC", "DDD"])
+        self.assertEqual([agent["id"] for agent in config["agents"]], [3, 4])
+        self.assertEqual(config["seed"], 5)
+
+    def test_parallel_matches_in_process(self):
+        in_process = run_parallel_symbols(make_config(), max_workers=1, sync_interval=50)
+        parallel = run_parallel_symbols(make_config(), max_workers=3, sync_interval=50)
+        self.assertEqual([group['symbols'] for group in parallel], [["AAA"], ["BBB"], ["CCC", "DDD"]])
+        self.assertEqual(in_process, parallel)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+import numpy as np
+
+from src.simulation.random_streams import RandomService, RandomStream
+from src.simulation.simulation import Simulation
+
+def make_config(seed):
+    return {
+        "market": {"ohlcv_periods": [1000], "store_tick_data": True, "max_ticks": 5000},
+        "agents": [
+            {"id": 1, "type": "zero_intelligence", "cash": 0, "max_order_size": 5, "limit_order_rate": 0.7,
+             "market_order_rate": 0.2, "cancellation_rate": 0.1, "activation_rate": 0.4},
+            {"id": 2, "type": "chartist", "cash": 0, "activation_rate": 0.1, "max_order_size": 5, "window": 5},
+            {"id": 3, "type": "fundamentalist", "cash": 0, "fundamental_value": 105.0, "activation_rate": 0.05,
+             "max_order_size": 1},
+            {"id": 4, "type": "fundamentalist_cohort", "cash": 0, "size": 20, "first_member_id": 100,
+             "fundamental_mean": 100.0, "fundamental_std": 10.0, "activation_rate_min": 0.01,
+             "activation_rate_max": 0.05, "max_order_size": 1},
+        ],
+        "max_time": 1000,
+        "seed": seed
+    }
+
+class TestRandomStream(unittest.TestCase):
+    def test_block_refill(self):
+        stream = RandomStream(np.random.default_rng(1), block_size=4)
+        values = [stream.random() for _ in range(10)]
+        self.assertEqual(len(set(values)), 10)
+        self.assertTrue(all(0.0 <= value < 1.0 for value in values))
+
+    def test_scalar_draws(self):
+        stream = RandomStream(np.random.default_rng(2), block_size=16)
+        ints = [stream.randint(1, 3) for _ in range(200)]
+        self.assertEqual(set(ints), {1, 2, 3})
+        self.assertTrue(all(5.0 <= stream.uniform(5.0, 6.0) < 6.0 for _ in range(50)))
+        self.assertIn(stream.choice(['buy', 'sell']), ('buy', 'sell'))
+        self.assertGreater(stream.exponential(10.0), 0.0)
+
+    def test_spawned_streams_are_reproducible_and_independent(self):
+        first = RandomService(42)
+        second = RandomService(42)
+        a, b = first.spawn_stream(), first.spawn_stream()
+        self.assertEqual(a.random(), second.spawn_stream().random())
+        self.assertNotEqual(a.random(), b.random())
+
+class TestSimulationSeed(unittest.TestCase):
+    def run_simulation(self, seed):
+        simulation = Simulation(make_config(seed))
+        simulation.run()
+        return simulation.market.market_data.tick_data
+
+    def test_same_seed_same_run(self):
+        self.assertTrue(np.array_equal(self.run_simulation(7), self.run_simulation(7)))
+
+    def test_different_seed_different_run(self):
+        self.assertFalse(np.array_equal(self.run_simulation(7), self.run_simulation(8)))
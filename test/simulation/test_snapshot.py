@@ -0,0 +1,77 @@
+import os
+import unittest
+import numpy as np
+
+from src.simulation.simulation import Simulation
+from src.simulation.fork import run_forked, run_scenario
+from test.simulation.test_random_streams import make_config
+
+def make_simulation(seed=3):
+    config = make_config(seed)
+    config["verbose"] = False
+    return Simulation(config)
+
+class TestSnapshot(unittest.TestCase):
+    def test_restored_run_matches_uninterrupted_run(self):
+        uninterrupted = make_simulation()
+        uninterrupted.run()
+
+        warm = make_simulation()
+        warm.run(until=400)
+        snapshot = warm.snapshot()
+        restored = Simulation.from_snapshot(snapshot)
+        restored.run()
+        warm.run()
+
+        expected = uninterrupted.market.market_data.tick_data
+        self.assertTrue(np.array_equal(restored.market.market_data.tick_data, expected))
+        self.assertTrue(np.array_equal(warm.market.market_data.tick_data, expected))
+        self.assertEqual(restored.summary(), uninterrupted.summary())
+
+    def test_restore_in_place(self):
+        simulation = make_simulation()
+        simulation.run(until=300)
+        snapshot = simulation.snapshot()
+        bids = simulation.market.order_book.get_depth('buy')
+        queue = list(simulation.market.agent_manager.time_queue)
+
+        simulation.run()
+        simulation.restore(snapshot)
+        self.assertEqual(simulation.market.order_book.get_depth('buy'), bids)
+        self.assertEqual(simulation.market.agent_manager.time_queue, queue)
+
+    def test_reseed_makes_runs_diverge_reproducibly(self):
+        warm = make_simulation()
+        warm.run(until=300)
+        snapshot = warm.snapshot()
+
+        results = [run_scenario(Simulation.from_snapshot(snapshot), {'seed': seed}) for seed in (1, 1, 2)]
+        self.assertEqual(results[0], results[1])
+        self.assertNotEqual(results[0], results[2])
+
+@unittest.skipUnless(hasattr(os, 'fork'), "requires os.fork")
+class TestRunForked(unittest.TestCase):
+    def test_forked_scenarios_match_restored_runs(self):
+        warm = make_simulation()
+        warm.run(until=300)
+        snapshot = warm.snapshot()
+
+        def shock(simulation):
+            cohort = simulation.market.agent_manager.agents[4]
+            cohort.fundamental_values[:] = 150.0
+
+        scenarios = [{'seed': 1}, {'seed': 2}, {'seed': 1, 'shock': shock}]
+        forked = run_forked(warm, scenarios, max_workers=2)
+        expected = [run_scenario(Simulation.from_snapshot(snapshot), scenario) for scenario in scenarios]
+        self.assertEqual(forked, expected)
+        self.assertNotEqual(forked[0], forked[2])
+
+        #the parent simulation is left at the end of the warm-up
+        self.assertEqual(warm.snapshot(), snapshot)
+
+    def test_child_errors_are_raised(self):
+        def broken(simulation):
+            raise KeyError("boom")
+
+        with self.assertRaises(RuntimeError):
+            run_forked(make_simulation(), [{'shock': broken}])
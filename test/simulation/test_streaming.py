@@ -0,0 +1,112 @@
+import asyncio
+import contextlib
+import io
+import unittest
+import numpy as np
+
+from src.simulation.simulation import Simulation
+from src.simulation.streaming import SnapshotBroadcaster
+from test.simulation.test_random_streams import make_config
+
+def make_simulation(seed=11, max_time=3000):
+    config = make_config(seed)
+    config["max_time"] = max_time
+    config["market"]["ohlcv_periods"] = [100, 1000]
+    config["verbose"] = False
+    return Simulation(config)
+
+class TestIterRun(unittest.TestCase):
+    def test_steps_match_run(self):
+        streamed = make_simulation()
+        times = [snapshot['time'] for snapshot in streamed.iter_run()]
+        self.assertEqual(times, sorted(set(times)))
+        self.assertEqual(times[-1], streamed.current_time)
+
+        plain = make_simulation()
+        plain.run()
+        self.assertTrue(np.array_equal(streamed.market.market_data.tick_data, plain.market.market_data.tick_data))
+
+    def test_per_bar_snapshots(self):
+        simulation = make_simulation()
+        snapshots = list(simulation.iter_run(every=100))
+        bars = [bar for snapshot in snapshots for bar in snapshot['bars'][100]]
+        store = simulation.market.market_data.ohlcv_data[100]
+        self.assertEqual([bar['close'] for bar in bars], store.get_column('close').tolist())
+        self.assertEqual(sum(len(snapshot['bars'].get(1000, [])) for snapshot in snapshots),
+                         len(simulation.market.market_data.ohlcv_data[1000]))
+        with self.assertRaises(ValueError):
+            next(simulation.iter_run(every=7))
+
+    def test_stop_and_resume(self):
+        simulation = make_simulation()
+        for snapshot in simulation.iter_run():
+            if snapshot['time'] >= 1000:
+                break
+        self.assertLess(simulation.current_time, 1100)
+        simulation.run()
+
+        plain = make_simulation()
+        plain.run()
+        self.assertTrue(np.array_equal(simulation.market.market_data.tick_data, plain.market.market_data.tick_data))
+
+    def test_pauses_do_not_finish_the_run(self):
+        simulation = make_simulation(max_time=2000)
+        simulation.verbose = True
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            simulation.run(until=500)
+            for snapshot in simulation.iter_run(until=1500):
+                if snapshot['time'] >= 1000:
+                    break
+            self.assertFalse(simulation.finished)
+            self.assertNotIn("END OF SIMULATION", output.getvalue())
+
+            simulation.run()
+            simulation.run()
+        self.assertTrue(simulation.finished)
+        self.assertEqual(output.getvalue().count("END OF SIMULATION"), 1)
+
+class TestSnapshotBroadcaster(unittest.TestCase):
+    def test_backpressure_and_dropping(self):
+        simulation = make_simulation(max_time=500)
+
+        async def main():
+            broadcaster = SnapshotBroadcaster(simulation)
+            slow = broadcaster.subscribe(maxsize=2)
+            latest = broadcaster.subscribe(maxsize=1, overflow='drop_oldest')
+            task = asyncio.create_task(broadcaster.run())
+
+            received = []
+            async for snapshot in slow:
+                received.append(snapshot['time'])
+                await asyncio.sleep(0)
+                #the producer never runs further ahead than the queue allows
+                self.assertLessEqual(broadcaster.published - len(received), 3)
+            published = await task
+            latest_items = [snapshot async for snapshot in latest]
+            return published, received, latest, latest_items
+
+        published, received, latest, latest_items = asyncio.run(main())
+        self.assertEqual(len(received), published)
+        self.assertEqual(received[-1], simulation.current_time)
+        self.assertGreater(latest.dropped, 0)
+        self.assertEqual(latest_items[-1]['time'], received[-1])
+
+    def test_stopping_rule(self):
+        simulation = make_simulation()
+
+        async def main():
+            broadcaster = SnapshotBroadcaster(simulation, every=100)
+            subscription = broadcaster.subscribe(maxsize=4)
+            task = asyncio.create_task(broadcaster.run())
+            async for snapshot in subscription:
+                if snapshot['time'] >= 1000:
+                    broadcaster.stop()
+            await task
+
+        asyncio.run(main())
+        self.assertLess(simulation.current_time, 1300)
+        self.assertGreaterEqual(simulation.current_time, 1000)
+
+if __name__ == '__main__':
+    unittest.main()
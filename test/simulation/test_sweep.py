@@ -0,0 +1,104 @@
+import json
+import os
+import tempfile
+import unittest
+
+from src.simulation.sweep import set_config_value, expand_grid, make_sampler, build_runs, run_sweep, load_checkpoint
+from test.simulation.test_random_streams import make_config
+
+class TestConfigPaths(unittest.TestCase):
+    def test_set_nested_and_selected_values(self):
+        config = make_config(1)
+        set_config_value(config, "market.max_ticks", 10)
+        set_config_value(config, "agents[type=fundamentalist].activation_rate", 0.5)
+        set_config_value(config, "agents[0].max_order_size", 9)
+        self.assertEqual(config["market"]["max_ticks"], 10)
+        self.assertEqual(config["agents"][2]["activation_rate"], 0.5)
+        self.assertEqual(config["agents"][0]["max_order_size"], 9)
+
+    def test_unmatched_selector_raises(self):
+        with self.assertRaises(ValueError):
+            set_config_value(make_config(1), "agents[type=missing].cash", 1)
+
+    def test_expand_grid(self):
+        grid = expand_grid({"a": [1, 2], "b": ["x", "y", "z"]})
+        self.assertEqual(len(grid), 6)
+        self.assertIn({"a": 2, "b": "z"}, grid)
+
+    def test_sampled_runs_are_reproducible(self):
+        sampler = make_sampler({"a": {"uniform": [0, 1]}, "b": {"loguniform": [0.01, 1]}, "c": [1, 2]})
+        first = build_runs(sampler=sampler, num_samples=5, seed=3)
+        self.assertEqual(first, build_runs(sampler=sampler, num_samples=5, seed=3))
+        self.assertTrue(all(0.01 <= params["b"] <= 1 for _, params, _ in first))
+
+class TestRunSweep(unittest.TestCase):
+    def test_sweep_and_resume_from_checkpoint(self):
+        config = make_config(None)
+        config["max_time"] = 300
+        grid = {"agents[type=fundamentalist].activation_rate": [0.05, 0.1]}
+
+        with tempfile.TemporaryDirectory() as directory:
+            checkpoint = os.path.join(directory, "runs.jsonl")
+            results = list(run_sweep(config, grid=grid, seed=5, max_workers=2, checkpoint_path=checkpoint))
+            self.assertEqual(sorted(result["run_id"] for result in results), [0, 1])
+            self.assertIn("pnl", results[0]["summary"])
+            self.assertEqual(set(load_checkpoint(checkpoint)), {0, 1})
+
+            #a finished sweep has nothing left to run
+            self.assertEqual(list(run_sweep(config, grid=grid, seed=5, max_workers=2, checkpoint_path=checkpoint)), [])
+
+            #drop one run from the checkpoint and resume; the rerun is identical
+            with open(checkpoint) as file:
+                lines = file.readlines()
+            kept = json.loads(lines[0])
+            with open(checkpoint, "w") as file:
+                file.write(lines[0])
+            resumed = list(run_sweep(config, grid=grid, seed=5, max_workers=2, checkpoint_path=checkpoint))
+            self.assertEqual(len(resumed), 1)
+            self.assertNotEqual(resumed[0]["run_id"], kept["run_id"])
+            original = next(r for r in results if r["run_id"] == resumed[0]["run_id"])
+            self.assertEqual(original["summary"], resumed[0]["summary"])
+
+    def test_failed_runs_are_reported_and_retried(self):
+        config = make_config(None)
+        config["max_time"] = 100
+        grid = {"max_time": [100, "never"]}
+
+        with tempfile.TemporaryDirectory() as directory:
+            checkpoint = os.path.join(directory, "runs.jsonl")
+            results = {result["run_id"]: result for result in run_sweep(config, grid=grid, max_workers=2,
+                                                                        checkpoint_path=checkpoint)}
+            self.assertIn("summary", results[0])
+            self.assertTrue(results[1]["error"].startswith("TypeError"))
+            self.assertEqual(set(load_checkpoint(checkpoint)), {0})
+
+            retried = list(run_sweep(config, grid=grid, max_workers=2, checkpoint_path=checkpoint))
+            self.assertEqual([result["run_id"] for result in retried], [1])
+
+    def test_stale_checkpoint_is_rejected(self):
+        config = make_config(None)
+        config["max_time"] = 100
+        grid = {"agents[type=fundamentalist].activation_rate": [0.05]}
+
+        with tempfile.TemporaryDirectory() as directory:
+            checkpoint = os.path.join(directory, "runs.jsonl")
+            list(run_sweep(config, grid=grid, seed=5, max_workers=1, checkpoint_path=checkpoint))
+            with self.assertRaises(ValueError):
+                list(run_sweep(config, grid=grid, seed=6, max_workers=1, checkpoint_path=checkpoint))
+            with self.assertRaises(ValueError):
+                list(run_sweep(config, grid={"agents[type=fundamentalist].activation_rate": [0.1]}, seed=5,
+                               max_workers=1, checkpoint_path=checkpoint))
+
+    def test_closing_early_cancels_pending_runs(self):
+        config = make_config(None)
+        config["max_time"] = 100
+        grid = {"agents[type=fundamentalist].activation_rate": [0.01 * i for i in range(1, 9)]}
+
+        with tempfile.TemporaryDirectory() as directory:
+            checkpoint = os.path.join(directory, "runs.jsonl")
+            sweep = run_sweep(config, grid=grid, max_workers=1, checkpoint_path=checkpoint)
+            first = next(sweep)
+            sweep.close()
+            self.assertEqual(list(load_checkpoint(checkpoint)), [first["run_id"]])
+            remaining = list(run_sweep(config, grid=grid, max_workers=2, checkpoint_path=checkpoint))
+            self.assertEqual(len(remaining), 7)